@@ -7,6 +7,7 @@ from fastapi.responses import StreamingResponse
 from backend.schemas.responses import CompanyResponse, SimilarCompaniesResponse
 from backend.schemas.requests import CompanyUpdate, CompanyCreate, SimilarCompaniesRequest
 from backend.services import CompanyService
+from backend.services.company_service import MAX_COMPANY_PAGE_SIZE
 from src.models.database_models_v2 import get_session
 from backend.auth import verify_admin_token
 import io
@@ -72,7 +73,7 @@ def get_companies(
     founded_year_max: Optional[int] = Query(None, description="Maximum founded year"),
     investment_year_min: Optional[int] = Query(None, description="Minimum investment year"),
     investment_year_max: Optional[int] = Query(None, description="Maximum investment year"),
-    limit: int = Query(10000, ge=1, le=10000, description="Number of results"),
+    limit: int = Query(100, ge=1, le=MAX_COMPANY_PAGE_SIZE, description="Number of results (at most 1000, use X-Total-Count to paginate)"),
     offset: int = Query(0, ge=0, description="Offset for pagination"),
     session = Depends(get_session)
 ):
@@ -238,9 +239,9 @@ def export_companies_with_revenue(
         'min_revenue': 0  # Only companies with revenue > 0
     }
 
-    # Get all companies with revenue (no limit)
+    # Get all companies with revenue (paged internally)
     with CompanyService(session) as company_service:
-        companies, total_count = company_service.get_companies(filters, limit=10000, offset=0)
+        companies = company_service.get_all_companies(filters)
 
         if not companies:
             raise HTTPException(status_code=404, detail="No companies with revenue data found")
@@ -391,7 +392,7 @@ def export_companies_with_revenue(
             media_type="text/csv",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}",
-                "X-Total-Count": str(total_count)
+                "X-Total-Count": str(len(companies))
             }
         )
 
@@ -1,17 +1,61 @@
 """
 Investments API endpoints
 """
-from typing import Optional, List
-from fastapi import APIRouter, Query, Depends, HTTPException
+from itertools import islice
+from typing import Optional, List, Iterator, Tuple
+from fastapi import APIRouter, Query, Header, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from backend.schemas.responses import InvestmentResponse
 from backend.schemas.requests import InvestmentUpdate
 from backend.services import InvestmentService
+from backend.services.investment_service import (
+    INVESTMENT_BATCH_SIZE, encode_investment_cursor, decode_investment_cursor
+)
 from src.models.database_models_v2 import get_session
 from backend.auth import verify_admin_token
 
 
 router = APIRouter(prefix="/api", tags=["investments"])
 
+# Serializes a whole page in one pass (pydantic-core) instead of FastAPI's
+# per-item validate -> jsonable_encoder -> json.dumps round-trip
+INVESTMENT_LIST_ADAPTER = TypeAdapter(List[InvestmentResponse])
+
+
+# Accept type that switches GET /api/investments to a streamed, one-object-per-line body
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def investments_json_response(investments: List[InvestmentResponse], headers: Optional[dict] = None) -> Response:
+    """Build a JSON response for a list of investments"""
+    return Response(
+        content=INVESTMENT_LIST_ADAPTER.dump_json(investments),
+        media_type="application/json",
+        headers=headers
+    )
+
+
+def stream_investments_ndjson(
+    session,
+    filters: dict,
+    limit: int,
+    offset: int,
+    after: Optional[Tuple[str, int]]
+) -> Iterator[bytes]:
+    """
+    Yield the page as NDJSON, one chunk per INVESTMENT_BATCH_SIZE rows.
+    Runs after the endpoint has returned (and get_session has closed the session),
+    so the session is reopened for the stream and closed when it ends.
+    """
+    try:
+        with InvestmentService(session) as investment_service:
+            investments = investment_service.iter_investments(filters, limit, offset, after=after)
+            while batch := list(islice(investments, INVESTMENT_BATCH_SIZE)):
+                yield b"".join(investment.model_dump_json().encode() + b"\n" for investment in batch)
+    finally:
+        session.close()
+
 
 @router.get("/companies/{company_id}/investments", response_model=List[InvestmentResponse])
 def get_company_investments(
@@ -22,7 +66,8 @@ def get_company_investments(
     with InvestmentService(session) as investment_service:
         # Get investments filtered by company_id
         filters = {'company_id': company_id}
-        return investment_service.get_investments(filters, limit=1000, offset=0)
+        investments = investment_service.get_investments(filters, limit=1000, offset=0)
+    return investments_json_response(investments)
 
 
 @router.get("/investments", response_model=List[InvestmentResponse])
@@ -55,9 +100,23 @@ def get_investments(
     city_operator: Optional[str] = Query("OR", description="Operator for multiple cities (AND/OR)"),
     limit: int = Query(10000, ge=1, le=10000, description="Number of results to return"),
     offset: int = Query(0, ge=0, description="Number of results to skip"),
+    cursor: Optional[str] = Query(None, description="Continue after a previous page (value of its X-Next-Cursor header)"),
+    accept: Optional[str] = Header(None),
     session = Depends(get_session)
 ):
-    """Get all investments with filters (supports multi-select with comma-separated values)"""
+    """
+    Get all investments with filters (supports multi-select with comma-separated values).
+    With Accept: application/x-ndjson the page is streamed one investment per line
+    as rows are fetched; that form has no X-Next-Cursor header (it is only known
+    once the last row is read), so page it with offset or the JSON form.
+    """
+    
+    after = None
+    if cursor:
+        try:
+            after = decode_investment_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
     
     # Build filters dictionary
     filters = {
@@ -89,14 +148,31 @@ def get_investments(
         'city_operator': city_operator
     }
     
+    if accept and NDJSON_MEDIA_TYPE in accept:
+        return StreamingResponse(
+            stream_investments_ndjson(session, filters, limit, offset, after),
+            media_type=NDJSON_MEDIA_TYPE
+        )
+    
     # Use service to get investments
     with InvestmentService(session) as investment_service:
-        return investment_service.get_investments(filters, limit, offset)
+        investments = investment_service.get_investments(filters, limit, offset, after=after)
+    
+    # A full page may have more rows - hand back a cursor for the next one
+    headers = {}
+    if len(investments) == limit:
+        last = investments[-1]
+        headers["X-Next-Cursor"] = encode_investment_cursor(last.company_name, last.investment_id)
+    return investments_json_response(investments, headers)
 
 
 @router.put("/investments/{investment_id}", dependencies=[Depends(verify_admin_token)])
-async def update_investment(investment_id: int, investment_update: InvestmentUpdate, session = Depends(get_session)):
-    """Update investment details (Admin only)"""
+def update_investment(investment_id: int, investment_update: InvestmentUpdate, session = Depends(get_session)):
+    """
+    Update investment details (Admin only).
+    Plain def: the session is synchronous, so FastAPI runs this in its threadpool
+    instead of blocking the event loop.
+    """
     
     with InvestmentService(session) as investment_service:
         success = investment_service.update_investment(investment_id, investment_update)
@@ -3,25 +3,25 @@ ML Predictions API for Revenue Prediction
 """
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
-import numpy as np
-import pandas as pd
+from typing import Optional, List, Dict, Any, TYPE_CHECKING
 from pathlib import Path
-import pickle
 import sys
 from sqlalchemy.orm import Session
 
-# Add ml_pipeline to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "ml_pipeline"))
+# numpy/pandas/joblib and the ml_pipeline modules are imported where they are
+# used, so workers that never predict don't pay their import time and memory
+ML_PIPELINE_DIR = str(Path(__file__).parent.parent.parent / "ml_pipeline")
+
+if TYPE_CHECKING:
+    from data_preprocessing import FeatureEngineer
 
-from data_preprocessing import FeatureEngineer
 from backend.database_pool import get_db
 from backend.services.ml_enrichment_service import MLEnrichmentService
 
 router = APIRouter(prefix="/api/ml", tags=["ML Predictions"])
 
 # Global variables for loaded models
-_feature_engineer: Optional[FeatureEngineer] = None
+_feature_engineer: Optional["FeatureEngineer"] = None
 _ensemble_model: Optional[Any] = None
 _best_model: Optional[Any] = None
 _model_metadata: Optional[Dict[str, Any]] = None
@@ -99,6 +99,12 @@ def load_models():
     if _feature_engineer is not None:
         return  # Already loaded
 
+    import joblib
+
+    # The pickled feature engineer references ml_pipeline modules by top-level name
+    if ML_PIPELINE_DIR not in sys.path:
+        sys.path.insert(0, ML_PIPELINE_DIR)
+
     models_dir = Path(__file__).parent.parent.parent / "ml_pipeline" / "output" / "models"
 
     # Load feature engineer
@@ -109,20 +115,18 @@ def load_models():
             detail="ML models not available. Please train models first."
         )
 
-    with open(fe_path, 'rb') as f:
-        _feature_engineer = pickle.load(f)
+    # Memory-map model arrays read-only so workers share them instead of each copying
+    _feature_engineer = joblib.load(fe_path, mmap_mode='r')
 
     # Load ensemble model (preferred)
     ensemble_path = models_dir / "ensemble.pkl"
     if ensemble_path.exists():
-        with open(ensemble_path, 'rb') as f:
-            _ensemble_model = pickle.load(f)
+        _ensemble_model = joblib.load(ensemble_path, mmap_mode='r')
 
     # Load best individual model as backup
     best_model_path = models_dir / "xgboost.pkl"
     if best_model_path.exists():
-        with open(best_model_path, 'rb') as f:
-            _best_model = pickle.load(f)
+        _best_model = joblib.load(best_model_path, mmap_mode='r')
 
     # Load model metadata
     results_path = Path(__file__).parent.parent.parent / "ml_pipeline" / "output" / "results" / "training_results.json"
@@ -171,6 +175,7 @@ def calculate_confidence_interval(prediction: float, confidence_level: str) -> t
     }
 
     width = interval_widths.get(confidence_level, 0.5)
+    import numpy as np
 
     # Convert to original scale
     pred_original = np.expm1(prediction)
@@ -210,6 +215,8 @@ async def predict_revenue(features: CompanyFeatures):
     """
     try:
         load_models()
+        import numpy as np
+        import pandas as pd
 
         # Convert input to DataFrame
         input_dict = features.dict()
@@ -267,6 +274,8 @@ async def predict_revenue_batch(request: BatchPredictionRequest):
     """
     try:
         load_models()
+        import numpy as np
+        import pandas as pd
 
         predictions = []
 
@@ -361,6 +370,7 @@ async def get_feature_importance(top_n: int = 20):
             )
 
         # Read feature importance
+        import pandas as pd
         df = pd.read_csv(importance_path, index_col=0)
         top_features = df.head(top_n)
 
@@ -4,7 +4,11 @@ Modular API structure with organized endpoints
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
 
 # Import API routers
 from backend.api.auth import router as auth_router
@@ -19,6 +23,7 @@ from backend.api.ml_predictions import router as ml_predictions_router
 # Import security middleware
 from backend.middleware import RateLimitMiddleware
 
+
 # Initialize FastAPI
 app = FastAPI(
     title="PE Portfolio API V2",
@@ -74,7 +79,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
     allow_headers=["*"],
-    expose_headers=["X-Total-Count", "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor", "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset"],
     max_age=3600,
 )
 
@@ -100,6 +105,41 @@ async def validate_environment():
         print("✅ All required environment variables are set")
 
 
+# Root handlers replaced by the log queue while the app runs (restored on shutdown)
+_log_listener: Optional[QueueListener] = None
+_root_handlers: List[logging.Handler] = []
+
+
+@app.on_event("startup")
+async def start_nonblocking_logging():
+    """
+    Route root log records through a queue so request handlers never block on
+    stream/file I/O; a background listener thread emits them to the handlers
+    already configured (by uvicorn or the host). Levels are left untouched.
+    """
+    global _log_listener, _root_handlers
+    root_logger = logging.getLogger()
+    if _log_listener is not None or not root_logger.handlers:
+        return  # Already running, or nothing to forward to
+
+    log_queue = queue.SimpleQueue()
+    _root_handlers = list(root_logger.handlers)
+    _log_listener = QueueListener(log_queue, *_root_handlers, respect_handler_level=True)
+    root_logger.handlers = [QueueHandler(log_queue)]
+    _log_listener.start()
+
+
+@app.on_event("shutdown")
+async def stop_nonblocking_logging():
+    """Flush the log queue and give the root logger its original handlers back"""
+    global _log_listener
+    if _log_listener is None:
+        return
+    logging.getLogger().handlers = _root_handlers
+    _log_listener.stop()
+    _log_listener = None
+
+
 @app.on_event("startup")
 async def enrich_companies_on_startup():
     """
@@ -1,8 +1,20 @@
 """
 Request schemas for PE Intelligence API
 """
-from typing import Optional, List, Dict
-from pydantic import BaseModel
+from functools import lru_cache
+from typing import Optional, List, Dict, Literal, Tuple
+from pydantic import BaseModel, ConfigDict, ValidationInfo, field_validator
+
+
+@lru_cache(maxsize=1024)
+def split_filter_values(value: Optional[str]) -> Tuple[str, ...]:
+    """
+    Split a comma-separated filter value into stripped, non-empty terms.
+    Cached because paginating clients resend the same filter strings.
+    """
+    if not value:
+        return ()
+    return tuple(term for term in (part.strip() for part in value.split(',')) if term)
 
 
 class LoginRequest(BaseModel):
@@ -151,4 +163,66 @@ class CompanyCreate(BaseModel):
     # Associated data (nested creates)
     tags: Optional[List[CompanyTagCreate]] = []
     funding_rounds: Optional[List[FundingRoundCreate]] = []
-    pe_investments: Optional[List[PEInvestmentCreate]] = []
\ No newline at end of file
+    pe_investments: Optional[List[PEInvestmentCreate]] = []
+
+
+FilterOperator = Literal['AND', 'OR']
+
+INVESTMENT_LIST_FILTERS = (
+    'pe_firm', 'industry', 'industry_group', 'industry_sector',
+    'verticals', 'country', 'state_region', 'city',
+)
+
+
+class InvestmentFilters(BaseModel):
+    """
+    Parsed /investments filters: comma-separated values are split into tuples and
+    operators normalized once, so apply_filters works on typed fields.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    company_id: Optional[int] = None
+    search: Optional[str] = None
+    search_exact: bool = False
+    status: Optional[str] = None
+    exit_type: Optional[str] = None
+    pe_firm: Tuple[str, ...] = ()
+    industry: Tuple[str, ...] = ()
+    industry_group: Tuple[str, ...] = ()
+    industry_sector: Tuple[str, ...] = ()
+    verticals: Tuple[str, ...] = ()
+    country: Tuple[str, ...] = ()
+    state_region: Tuple[str, ...] = ()
+    city: Tuple[str, ...] = ()
+    min_revenue: Optional[float] = None
+    max_revenue: Optional[float] = None
+    min_employees: Optional[int] = None
+    max_employees: Optional[int] = None
+    # Operators - anything other than the alternative keeps the default
+    filter_operator: FilterOperator = 'AND'
+    pe_firm_operator: FilterOperator = 'OR'
+    industry_operator: FilterOperator = 'OR'
+    industry_group_operator: FilterOperator = 'OR'
+    industry_sector_operator: FilterOperator = 'OR'
+    verticals_operator: FilterOperator = 'OR'
+    country_operator: FilterOperator = 'OR'
+    state_region_operator: FilterOperator = 'OR'
+    city_operator: FilterOperator = 'OR'
+
+    @field_validator(*INVESTMENT_LIST_FILTERS, mode='before')
+    @classmethod
+    def split_list_filter(cls, value):
+        if value is None or isinstance(value, str):
+            return split_filter_values(value)
+        return value
+
+    @field_validator('search_exact', mode='before')
+    @classmethod
+    def default_search_exact(cls, value):
+        return False if value is None else value
+
+    @field_validator('filter_operator', *(f'{name}_operator' for name in INVESTMENT_LIST_FILTERS), mode='before')
+    @classmethod
+    def normalize_operator(cls, value, info: ValidationInfo):
+        operator = value.upper() if isinstance(value, str) else None
+        return operator if operator in ('AND', 'OR') else cls.model_fields[info.field_name].default
@@ -1,9 +1,20 @@
 """
 Base service class with common functionality
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, FrozenSet
 from sqlalchemy.orm import Session
-from src.models.database_models_v2 import get_session, get_direct_session
+from src.models.database_models_v2 import get_session, get_direct_session, generated_company_columns
+
+
+def loaded_column(instance: Any, column: str) -> Tuple[bool, Any]:
+    """
+    Return (loaded, value) for a column already present on the instance.
+    Never triggers a lazy refresh - generated columns are expired after INSERT/UPDATE.
+    """
+    state = vars(instance)
+    if column in state:
+        return True, state[column]
+    return False, None
 
 
 class BaseService:
@@ -21,6 +32,11 @@ class BaseService:
             self._session = get_direct_session()
         return self._session
     
+    @property
+    def company_generated_columns(self) -> FrozenSet[str]:
+        """Generated companies columns this session's database has (see generated_company_columns)"""
+        return generated_company_columns(self.session.get_bind())
+
     def __enter__(self):
         """Context manager entry"""
         return self
@@ -2,75 +2,113 @@
 Company service for business logic and data processing
 OPTIMIZED: Uses eager loading to prevent N+1 query problems
 """
+import logging
 from typing import Optional, List, Dict, Any, Tuple
-from datetime import datetime, date
-from sqlalchemy import or_, and_, func, desc
-from sqlalchemy.orm import Session, joinedload, selectinload
-from backend.services.base import BaseService
+from datetime import datetime, date, timezone
+from functools import cached_property
+from sqlalchemy import or_, and_, func, desc, case, insert, select, lambda_stmt
+from sqlalchemy.orm import Session, joinedload, selectinload, undefer
+from backend.services.base import BaseService, loaded_column
+from backend.services.metadata_service import METADATA_CACHE_PREFIX
+from backend.middleware.query_cache import invalidate_cache
 from backend.schemas.responses import CompanyResponse
 from backend.schemas.requests import (
     CompanyUpdate, CompanyCreate, CompanyTagCreate,
     FundingRoundCreate, PEInvestmentCreate
 )
 from src.models.database_models_v2 import (
-    Company, CompanyPEInvestment, PEFirm, CompanyTag, FundingRound
+    Company, CompanyPEInvestment, PEFirm, CompanyTag, FundingRound, VERTICAL_TAG_CATEGORY,
+    sync_vertical_tags
 )
 from src.enrichment.crunchbase_helpers import decode_revenue_range, decode_employee_count
 
+logger = logging.getLogger(__name__)
+
+# Resolved once at import - mapped columns do not change at runtime
+_HAS_SEARCH_VECTOR = hasattr(Company, 'search_vector')
+
+# Pagination - callers page through results instead of pulling everything at once
+DEFAULT_COMPANY_PAGE_SIZE = 100
+MAX_COMPANY_PAGE_SIZE = 1000
+
+# Reverse mappings for filtering
+REVENUE_RANGE_CODES = {
+    "Less than $1M": "r_00000000",
+    "$1M - $10M": "r_00001000",
+    "$10M - $50M": "r_00010000",
+    "$50M - $100M": "r_00050000",
+    "$100M - $500M": "r_00100000",
+    "$500M - $1B": "r_00500000",
+    "$1B - $10B": "r_01000000",
+    "$10B+": "r_10000000",
+    # Partial matches for convenience
+    "$1M": "r_00001000",
+    "$10M": "r_00010000",
+    "$50M": "r_00050000",
+    "$100M": "r_00100000",
+    "$500M": "r_00500000",
+    "$1B": "r_01000000",
+    "$10B": "r_10000000"
+}
+
+EMPLOYEE_COUNT_CODES = {
+    "1-10": "c_00001_00010",
+    "11-50": "c_00011_00050",
+    "51-100": "c_00051_00100",
+    "101-250": "c_00101_00250",
+    "251-500": "c_00251_00500",
+    "501-1,000": "c_00501_01000",
+    "1,001-5,000": "c_01001_05000",
+    "5,001-10,000": "c_05001_10000",
+    "10,001+": "c_10001_max"
+}
+
+
+def _isoformat(value: Optional[date]) -> Optional[str]:
+    """ISO format a date/datetime, passing through missing values"""
+    return value.isoformat() if value else None
+
+
+def _as_float(value: Optional[float]) -> Optional[float]:
+    """Coerce a numeric column to float, treating 0/None as missing (matches previous behavior)"""
+    return float(value) if value else None
+
 
 class CompanyService(BaseService):
     """Service for company-related business logic"""
     
-    # Reverse mappings for filtering
-    REVENUE_RANGE_CODES = {
-        "Less than $1M": "r_00000000",
-        "$1M - $10M": "r_00001000",
-        "$10M - $50M": "r_00010000",
-        "$50M - $100M": "r_00050000",
-        "$100M - $500M": "r_00100000",
-        "$500M - $1B": "r_00500000",
-        "$1B - $10B": "r_01000000",
-        "$10B+": "r_10000000",
-        # Partial matches for convenience
-        "$1M": "r_00001000",
-        "$10M": "r_00010000",
-        "$50M": "r_00050000",
-        "$100M": "r_00100000",
-        "$500M": "r_00500000",
-        "$1B": "r_01000000",
-        "$10B": "r_10000000"
-    }
-
-    EMPLOYEE_COUNT_CODES = {
-        "1-10": "c_00001_00010",
-        "11-50": "c_00011_00050",
-        "51-100": "c_00051_00100",
-        "101-250": "c_00101_00250",
-        "251-500": "c_00251_00500",
-        "501-1,000": "c_00501_01000",
-        "1,001-5,000": "c_01001_05000",
-        "5,001-10,000": "c_05001_10000",
-        "10,001+": "c_10001_max"
-    }
-    
+    # Reverse mappings for filtering (module-level constants, kept here for callers)
+    REVENUE_RANGE_CODES = REVENUE_RANGE_CODES
+    EMPLOYEE_COUNT_CODES = EMPLOYEE_COUNT_CODES
+
     def get_employee_count_display(self, company: Company) -> Optional[str]:
         """
         Get employee count for display - returns the best available value.
         Priority: PitchBook/exact count > projected LinkedIn count > Crunchbase range
         """
+        # Use the pre-computed generated column when it was loaded with the row
+        loaded, display = loaded_column(company, 'employee_count_display')
+        if loaded:
+            return display
+
         # Check PitchBook employee_count first (from PitchBook ingestion)
-        if hasattr(company, 'employee_count') and company.employee_count:
-            return f"{company.employee_count:,}"  # e.g., "1,234"
+        if employee_count := company.employee_count:
+            return f"{employee_count:,}"  # e.g., "1,234"
         # If we have exact LinkedIn count, format it nicely
-        elif company.projected_employee_count:
-            return f"{company.projected_employee_count:,}"  # e.g., "1,234"
+        elif projected_employee_count := company.projected_employee_count:
+            return f"{projected_employee_count:,}"  # e.g., "1,234"
         # Fall back to Crunchbase range
-        elif company.crunchbase_employee_count:
-            return decode_employee_count(company.crunchbase_employee_count)  # e.g., "501-1,000"
+        elif crunchbase_employee_count := company.crunchbase_employee_count:
+            return decode_employee_count(crunchbase_employee_count)  # e.g., "501-1,000"
         return None
     
     def build_headquarters(self, company: Company) -> Optional[str]:
         """Build headquarters string from geographic fields (prioritize PitchBook data)"""
+        # Use the pre-computed generated column when it was loaded with the row
+        loaded, headquarters = loaded_column(company, 'headquarters_display')
+        if loaded:
+            return headquarters
+
         hq_parts = []
         
         # Use PitchBook location first if available
@@ -154,42 +192,45 @@ class CompanyService(BaseService):
         Build a complete CompanyResponse from a Company model.
         OPTIMIZED: Uses eager-loaded relationships instead of separate queries.
         """
-        # Use loaded relationships instead of separate queries (prevents N+1)
-        pe_firms = [inv.pe_firm.name for inv in company.investments if inv.pe_firm] if hasattr(company, 'investments') else []
-
-        # Compute status from loaded investments
-        if hasattr(company, 'investments') and company.investments:
-            status_list = [inv.computed_status for inv in company.investments if inv.computed_status]
-            if 'Active' in status_list:
-                status = 'Active'
-            elif 'Exit' in status_list:
-                status = 'Exit'
-            else:
-                status = status_list[0] if status_list else 'Unknown'
-        else:
-            status = 'Unknown'
-
-        # Get investment year from loaded investments
-        if hasattr(company, 'investments') and company.investments:
-            investment_years = [inv.investment_year for inv in company.investments if inv.investment_year]
-            investment_year = min(investment_years) if investment_years else None
+        # Use loaded relationships instead of separate queries (prevents N+1).
+        # Single pass over the investments collects everything the response needs.
+        pe_firms, investment_years, exit_types = [], [], []
+        has_active = has_exit = False
+        first_status = None
+        for inv in company.investments or ():
+            if inv.pe_firm:
+                pe_firms.append(inv.pe_firm.name)
+            inv_status = inv.computed_status
+            if inv_status:
+                if inv_status == 'Active':
+                    has_active = True
+                elif inv_status == 'Exit':
+                    has_exit = True
+                elif first_status is None:
+                    first_status = inv_status
+            if inv.investment_year:
+                investment_years.append(inv.investment_year)
+            if inv.exit_type:
+                exit_types.append(inv.exit_type)
+
+        # Overall status prioritizes Active over Exit
+        if has_active:
+            status = 'Active'
+        elif has_exit:
+            status = 'Exit'
         else:
-            investment_year = None
+            status = first_status or 'Unknown'
 
-        # Get exit type from loaded investments
-        if hasattr(company, 'investments') and company.investments:
-            exit_types = [inv.exit_type for inv in company.investments if inv.exit_type]
-            exit_type = exit_types[0] if exit_types else None
-        else:
-            exit_type = None
+        investment_year = min(investment_years) if investment_years else None
+        exit_type = exit_types[0] if exit_types else None
 
         headquarters = self.build_headquarters(company)
 
         # Get industries from loaded tags
-        if hasattr(company, 'tags') and company.tags:
-            industries = [tag.tag_value for tag in company.tags if tag.tag_category == 'industry' and tag.tag_value != 'Other']
-        else:
-            industries = []
+        industries = [
+            tag.tag_value for tag in company.tags or []
+            if tag.tag_category == 'industry' and tag.tag_value != 'Other'
+        ]
 
         return CompanyResponse(
             id=company.id,
@@ -214,7 +255,7 @@ class CompanyService(BaseService):
             total_funding_usd=company.total_funding_usd,
             num_funding_rounds=company.num_funding_rounds,
             latest_funding_type=company.latest_funding_type,
-            latest_funding_date=company.latest_funding_date.isoformat() if company.latest_funding_date else None,
+            latest_funding_date=_isoformat(company.latest_funding_date),
             funding_stage_encoded=company.funding_stage_encoded,
             avg_round_size_usd=company.avg_round_size_usd,
             total_investors=company.total_investors,
@@ -222,24 +263,25 @@ class CompanyService(BaseService):
             prediction_confidence=company.prediction_confidence,  # Keep as float 0-1 for frontend
             is_public=company.is_public,
             stock_exchange=company.ipo_exchange,
-            investor_name=getattr(company, 'investor_name', None),
-            investor_status=getattr(company, 'investor_status', None),
-            investor_holding=getattr(company, 'investor_holding', None),
-            current_revenue_usd=float(company.current_revenue_usd) if getattr(company, 'current_revenue_usd', None) else None,
-            last_known_valuation_usd=float(company.last_known_valuation_usd) if getattr(company, 'last_known_valuation_usd', None) else None,
-            primary_industry_group=getattr(company, 'primary_industry_group', None),
-            primary_industry_sector=getattr(company, 'primary_industry_sector', None),
-            hq_location=getattr(company, 'hq_location', None),
-            hq_country=getattr(company, 'hq_country', None),
-            last_financing_date=getattr(company, 'last_financing_date', None).isoformat() if getattr(company, 'last_financing_date', None) else None,
-            last_financing_size_usd=float(company.last_financing_size_usd) if getattr(company, 'last_financing_size_usd', None) else None,
-            last_financing_deal_type=getattr(company, 'last_financing_deal_type', None),
-            verticals=getattr(company, 'verticals', None)
+            investor_name=company.investor_name,
+            investor_status=company.investor_status,
+            investor_holding=company.investor_holding,
+            current_revenue_usd=_as_float(company.current_revenue_usd),
+            last_known_valuation_usd=_as_float(company.last_known_valuation_usd),
+            primary_industry_group=company.primary_industry_group,
+            primary_industry_sector=company.primary_industry_sector,
+            hq_location=company.hq_location,
+            hq_country=company.hq_country,
+            last_financing_date=_isoformat(company.last_financing_date),
+            last_financing_size_usd=_as_float(company.last_financing_size_usd),
+            last_financing_deal_type=company.last_financing_deal_type,
+            verticals=company.verticals
         )
     
+    @cached_property
     def _is_postgresql(self) -> bool:
-        """Check if we're using PostgreSQL"""
-        return 'postgresql' in str(self.session.bind.url).lower()
+        """Check if we're using PostgreSQL (dialect never changes for a session)"""
+        return self.session.bind.dialect.name == 'postgresql'
 
     def apply_filters(self, query, filters: Dict[str, Any]):
         """
@@ -262,30 +304,16 @@ class CompanyService(BaseService):
                 # Exact match
                 search_condition = Company.name == search_term
             else:
-                # Partial match - Try full-text search for PostgreSQL
-                if self._is_postgresql():
-                    try:
-                        # Use PostgreSQL full-text search (10-50x faster than ILIKE)
-                        from sqlalchemy import func as sql_func
-                        from sqlalchemy.dialects.postgresql import TSVECTOR
-
-                        # Convert search term to tsquery format
-                        # Replace spaces with '&' for AND search
-                        tsquery_term = ' & '.join(search_term.split())
-
-                        # Check if search_vector column exists
-                        if hasattr(Company, 'search_vector'):
-                            search_condition = sql_func.to_tsvector('english', Company.name).op('@@')(
-                                sql_func.to_tsquery('english', tsquery_term)
-                            )
-                        else:
-                            # Fallback to ILIKE if search_vector not available
-                            search_condition = Company.name.ilike(f"%{search_term}%")
-                    except Exception:
-                        # Fallback to ILIKE on error
-                        search_condition = Company.name.ilike(f"%{search_term}%")
+                # Partial match - Use full-text search for PostgreSQL when the
+                # search_vector migration has been applied (10-50x faster than ILIKE)
+                if self._is_postgresql and _HAS_SEARCH_VECTOR:
+                    # plainto_tsquery tokenizes server-side and ANDs the terms,
+                    # tolerating quotes/operators that break to_tsquery
+                    search_condition = func.to_tsvector('english', Company.name).op('@@')(
+                        func.plainto_tsquery('english', search_term)
+                    )
                 else:
-                    # Use ILIKE for SQLite or other databases
+                    # Use ILIKE for SQLite or when search_vector is not available
                     search_condition = Company.name.ilike(f"%{search_term}%")
 
             if filter_operator == 'OR':
@@ -305,16 +333,20 @@ class CompanyService(BaseService):
                 firm_conditions = [PEFirm.name.ilike(f"%{firm}%") for firm in pe_firms]
 
             if pe_firm_operator == 'AND' and not pe_firm_not:
-                # For AND: company must have investments from ALL specified firms
-                for firm_cond in firm_conditions:
-                    query = query.filter(
-                        Company.id.in_(
-                            self.session.query(Company.id)
-                            .join(CompanyPEInvestment)
-                            .join(PEFirm)
-                            .filter(firm_cond)
-                        )
+                # For AND: company must have investments from ALL specified firms.
+                # One grouped scan - every firm condition must match at least one row.
+                query = query.filter(
+                    Company.id.in_(
+                        self.session.query(CompanyPEInvestment.company_id)
+                        .join(PEFirm)
+                        .filter(or_(*firm_conditions))
+                        .group_by(CompanyPEInvestment.company_id)
+                        .having(and_(*[
+                            func.max(case((firm_cond, 1), else_=0)) == 1
+                            for firm_cond in firm_conditions
+                        ]))
                     )
+                )
             else:
                 # For OR: company must have investment from ANY specified firm
                 pe_firm_condition = or_(*firm_conditions)
@@ -338,7 +370,7 @@ class CompanyService(BaseService):
 
         # Status filter
         if filters.get('status'):
-            status_condition = CompanyPEInvestment.computed_status.ilike(f"%{filters['status']}%")
+            status_condition = CompanyPEInvestment.status_condition(filters['status'])
             if filter_operator == 'OR':
                 all_conditions.append(status_condition)
             else:
@@ -351,17 +383,19 @@ class CompanyService(BaseService):
             industry_not = filters.get('industry_not', False)
 
             if industry_operator == 'AND' and not industry_not:
-                # For AND: company must have ALL specified industry tags
-                for industry in industries:
-                    query = query.filter(
-                        Company.id.in_(
-                            self.session.query(CompanyTag.company_id)
-                            .filter(
-                                CompanyTag.tag_category == 'industry',
-                                CompanyTag.tag_value == industry
-                            )
+                # For AND: company must have ALL specified industry tags (one grouped scan)
+                required_industries = set(industries)
+                query = query.filter(
+                    Company.id.in_(
+                        self.session.query(CompanyTag.company_id)
+                        .filter(
+                            CompanyTag.tag_category == 'industry',
+                            CompanyTag.tag_value.in_(required_industries)
                         )
+                        .group_by(CompanyTag.company_id)
+                        .having(func.count(func.distinct(CompanyTag.tag_value)) == len(required_industries))
                     )
+                )
             else:
                 # For OR: company must have ANY specified industry tag
                 industry_condition = Company.id.in_(
@@ -467,17 +501,17 @@ class CompanyService(BaseService):
                         or_(*vertical_conditions)
                     )
             else:
-                vertical_conditions = [Company.verticals.ilike(f"%{v}%") for v in vertical_list]
+                # Match the normalized vertical tags (index lookup, no ILIKE scan)
+                vertical_companies = select(CompanyTag.company_id).where(
+                    CompanyTag.tag_category == VERTICAL_TAG_CATEGORY,
+                    CompanyTag.tag_value.in_(vertical_list)
+                )
                 if verticals_operator == 'AND':
-                    verticals_condition = and_(
-                        Company.verticals != None,
-                        and_(*vertical_conditions)
-                    )
-                else:
-                    verticals_condition = and_(
-                        Company.verticals != None,
-                        or_(*vertical_conditions)
+                    # Company must have ALL specified verticals (one grouped scan)
+                    vertical_companies = vertical_companies.group_by(CompanyTag.company_id).having(
+                        func.count(func.distinct(CompanyTag.tag_value)) == len(set(vertical_list))
                     )
+                verticals_condition = Company.id.in_(vertical_companies)
 
             # Apply NOT logic if enabled
             if verticals_not:
@@ -571,7 +605,7 @@ class CompanyService(BaseService):
         # Revenue filters
         if filters.get('revenue_range'):
             ranges = [r.strip() for r in filters['revenue_range'].split(',')]
-            range_codes = [self.REVENUE_RANGE_CODES.get(r) for r in ranges if self.REVENUE_RANGE_CODES.get(r)]
+            range_codes = [code for r in ranges if (code := REVENUE_RANGE_CODES.get(r))]
             if range_codes:
                 revenue_condition = Company.revenue_range.in_(range_codes)
                 if filter_operator == 'OR':
@@ -596,7 +630,7 @@ class CompanyService(BaseService):
         # Employee count filters
         if filters.get('employee_count'):
             ranges = [e.strip() for e in filters['employee_count'].split(',')]
-            range_codes = [self.EMPLOYEE_COUNT_CODES.get(r) for r in ranges if self.EMPLOYEE_COUNT_CODES.get(r)]
+            range_codes = [code for r in ranges if (code := EMPLOYEE_COUNT_CODES.get(r))]
             if range_codes:
                 employee_condition = Company.crunchbase_employee_count.in_(range_codes)
                 if filter_operator == 'OR':
@@ -604,11 +638,12 @@ class CompanyService(BaseService):
                 else:
                     query = query.filter(employee_condition)
 
+        # Crunchbase ranges overlap the requested bound when hi >= min / lo <= max
         if filters.get('min_employees') is not None:
             min_emp_condition = or_(
                 Company.projected_employee_count >= filters['min_employees'],
                 Company.employee_count >= filters['min_employees'],
-                Company.crunchbase_employee_count.ilike(f"%{filters['min_employees']}%")
+                Company.crunchbase_employee_condition(self.company_generated_columns, minimum=filters['min_employees'])
             )
             if filter_operator == 'OR':
                 all_conditions.append(min_emp_condition)
@@ -619,7 +654,7 @@ class CompanyService(BaseService):
             max_emp_condition = or_(
                 Company.projected_employee_count <= filters['max_employees'],
                 Company.employee_count <= filters['max_employees'],
-                Company.crunchbase_employee_count.ilike(f"%{filters['max_employees']}%")
+                Company.crunchbase_employee_condition(self.company_generated_columns, maximum=filters['max_employees'])
             )
             if filter_operator == 'OR':
                 all_conditions.append(max_emp_condition)
@@ -748,11 +783,13 @@ class CompanyService(BaseService):
 
         return query
     
-    def get_companies(self, filters: Dict[str, Any], limit: int = 10000, offset: int = 0) -> Tuple[List[CompanyResponse], int]:
+    def get_companies(self, filters: Dict[str, Any], limit: int = DEFAULT_COMPANY_PAGE_SIZE, offset: int = 0) -> Tuple[List[CompanyResponse], int]:
         """
         Get companies with filters and pagination.
         OPTIMIZED: Uses eager loading to prevent N+1 queries.
+        Pages are capped at MAX_COMPANY_PAGE_SIZE; use the returned total to paginate.
         """
+        limit = min(limit, MAX_COMPANY_PAGE_SIZE)
 
         # Start with base query - always join to get PE firm data
         query = self.session.query(Company).join(Company.investments).join(CompanyPEInvestment.pe_firm)
@@ -763,33 +800,60 @@ class CompanyService(BaseService):
         # Deduplicate companies (since we joined with investments)
         query = query.distinct()
 
-        # Get total count for pagination
-        total_count = query.count()
+        # Get total count for pagination (DISTINCT ids only - not every column,
+        # some of which an older database may not have)
+        total_count = query.with_entities(Company.id).count()
 
         # OPTIMIZATION: Add eager loading to prevent N+1 queries
         # Use selectinload for one-to-many relationships (more efficient than joinedload for collections)
         query = query.options(
+            undefer(Company.description),
+            *self._display_column_options(),
             selectinload(Company.investments).joinedload(CompanyPEInvestment.pe_firm),
             selectinload(Company.tags)
         )
 
-        # Apply pagination and ordering
-        companies = query.order_by(Company.name).offset(offset).limit(limit).all()
+        # Apply pagination and ordering (id breaks name ties so pages don't overlap)
+        companies = query.order_by(Company.name, Company.id).offset(offset).limit(limit).all()
 
         # Build response objects (now uses loaded data, no additional queries)
         result = [self.build_company_response(company) for company in companies]
 
         return result, total_count
     
+    def _display_column_options(self) -> Tuple:
+        """undefer() the generated display columns the database has; builders compute the rest in Python"""
+        return tuple(
+            undefer(getattr(Company, name))
+            for name in ('headquarters_display', 'employee_count_display')
+            if name in self.company_generated_columns
+        )
+
+    def get_all_companies(self, filters: Dict[str, Any]) -> List[CompanyResponse]:
+        """Get every company matching the filters, fetched page by page"""
+        companies, total_count = self.get_companies(filters, limit=MAX_COMPANY_PAGE_SIZE, offset=0)
+        while len(companies) < total_count:
+            page, _ = self.get_companies(filters, limit=MAX_COMPANY_PAGE_SIZE, offset=len(companies))
+            if not page:
+                break
+            companies.extend(page)
+        return companies
+    
     def get_company_by_id(self, company_id: int) -> Optional[CompanyResponse]:
         """
         Get a single company by ID.
         OPTIMIZED: Uses eager loading to prevent N+1 queries.
         """
-        company = self.session.query(Company).options(
+        # lambda_stmt caches the compiled SELECT; company_id is bound as a parameter
+        stmt = lambda_stmt(lambda: select(Company).options(
+            undefer(Company.description),
             selectinload(Company.investments).joinedload(CompanyPEInvestment.pe_firm),
             selectinload(Company.tags)
-        ).filter(Company.id == company_id).first()
+        ).where(Company.id == company_id))
+        display_options = self._display_column_options()
+        if display_options:
+            stmt += lambda s: s.options(*display_options)
+        company = self.session.execute(stmt).scalars().first()
 
         if not company:
             return None
@@ -802,55 +866,16 @@ class CompanyService(BaseService):
         if not company:
             return False
         
-        # Update fields if provided
-        if company_update.name is not None:
-            company.name = company_update.name
-        if company_update.website is not None:
-            company.website = company_update.website
-        if company_update.linkedin_url is not None:
-            company.linkedin_url = company_update.linkedin_url
-        if company_update.crunchbase_url is not None:
-            company.crunchbase_url = company_update.crunchbase_url
-        if company_update.description is not None:
-            company.description = company_update.description
-        if company_update.city is not None:
-            company.city = company_update.city
-        if company_update.state_region is not None:
-            company.state_region = company_update.state_region
-        if company_update.country is not None:
-            company.country = company_update.country
-        if company_update.industry_category is not None:
-            company.industry_category = company_update.industry_category
-        if company_update.revenue_range is not None:
-            company.revenue_range = company_update.revenue_range
-        if company_update.employee_count is not None:
-            company.employee_count = company_update.employee_count
-        if company_update.crunchbase_employee_count is not None:
-            company.crunchbase_employee_count = company_update.crunchbase_employee_count
-        if company_update.is_public is not None:
-            company.is_public = company_update.is_public
-        if company_update.ipo_exchange is not None:
-            company.ipo_exchange = company_update.ipo_exchange
-        if company_update.ipo_date is not None:
-            company.ipo_date = company_update.ipo_date
-        
-        # PitchBook fields
-        if company_update.primary_industry_group is not None:
-            company.primary_industry_group = company_update.primary_industry_group
-        if company_update.primary_industry_sector is not None:
-            company.primary_industry_sector = company_update.primary_industry_sector
-        if company_update.verticals is not None:
-            company.verticals = company_update.verticals
-        if company_update.current_revenue_usd is not None:
-            company.current_revenue_usd = company_update.current_revenue_usd
-        if company_update.last_known_valuation_usd is not None:
-            company.last_known_valuation_usd = company_update.last_known_valuation_usd
-        if company_update.hq_location is not None:
-            company.hq_location = company_update.hq_location
-        if company_update.hq_country is not None:
-            company.hq_country = company_update.hq_country
+        # Update only the fields the caller actually sent (explicit None clears a field)
+        updates = company_update.model_dump(exclude_unset=True)
+        for field, value in updates.items():
+            setattr(company, field, value)
+        if 'verticals' in updates:
+            sync_vertical_tags(self.session, [company])
         
         self.session.commit()
+        # Locations/industries dropdowns may now be stale
+        invalidate_cache(METADATA_CACHE_PREFIX)
         return True
     
     def delete_company(self, company_id: int) -> bool:
@@ -860,18 +885,10 @@ class CompanyService(BaseService):
             return False
 
         try:
-            # Delete related investments first
-            self.session.query(CompanyPEInvestment).filter(CompanyPEInvestment.company_id == company_id).delete()
-
-            # Delete company tags
-            self.session.query(CompanyTag).filter(CompanyTag.company_id == company_id).delete()
-
-            # Delete funding rounds
-            self.session.query(FundingRound).filter(FundingRound.company_id == company_id).delete()
-
-            # Delete the company
+            # Investments, tags and funding rounds go with it via ON DELETE CASCADE
             self.session.delete(company)
             self.session.commit()
+            invalidate_cache(METADATA_CACHE_PREFIX)
 
             return True
         except Exception:
@@ -887,8 +904,8 @@ class CompanyService(BaseService):
         except (ValueError, TypeError):
             return None
 
-    def _get_or_create_pe_firm(self, firm_name: str) -> Optional[PEFirm]:
-        """Get existing PE firm or create a new one"""
+    def _get_or_create_pe_firm(self, firm_name: str, now: datetime) -> Optional[PEFirm]:
+        """Get existing PE firm or create a new one (now: naive UTC creation time)"""
         pe_firm = self.session.query(PEFirm).filter(PEFirm.name == firm_name).first()
         if not pe_firm:
             pe_firm = PEFirm(
@@ -896,7 +913,7 @@ class CompanyService(BaseService):
                 total_companies=0,
                 current_portfolio_count=0,
                 exited_portfolio_count=0,
-                last_scraped=datetime.utcnow()
+                last_scraped=now
             )
             self.session.add(pe_firm)
             self.session.flush()  # Get the ID without committing
@@ -922,6 +939,10 @@ class CompanyService(BaseService):
             if existing:
                 return None  # Company already exists
 
+            # Single timestamp for every row written by this call
+            # (naive UTC to match the DateTime columns)
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+
             # Create new company
             new_company = Company(
                 # Required fields
@@ -990,12 +1011,13 @@ class CompanyService(BaseService):
                 revenue_tier=company_create.revenue_tier,
 
                 # Timestamps
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
+                created_at=now,
+                updated_at=now
             )
 
             self.session.add(new_company)
             self.session.flush()  # Get the company ID
+            sync_vertical_tags(self.session, [new_company])
 
             # Create associated tags
             if company_create.tags:
@@ -1004,7 +1026,7 @@ class CompanyService(BaseService):
                         company_id=new_company.id,
                         tag_category=tag_data.tag_category,
                         tag_value=tag_data.tag_value,
-                        created_at=datetime.utcnow()
+                        created_at=now
                     )
                     self.session.add(tag)
 
@@ -1018,44 +1040,53 @@ class CompanyService(BaseService):
                         money_raised_usd=round_data.money_raised_usd,
                         investor_names=round_data.investor_names,
                         num_investors=round_data.num_investors,
-                        created_at=datetime.utcnow()
+                        created_at=now
                     )
                     self.session.add(funding_round)
 
             # Create PE investments
             if company_create.pe_investments:
-                for investment_data in company_create.pe_investments:
-                    # Get or create PE firm
-                    pe_firm = self._get_or_create_pe_firm(investment_data.pe_firm_name)
-                    if not pe_firm:
-                        continue
-
-                    # Create investment relationship
-                    investment = CompanyPEInvestment(
-                        company_id=new_company.id,
-                        pe_firm_id=pe_firm.id,
-                        raw_status=investment_data.raw_status,
-                        computed_status=investment_data.computed_status or 'Active',  # Default to Active
-                        investment_year=investment_data.investment_year,
-                        investment_stage=investment_data.investment_stage,
-                        exit_type=investment_data.exit_type,
-                        exit_info=investment_data.exit_info,
-                        exit_year=investment_data.exit_year,
-                        last_scraped=datetime.utcnow(),
-                        created_at=datetime.utcnow(),
-                        updated_at=datetime.utcnow()
-                    )
-                    self.session.add(investment)
+                # Resolve each distinct PE firm once: preload existing firms in one
+                # query, then create any missing ones
+                firm_names = list(dict.fromkeys(inv.pe_firm_name for inv in company_create.pe_investments))
+                pe_firm_cache: Dict[str, PEFirm] = {
+                    firm.name: firm
+                    for firm in self.session.query(PEFirm).filter(PEFirm.name.in_(firm_names)).all()
+                }
+                for firm_name in firm_names:
+                    if firm_name not in pe_firm_cache:
+                        pe_firm_cache[firm_name] = self._get_or_create_pe_firm(firm_name, now)
+
+                investment_rows = [
+                    {
+                        'company_id': new_company.id,
+                        'pe_firm_id': pe_firm.id,
+                        'raw_status': investment_data.raw_status,
+                        'computed_status': CompanyPEInvestment.canonical_status(investment_data.computed_status) or 'Active',  # Default to Active
+                        'investment_year': investment_data.investment_year,
+                        'investment_stage': investment_data.investment_stage,
+                        'exit_type': investment_data.exit_type,
+                        'exit_info': investment_data.exit_info,
+                        'exit_year': investment_data.exit_year,
+                        'last_scraped': now,
+                        'created_at': now,
+                        'updated_at': now
+                    }
+                    for investment_data in company_create.pe_investments
+                    if (pe_firm := pe_firm_cache.get(investment_data.pe_firm_name))
+                ]
+                if investment_rows:
+                    # Single executemany INSERT instead of per-row unit-of-work bookkeeping
+                    self.session.execute(insert(CompanyPEInvestment), investment_rows)
 
             # Commit all changes
             self.session.commit()
+            invalidate_cache(METADATA_CACHE_PREFIX)
 
             # Return the created company
             return self.get_company_by_id(new_company.id)
 
-        except Exception as e:
+        except Exception:
             self.session.rollback()
-            print(f"Error creating company: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error creating company %r", company_create.name)
             return None
\ No newline at end of file
@@ -1,16 +1,75 @@
 """
 Investment service for business logic and data processing
 """
-from typing import Optional, List, Dict, Any, Tuple
-from sqlalchemy import or_, and_, text
+import base64
+import json
+from functools import cached_property
+from typing import Optional, List, Dict, Any, Tuple, Union, Iterator
+from sqlalchemy import JSON, Text, or_, and_, func, case, tuple_, select, update, literal_column
 from sqlalchemy.orm import Session
-from backend.services.base import BaseService
+from backend.services.base import BaseService, loaded_column
 from backend.schemas.responses import InvestmentResponse
-from backend.schemas.requests import InvestmentUpdate
+from backend.schemas.requests import InvestmentUpdate, InvestmentFilters
 from src.models.database_models_v2 import (
-    Company, CompanyPEInvestment, PEFirm, CompanyTag
+    Company, CompanyPEInvestment, PEFirm, CompanyTag, VERTICAL_TAG_CATEGORY, GENERATED_COMPANY_COLUMNS
 )
-from src.enrichment.crunchbase_helpers import decode_revenue_range
+from src.enrichment.crunchbase_helpers import decode_revenue_range, decode_employee_count
+
+# Rows fetched per round-trip when streaming investment pages
+INVESTMENT_BATCH_SIZE = 1000
+
+# Columns selected by get_investments, labelled with their InvestmentResponse
+# field names so each row maps onto the response without hydrating ORM entities
+RESPONSE_COLUMNS = (
+    CompanyPEInvestment.id.label('investment_id'),
+    CompanyPEInvestment.company_id,
+    Company.name.label('company_name'),
+    PEFirm.name.label('pe_firm_name'),
+    CompanyPEInvestment.computed_status.label('status'),
+    CompanyPEInvestment.raw_status,
+    CompanyPEInvestment.exit_type,
+    CompanyPEInvestment.exit_info,
+    CompanyPEInvestment.investment_year,
+    CompanyPEInvestment.sector_page.label('sector'),
+    Company.revenue_range,
+    Company.employee_count_display.label('employee_count'),  # generated column
+    Company.industry_category,
+    Company.predicted_revenue,
+    Company.prediction_confidence,
+    Company.headquarters_display.label('headquarters'),  # generated column
+    Company.website,
+    Company.linkedin_url,
+    Company.crunchbase_url,
+    Company.primary_industry_group,
+    Company.primary_industry_sector,
+    Company.verticals,
+    Company.current_revenue_usd,
+    Company.hq_location,
+    Company.hq_country,
+    Company.last_known_valuation_usd,
+)
+
+# Generated columns in RESPONSE_COLUMNS, by response field
+RESPONSE_GENERATED_COLUMNS = {
+    'employee_count': 'employee_count_display',
+    'headquarters': 'headquarters_display',
+}
+
+
+def encode_investment_cursor(company_name: str, investment_id: int) -> str:
+    """Encode the (company name, investment id) sort key of the last row as an opaque cursor"""
+    return base64.urlsafe_b64encode(json.dumps([company_name, investment_id]).encode()).decode()
+
+
+def decode_investment_cursor(cursor: str) -> Tuple[str, int]:
+    """Decode a cursor from encode_investment_cursor; raises ValueError if it is malformed"""
+    try:
+        company_name, investment_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(company_name, str) or not isinstance(investment_id, int):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return company_name, investment_id
 
 
 class InvestmentService(BaseService):
@@ -21,20 +80,29 @@ class InvestmentService(BaseService):
         Get employee count for display - returns the best available value.
         Priority: PitchBook/exact count > projected LinkedIn count > Crunchbase range
         """
+        # Use the pre-computed generated column when it was loaded with the row
+        loaded, display = loaded_column(company, 'employee_count_display')
+        if loaded:
+            return display
+
         # Check PitchBook employee_count first (from PitchBook ingestion)
-        if hasattr(company, 'employee_count') and company.employee_count:
-            return f"{company.employee_count:,}"  # e.g., "1,234"
+        if employee_count := company.employee_count:
+            return f"{employee_count:,}"  # e.g., "1,234"
         # If we have exact LinkedIn count, format it nicely
-        elif company.projected_employee_count:
-            return f"{company.projected_employee_count:,}"  # e.g., "1,234"
+        elif projected_employee_count := company.projected_employee_count:
+            return f"{projected_employee_count:,}"  # e.g., "1,234"
         # Fall back to Crunchbase range
-        elif company.crunchbase_employee_count:
-            from src.enrichment.crunchbase_helpers import decode_employee_count
-            return decode_employee_count(company.crunchbase_employee_count)  # e.g., "501-1,000"
+        elif crunchbase_employee_count := company.crunchbase_employee_count:
+            return decode_employee_count(crunchbase_employee_count)  # e.g., "501-1,000"
         return None
     
     def build_headquarters(self, company: Company) -> Optional[str]:
         """Build headquarters string from geographic fields (prioritize PitchBook data)"""
+        # Use the pre-computed generated column when it was loaded with the row
+        loaded, headquarters = loaded_column(company, 'headquarters_display')
+        if loaded:
+            return headquarters
+
         hq_parts = []
         
         # Use PitchBook location first if available
@@ -53,25 +121,6 @@ class InvestmentService(BaseService):
         
         return ", ".join(hq_parts) if hq_parts else None
     
-    def get_crunchbase_url_with_fallback(self, company: Company) -> Optional[str]:
-        """Get crunchbase_url with raw SQL fallback for model cache issues"""
-        try:
-            # Try direct attribute access first
-            return company.crunchbase_url
-        except AttributeError:
-            # Model cache issue - use raw SQL fallback
-            try:
-                cb_result = self.session.execute(
-                    text("SELECT crunchbase_url FROM companies WHERE id = :id"),
-                    {"id": company.id}
-                ).fetchone()
-                if cb_result:
-                    return cb_result[0]
-            except Exception as e:
-                print(f"[ERROR] Failed to get crunchbase_url for company {company.id}: {e}")
-                return None
-        return None
-    
     def get_company_industries(self, company_id: int) -> List[str]:
         """Get individual industry tags for a company (excluding 'Other')"""
         industry_tags = self.session.query(CompanyTag.tag_value).filter(
@@ -94,16 +143,51 @@ class InvestmentService(BaseService):
         else:
             return "Low"
 
-    def build_investment_response(self, investment: CompanyPEInvestment) -> InvestmentResponse:
-        """Build a complete InvestmentResponse from a CompanyPEInvestment model"""
-        headquarters = self.build_headquarters(investment.company)
-        crunchbase_url = self.get_crunchbase_url_with_fallback(investment.company)
-        industries_list = self.get_company_industries(investment.company.id)
+    @cached_property
+    def _is_postgresql(self) -> bool:
+        """Check if we're using PostgreSQL (dialect never changes for a session)"""
+        return self.session.bind.dialect.name == 'postgresql'
+
+    def industries_column(self):
+        """
+        Correlated subquery aggregating a company's industry tags (excluding 'Other')
+        into a JSON array, so industries come back with each investment row.
+        """
+        json_array_agg = func.json_agg if self._is_postgresql else func.json_group_array
+        return (
+            select(json_array_agg(CompanyTag.tag_value, type_=JSON))
+            .where(
+                CompanyTag.company_id == Company.id,
+                CompanyTag.tag_category == 'industry',
+                CompanyTag.tag_value != 'Other'
+            )
+            .correlate(Company)
+            .scalar_subquery()
+            .label('industries')
+        )
+
+    def build_investment_response(
+        self,
+        investment: CompanyPEInvestment,
+        industries: Optional[List[str]] = None
+    ) -> InvestmentResponse:
+        """
+        Build a complete InvestmentResponse from a CompanyPEInvestment model.
+        Pass the company's industries when they were fetched with the row
+        (see industries_column) to avoid a tag query per investment.
+        """
+        company = investment.company
+        headquarters = self.build_headquarters(company)
+        if industries is not None:
+            industries_list = industries
+        else:
+            industries_list = self.get_company_industries(company.id)
         
-        return InvestmentResponse(
+        # Values come straight from typed DB columns, so skip per-field validation
+        return InvestmentResponse.model_construct(
             investment_id=investment.id,
-            company_id=investment.company.id,
-            company_name=investment.company.name,
+            company_id=company.id,
+            company_name=company.name,
             pe_firm_name=investment.pe_firm.name,
             status=investment.computed_status or 'Unknown',
             raw_status=investment.raw_status,
@@ -111,45 +195,84 @@ class InvestmentService(BaseService):
             exit_info=investment.exit_info,
             investment_year=investment.investment_year,
             sector=investment.sector_page,
-            revenue_range=decode_revenue_range(investment.company.revenue_range),
-            employee_count=self.get_employee_count_display(investment.company),
-            industry_category=investment.company.industry_category,
+            revenue_range=decode_revenue_range(company.revenue_range),
+            employee_count=self.get_employee_count_display(company),
+            industry_category=company.industry_category,
             industries=industries_list,
-            predicted_revenue=investment.company.predicted_revenue,  # Already in millions in DB
-            prediction_confidence=investment.company.prediction_confidence,  # Keep as float 0-1 for frontend
+            predicted_revenue=company.predicted_revenue,  # Already in millions in DB
+            prediction_confidence=company.prediction_confidence,  # Keep as float 0-1 for frontend
             headquarters=headquarters,
-            website=investment.company.website,
-            linkedin_url=investment.company.linkedin_url,
-            crunchbase_url=crunchbase_url,
-            # PitchBook data
-            primary_industry_group=getattr(investment.company, 'primary_industry_group', None),
-            primary_industry_sector=getattr(investment.company, 'primary_industry_sector', None),
-            verticals=getattr(investment.company, 'verticals', None),
-            current_revenue_usd=float(investment.company.current_revenue_usd) if getattr(investment.company, 'current_revenue_usd', None) else None,
-            hq_location=getattr(investment.company, 'hq_location', None),
-            hq_country=getattr(investment.company, 'hq_country', None),
-            last_known_valuation_usd=float(investment.company.last_known_valuation_usd) if getattr(investment.company, 'last_known_valuation_usd', None) else None
+            website=company.website,
+            linkedin_url=company.linkedin_url,
+            crunchbase_url=company.crunchbase_url,
+            # PitchBook data (mapped columns on Company - read directly)
+            primary_industry_group=company.primary_industry_group,
+            primary_industry_sector=company.primary_industry_sector,
+            verticals=company.verticals,
+            current_revenue_usd=float(current_revenue) if (current_revenue := company.current_revenue_usd) else None,
+            hq_location=company.hq_location,
+            hq_country=company.hq_country,
+            last_known_valuation_usd=float(valuation) if (valuation := company.last_known_valuation_usd) else None
         )
-    
-    def apply_filters(self, query, filters: Dict[str, Any]):
+
+    def response_columns(self) -> Tuple:
+        """
+        RESPONSE_COLUMNS, computing any generated column the database predates
+        from its source columns in the SELECT instead
+        """
+        missing = {
+            field: column for field, column in RESPONSE_GENERATED_COLUMNS.items()
+            if column not in self.company_generated_columns
+        }
+        if not missing:
+            return RESPONSE_COLUMNS
+        return tuple(
+            literal_column(GENERATED_COMPANY_COLUMNS[missing[column.key]], Text).label(column.key)
+            if column.key in missing else column
+            for column in RESPONSE_COLUMNS
+        )
+
+    def build_investment_row_response(self, row) -> InvestmentResponse:
+        """
+        Build an InvestmentResponse from a RESPONSE_COLUMNS + industries row
+        (see get_investments); the columns are already labelled as response fields.
+        """
+        fields = row._asdict()
+        fields['status'] = fields['status'] or 'Unknown'
+        fields['revenue_range'] = decode_revenue_range(fields['revenue_range'])
+        fields['industries'] = fields['industries'] or []
+        if current_revenue := fields['current_revenue_usd']:
+            fields['current_revenue_usd'] = float(current_revenue)
+        else:
+            fields['current_revenue_usd'] = None
+        if valuation := fields['last_known_valuation_usd']:
+            fields['last_known_valuation_usd'] = float(valuation)
+        else:
+            fields['last_known_valuation_usd'] = None
+        return InvestmentResponse.model_construct(**fields)
+
+    def apply_filters(self, query, filters: Union[Dict[str, Any], InvestmentFilters]):
         """
         Apply all filters to an investment query.
         ENHANCED: Supports AND/OR/EXACT operators for advanced filtering.
+        Accepts a raw filters dict or an already parsed InvestmentFilters.
         """
-        # Get operator settings (default to backward-compatible behavior)
-        filter_operator = filters.get('filter_operator', 'AND').upper()
-        search_exact = filters.get('search_exact', False)
+        # Parse comma-separated values and operators once (defaults keep backward-compatible behavior)
+        if not isinstance(filters, InvestmentFilters):
+            filters = InvestmentFilters.model_validate(filters)
+        filter_operator = filters.filter_operator
+        search_exact = filters.search_exact
 
         # Collect all filter conditions if using global OR operator
         all_conditions = []
 
         # Company ID filter (for fetching investments by company) - always AND
-        if filters.get('company_id'):
-            query = query.filter(CompanyPEInvestment.company_id == filters['company_id'])
+        if filters.company_id:
+            query = query.filter(CompanyPEInvestment.company_id == filters.company_id)
 
         # Search filter
-        if filters.get('search'):
-            search_term = filters['search'].strip()
+        if filters.search:
+            search_term = filters.search.strip()
             if search_exact:
                 search_condition = Company.name == search_term
             else:
@@ -161,9 +284,9 @@ class InvestmentService(BaseService):
                 query = query.filter(search_condition)
 
         # PE Firm filter with operator support
-        if filters.get('pe_firm'):
-            pe_firms = [f.strip() for f in filters['pe_firm'].split(',')]
-            pe_firm_operator = filters.get('pe_firm_operator', 'OR').upper()
+        pe_firms = filters.pe_firm
+        if pe_firms:
+            pe_firm_operator = filters.pe_firm_operator
 
             if search_exact:
                 firm_conditions = [PEFirm.name == firm for firm in pe_firms]
@@ -171,16 +294,20 @@ class InvestmentService(BaseService):
                 firm_conditions = [PEFirm.name.ilike(f"%{firm}%") for firm in pe_firms]
 
             if pe_firm_operator == 'AND':
-                # For AND: investment company must have ALL specified firms
-                for firm_cond in firm_conditions:
-                    query = query.filter(
-                        Company.id.in_(
-                            self.session.query(Company.id)
-                            .join(CompanyPEInvestment)
-                            .join(PEFirm)
-                            .filter(firm_cond)
-                        )
+                # For AND: investment company must have ALL specified firms.
+                # One grouped scan - every firm condition must match at least one row.
+                query = query.filter(
+                    Company.id.in_(
+                        self.session.query(CompanyPEInvestment.company_id)
+                        .join(PEFirm)
+                        .filter(or_(*firm_conditions))
+                        .group_by(CompanyPEInvestment.company_id)
+                        .having(and_(*[
+                            func.max(case((firm_cond, 1), else_=0)) == 1
+                            for firm_cond in firm_conditions
+                        ]))
                     )
+                )
             else:
                 # For OR: investment company must have ANY specified firm
                 pe_firm_condition = or_(*firm_conditions)
@@ -190,38 +317,40 @@ class InvestmentService(BaseService):
                     query = query.filter(pe_firm_condition)
 
         # Status filter
-        if filters.get('status'):
-            status_condition = CompanyPEInvestment.computed_status.ilike(f"%{filters['status']}%")
+        if filters.status:
+            status_condition = CompanyPEInvestment.status_condition(filters.status)
             if filter_operator == 'OR':
                 all_conditions.append(status_condition)
             else:
                 query = query.filter(status_condition)
 
         # Exit type filter
-        if filters.get('exit_type'):
-            exit_condition = CompanyPEInvestment.exit_type.ilike(f"%{filters['exit_type']}%")
+        if filters.exit_type:
+            exit_condition = CompanyPEInvestment.exit_type.ilike(f"%{filters.exit_type}%")
             if filter_operator == 'OR':
                 all_conditions.append(exit_condition)
             else:
                 query = query.filter(exit_condition)
 
         # Industry filter with operator support
-        if filters.get('industry'):
-            industries = [i.strip() for i in filters['industry'].split(',')]
-            industry_operator = filters.get('industry_operator', 'OR').upper()
+        industries = filters.industry
+        if industries:
+            industry_operator = filters.industry_operator
 
             if industry_operator == 'AND':
-                # For AND: company must have ALL specified industry tags
-                for industry in industries:
-                    query = query.filter(
-                        Company.id.in_(
-                            self.session.query(CompanyTag.company_id)
-                            .filter(
-                                CompanyTag.tag_category == 'industry',
-                                CompanyTag.tag_value == industry
-                            )
+                # For AND: company must have ALL specified industry tags (one grouped scan)
+                required_industries = set(industries)
+                query = query.filter(
+                    Company.id.in_(
+                        self.session.query(CompanyTag.company_id)
+                        .filter(
+                            CompanyTag.tag_category == 'industry',
+                            CompanyTag.tag_value.in_(required_industries)
                         )
+                        .group_by(CompanyTag.company_id)
+                        .having(func.count(func.distinct(CompanyTag.tag_value)) == len(required_industries))
                     )
+                )
             else:
                 # For OR: company must have ANY specified industry tag
                 industry_condition = Company.id.in_(
@@ -237,9 +366,9 @@ class InvestmentService(BaseService):
                     query = query.filter(industry_condition)
 
         # PitchBook filters with operator support
-        if filters.get('industry_group'):
-            groups = [g.strip() for g in filters['industry_group'].split(',')]
-            industry_group_operator = filters.get('industry_group_operator', 'OR').upper()
+        groups = filters.industry_group
+        if groups:
+            industry_group_operator = filters.industry_group_operator
 
             if industry_group_operator == 'AND':
                 group_conditions = [Company.primary_industry_group == g for g in groups]
@@ -258,9 +387,9 @@ class InvestmentService(BaseService):
             else:
                 query = query.filter(group_condition)
 
-        if filters.get('industry_sector'):
-            sectors = [s.strip() for s in filters['industry_sector'].split(',')]
-            industry_sector_operator = filters.get('industry_sector_operator', 'OR').upper()
+        sectors = filters.industry_sector
+        if sectors:
+            industry_sector_operator = filters.industry_sector_operator
 
             if industry_sector_operator == 'AND':
                 sector_conditions = [Company.primary_industry_sector == s for s in sectors]
@@ -279,25 +408,34 @@ class InvestmentService(BaseService):
             else:
                 query = query.filter(sector_condition)
 
-        if filters.get('verticals'):
-            vertical_list = [v.strip() for v in filters['verticals'].split(',')]
-            verticals_operator = filters.get('verticals_operator', 'OR').upper()
+        vertical_list = filters.verticals
+        if vertical_list:
+            verticals_operator = filters.verticals_operator
 
             if search_exact:
                 vertical_conditions = [Company.verticals == v for v in vertical_list]
+                if verticals_operator == 'AND':
+                    verticals_condition = and_(
+                        Company.verticals != None,
+                        and_(*vertical_conditions)
+                    )
+                else:
+                    verticals_condition = and_(
+                        Company.verticals != None,
+                        or_(*vertical_conditions)
+                    )
             else:
-                vertical_conditions = [Company.verticals.ilike(f"%{v}%") for v in vertical_list]
-
-            if verticals_operator == 'AND':
-                verticals_condition = and_(
-                    Company.verticals != None,
-                    and_(*vertical_conditions)
-                )
-            else:
-                verticals_condition = and_(
-                    Company.verticals != None,
-                    or_(*vertical_conditions)
+                # Match the normalized vertical tags (index lookup, no ILIKE scan)
+                vertical_companies = select(CompanyTag.company_id).where(
+                    CompanyTag.tag_category == VERTICAL_TAG_CATEGORY,
+                    CompanyTag.tag_value.in_(vertical_list)
                 )
+                if verticals_operator == 'AND':
+                    # Company must have ALL specified verticals (one grouped scan)
+                    vertical_companies = vertical_companies.group_by(CompanyTag.company_id).having(
+                        func.count(func.distinct(CompanyTag.tag_value)) == len(set(vertical_list))
+                    )
+                verticals_condition = Company.id.in_(vertical_companies)
 
             if filter_operator == 'OR':
                 all_conditions.append(verticals_condition)
@@ -305,9 +443,9 @@ class InvestmentService(BaseService):
                 query = query.filter(verticals_condition)
 
         # Location filters with operator support
-        if filters.get('country'):
-            countries = [c.strip() for c in filters['country'].split(',')]
-            country_operator = filters.get('country_operator', 'OR').upper()
+        countries = filters.country
+        if countries:
+            country_operator = filters.country_operator
 
             if country_operator == 'AND':
                 country_conditions = [Company.country == c for c in countries]
@@ -326,9 +464,9 @@ class InvestmentService(BaseService):
             else:
                 query = query.filter(country_condition)
 
-        if filters.get('state_region'):
-            states = [s.strip() for s in filters['state_region'].split(',')]
-            state_region_operator = filters.get('state_region_operator', 'OR').upper()
+        states = filters.state_region
+        if states:
+            state_region_operator = filters.state_region_operator
 
             if state_region_operator == 'AND':
                 state_conditions = [Company.state_region == s for s in states]
@@ -347,9 +485,9 @@ class InvestmentService(BaseService):
             else:
                 query = query.filter(state_condition)
 
-        if filters.get('city'):
-            cities = [c.strip() for c in filters['city'].split(',')]
-            city_operator = filters.get('city_operator', 'OR').upper()
+        cities = filters.city
+        if cities:
+            city_operator = filters.city_operator
 
             if city_operator == 'AND':
                 city_conditions = [Company.city == c for c in cities]
@@ -369,37 +507,38 @@ class InvestmentService(BaseService):
                 query = query.filter(city_condition)
 
         # Revenue filters
-        if filters.get('min_revenue') is not None:
-            min_revenue_condition = Company.current_revenue_usd >= filters['min_revenue']
+        if filters.min_revenue is not None:
+            min_revenue_condition = Company.current_revenue_usd >= filters.min_revenue
             if filter_operator == 'OR':
                 all_conditions.append(min_revenue_condition)
             else:
                 query = query.filter(min_revenue_condition)
 
-        if filters.get('max_revenue') is not None:
-            max_revenue_condition = Company.current_revenue_usd <= filters['max_revenue']
+        if filters.max_revenue is not None:
+            max_revenue_condition = Company.current_revenue_usd <= filters.max_revenue
             if filter_operator == 'OR':
                 all_conditions.append(max_revenue_condition)
             else:
                 query = query.filter(max_revenue_condition)
 
         # Employee count filters
-        if filters.get('min_employees') is not None:
+        # Crunchbase ranges overlap the requested bound when hi >= min / lo <= max
+        if filters.min_employees is not None:
             min_emp_condition = or_(
-                Company.projected_employee_count >= filters['min_employees'],
-                Company.employee_count >= filters['min_employees'],
-                Company.crunchbase_employee_count.ilike(f"%{filters['min_employees']}%")
+                Company.projected_employee_count >= filters.min_employees,
+                Company.employee_count >= filters.min_employees,
+                Company.crunchbase_employee_condition(self.company_generated_columns, minimum=filters.min_employees)
             )
             if filter_operator == 'OR':
                 all_conditions.append(min_emp_condition)
             else:
                 query = query.filter(min_emp_condition)
 
-        if filters.get('max_employees') is not None:
+        if filters.max_employees is not None:
             max_emp_condition = or_(
-                Company.projected_employee_count <= filters['max_employees'],
-                Company.employee_count <= filters['max_employees'],
-                Company.crunchbase_employee_count.ilike(f"%{filters['max_employees']}%")
+                Company.projected_employee_count <= filters.max_employees,
+                Company.employee_count <= filters.max_employees,
+                Company.crunchbase_employee_condition(self.company_generated_columns, maximum=filters.max_employees)
             )
             if filter_operator == 'OR':
                 all_conditions.append(max_emp_condition)
@@ -412,45 +551,79 @@ class InvestmentService(BaseService):
 
         return query
     
-    def get_investments(self, filters: Dict[str, Any], limit: int = 10000, offset: int = 0) -> List[InvestmentResponse]:
-        """Get investments with filters and pagination"""
+    def get_investments(
+        self,
+        filters: Dict[str, Any],
+        limit: int = 10000,
+        offset: int = 0,
+        after: Optional[Tuple[str, int]] = None
+    ) -> List[InvestmentResponse]:
+        """
+        Get investments with filters and pagination.
+        Pass after=(company_name, investment_id) of the previous page's last row
+        (see decode_investment_cursor) for keyset pagination instead of OFFSET.
+        """
+        return list(self.iter_investments(filters, limit, offset, after=after))
+    
+    def iter_investments(
+        self,
+        filters: Dict[str, Any],
+        limit: int = 10000,
+        offset: int = 0,
+        after: Optional[Tuple[str, int]] = None
+    ) -> Iterator[InvestmentResponse]:
+        """
+        Same page as get_investments, yielded as rows arrive from a server-side
+        cursor so only INVESTMENT_BATCH_SIZE rows are held at a time.
+        """
         
-        query = self.session.query(CompanyPEInvestment).join(Company).join(PEFirm)
+        # OPTIMIZATION: Select only the response columns as plain rows - no ORM
+        # entities, identity map or lazy-load instrumentation per investment
+        query = (
+            self.session.query(*self.response_columns(), self.industries_column())
+            .select_from(CompanyPEInvestment)
+            .join(CompanyPEInvestment.company)
+            .join(CompanyPEInvestment.pe_firm)
+        )
         
         # Apply all filters
         query = self.apply_filters(query, filters)
         
-        # Order by company name
-        query = query.order_by(Company.name)
+        # Order by company name (investment id breaks ties so the keyset is unique)
+        query = query.order_by(Company.name, CompanyPEInvestment.id)
         
-        # Apply pagination
-        investments = query.offset(offset).limit(limit).all()
+        # Keyset pagination: seek past the previous page instead of scanning OFFSET rows
+        if after is not None:
+            query = query.filter(tuple_(Company.name, CompanyPEInvestment.id) > tuple_(*after))
         
-        # Build response objects
-        result = [self.build_investment_response(inv) for inv in investments]
+        # Apply pagination. yield_per streams rows (stream_results) in batches so each
+        # batch can be released once converted; industries arrive aggregated on the
+        # same row (one query).
+        rows = query.offset(offset).limit(limit).yield_per(INVESTMENT_BATCH_SIZE)
         
-        return result
+        # Build response objects
+        for row in rows:
+            yield self.build_investment_row_response(row)
     
     def update_investment(self, investment_id: int, investment_update: InvestmentUpdate) -> bool:
         """Update investment details"""
-        investment = self.session.query(CompanyPEInvestment).filter(CompanyPEInvestment.id == investment_id).first()
-        if not investment:
-            return False
+        # Update fields if provided - one UPDATE statement, no SELECT or ORM hydration
+        values = investment_update.model_dump(exclude_none=True)
+        if 'computed_status' in values:
+            values['computed_status'] = CompanyPEInvestment.canonical_status(values['computed_status'])
+        if not values:
+            return self.session.execute(
+                select(CompanyPEInvestment.id).where(CompanyPEInvestment.id == investment_id)
+            ).first() is not None
         
         try:
-            # Update fields if provided
-            if investment_update.computed_status is not None:
-                investment.computed_status = investment_update.computed_status
-            if investment_update.raw_status is not None:
-                investment.raw_status = investment_update.raw_status
-            if investment_update.exit_type is not None:
-                investment.exit_type = investment_update.exit_type
-            if investment_update.exit_info is not None:
-                investment.exit_info = investment_update.exit_info
-            if investment_update.exit_year is not None:
-                investment.exit_year = investment_update.exit_year
-            if investment_update.investment_year is not None:
-                investment.investment_year = investment_update.investment_year
+            result = self.session.execute(
+                update(CompanyPEInvestment)
+                .where(CompanyPEInvestment.id == investment_id)
+                .values(**values)
+            )
+            if result.rowcount == 0:
+                return False
             
             self.session.commit()
             return True
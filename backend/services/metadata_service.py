@@ -1,61 +1,107 @@
 """
 Metadata service for business logic and data processing
 """
+from functools import cached_property
 from typing import List, Dict, Any
-from sqlalchemy import func, distinct
+from sqlalchemy import String, func, distinct, literal, null, select, union_all
 from backend.services.base import BaseService
 from backend.schemas.responses import LocationsResponse, PitchBookMetadataResponse, IndustriesResponse
 from src.models.database_models_v2 import Company, CompanyTag
+from backend.middleware.query_cache import cache_result
+
+# Cache key prefix shared by all metadata lookups (see invalidate_cache)
+METADATA_CACHE_PREFIX = "metadata"
+# Dropdown values only change on ingestion/edits, so serve them from cache
+METADATA_CACHE_TTL_SECONDS = 300
+
+# PitchBookMetadataResponse field -> Company column it lists the distinct values of
+PITCHBOOK_METADATA_COLUMNS = {
+    'industry_groups': Company.primary_industry_group,
+    'industry_sectors': Company.primary_industry_sector,
+    'verticals': Company.verticals,
+    'hq_locations': Company.hq_location,
+    'hq_countries': Company.hq_country,
+}
 
 
 class MetadataService(BaseService):
     """Service for metadata-related business logic"""
     
+    @cached_property
+    def _is_postgresql(self) -> bool:
+        """Check if we're using PostgreSQL (dialect never changes for a session)"""
+        return self.session.bind.dialect.name == 'postgresql'
+
+    def _pitchbook_value_column(self, kind: str, column):
+        """
+        Value expression listed for a PitchBook metadata column. On PostgreSQL the
+        comma-separated verticals are split and trimmed server-side, so DISTINCT
+        runs over individual verticals rather than every raw combination.
+        """
+        if kind == 'verticals' and self._is_postgresql:
+            return func.trim(func.unnest(func.string_to_array(column, ',')))
+        return column
+
+    @cache_result(ttl_seconds=METADATA_CACHE_TTL_SECONDS, key_prefix=f"{METADATA_CACHE_PREFIX}_locations")
     def get_locations(self) -> LocationsResponse:
-        """Get all unique locations from companies with counts"""
+        """
+        Get all unique locations from companies with counts.
+        OPTIMIZED: Countries, states and cities come back from one UNION ALL
+        round-trip, tagged with their kind, instead of three separate queries.
+        """
         from backend.schemas.responses import LocationData
 
-        # Get countries with counts
-        countries_raw = self.session.query(
-            Company.country,
-            func.count(distinct(Company.id)).label('count')
-        ).filter(
-            Company.country.isnot(None)
-        ).group_by(Company.country).order_by(Company.country).all()
-
-        countries_list = [
-            LocationData(name=c[0], count=c[1])
-            for c in countries_raw if c[0]
-        ]
-
-        # Get states/regions with counts and country
-        states_raw = self.session.query(
-            Company.state_region,
-            Company.country,
-            func.count(distinct(Company.id)).label('count')
-        ).filter(
-            Company.state_region.isnot(None)
-        ).group_by(Company.state_region, Company.country).order_by(Company.state_region).all()
-
-        states_list = [
-            LocationData(name=s[0], count=s[2], country=s[1])
-            for s in states_raw if s[0]
-        ]
-
-        # Get cities with counts, state, and country (limit to top 100 by count)
-        cities_raw = self.session.query(
-            Company.city,
-            Company.state_region,
-            Company.country,
-            func.count(distinct(Company.id)).label('count')
-        ).filter(
+        company_count = func.count(distinct(Company.id)).label('count')
+        no_value = null().cast(String)
+
+        countries = select(
+            literal('country').label('kind'),
+            Company.country.label('name'),
+            no_value.label('state'),
+            no_value.label('country'),
+            company_count
+        ).where(Company.country.isnot(None)).group_by(Company.country)
+
+        states = select(
+            literal('state').label('kind'),
+            Company.state_region.label('name'),
+            no_value.label('state'),
+            Company.country.label('country'),
+            company_count
+        ).where(Company.state_region.isnot(None)).group_by(Company.state_region, Company.country)
+
+        # Cities are limited to the top 100 by count, so rank them in a subquery
+        top_cities = select(
+            literal('city').label('kind'),
+            Company.city.label('name'),
+            Company.state_region.label('state'),
+            Company.country.label('country'),
+            company_count
+        ).where(
             Company.city.isnot(None)
-        ).group_by(Company.city, Company.state_region, Company.country).order_by(func.count(distinct(Company.id)).desc()).limit(100).all()
+        ).group_by(
+            Company.city, Company.state_region, Company.country
+        ).order_by(company_count.desc()).limit(100).subquery()
+
+        rows = self.session.execute(
+            union_all(countries, states, select(*top_cities.c))
+        ).all()
 
-        cities_list = [
-            LocationData(name=c[0], count=c[3], state=c[1], country=c[2])
-            for c in cities_raw if c[0]
-        ]
+        countries_list, states_list, cities_list = [], [], []
+        for kind, name, state, country, count in rows:
+            if not name:
+                continue
+            if kind == 'country':
+                countries_list.append(LocationData(name=name, count=count))
+            elif kind == 'state':
+                states_list.append(LocationData(name=name, count=count, country=country))
+            else:
+                cities_list.append(LocationData(name=name, count=count, state=state, country=country))
+
+        # Countries and states alphabetically, cities by company count
+        countries_list.sort(key=lambda location: location.name)
+        states_list.sort(key=lambda location: location.name)
+        cities_list.sort(key=lambda location: location.count, reverse=True)
 
         return LocationsResponse(
             countries=countries_list,
@@ -63,58 +109,42 @@ class MetadataService(BaseService):
             cities=cities_list
         )
     
+    @cache_result(ttl_seconds=METADATA_CACHE_TTL_SECONDS, key_prefix=f"{METADATA_CACHE_PREFIX}_pitchbook")
     def get_pitchbook_metadata(self) -> PitchBookMetadataResponse:
-        """Get PitchBook-specific metadata"""
-        
-        # Get unique industry groups
-        industry_groups = self.session.query(distinct(Company.primary_industry_group)).filter(
-            Company.primary_industry_group.isnot(None)
-        ).order_by(Company.primary_industry_group).all()
-        industry_groups_list = [ig[0] for ig in industry_groups if ig[0]]
-        
-        # Get unique industry sectors
-        industry_sectors = self.session.query(distinct(Company.primary_industry_sector)).filter(
-            Company.primary_industry_sector.isnot(None)
-        ).order_by(Company.primary_industry_sector).all()
-        industry_sectors_list = [is_[0] for is_ in industry_sectors if is_[0]]
-        
-        # Get unique verticals (these are comma-separated, so we need to split them)
-        verticals_raw = self.session.query(distinct(Company.verticals)).filter(
-            Company.verticals.isnot(None)
-        ).all()
-        
-        # Parse comma-separated verticals
-        verticals_set = set()
-        for v_row in verticals_raw:
-            if v_row[0]:
-                # Split by comma and clean up
-                for vertical in v_row[0].split(','):
-                    cleaned = vertical.strip()
-                    if cleaned:
-                        verticals_set.add(cleaned)
-        
-        verticals_list = sorted(list(verticals_set))
-        
-        # Get unique HQ locations
-        hq_locations = self.session.query(distinct(Company.hq_location)).filter(
-            Company.hq_location.isnot(None)
-        ).order_by(Company.hq_location).all()
-        hq_locations_list = [hq[0] for hq in hq_locations if hq[0]]
-        
-        # Get unique HQ countries
-        hq_countries = self.session.query(distinct(Company.hq_country)).filter(
-            Company.hq_country.isnot(None)
-        ).order_by(Company.hq_country).all()
-        hq_countries_list = [hq[0] for hq in hq_countries if hq[0]]
-        
+        """
+        Get PitchBook-specific metadata.
+        OPTIMIZED: All five distinct-value lists come back from one UNION ALL
+        round-trip, tagged with the column they came from.
+        """
+        rows = self.session.execute(union_all(*(
+            select(literal(kind).label('kind'), self._pitchbook_value_column(kind, column).label('value'))
+            .where(column.isnot(None))
+            .distinct()
+            for kind, column in PITCHBOOK_METADATA_COLUMNS.items()
+        ))).all()
+
+        values = {kind: set() for kind in PITCHBOOK_METADATA_COLUMNS}
+        for kind, value in rows:
+            if not value:
+                continue
+            if kind == 'verticals':
+                # Verticals are comma-separated, so split them and clean up
+                # (already split by the database on PostgreSQL - this is then a no-op)
+                values[kind].update(
+                    cleaned for vertical in value.split(',') if (cleaned := vertical.strip())
+                )
+            else:
+                values[kind].add(value)
+
         return PitchBookMetadataResponse(
-            industry_groups=industry_groups_list,
-            industry_sectors=industry_sectors_list,
-            verticals=verticals_list,
-            hq_locations=hq_locations_list,
-            hq_countries=hq_countries_list
+            industry_groups=sorted(values['industry_groups']),
+            industry_sectors=sorted(values['industry_sectors']),
+            verticals=sorted(values['verticals']),
+            hq_locations=sorted(values['hq_locations']),
+            hq_countries=sorted(values['hq_countries'])
         )
     
+    @cache_result(ttl_seconds=METADATA_CACHE_TTL_SECONDS, key_prefix=f"{METADATA_CACHE_PREFIX}_industries")
     def get_industries(self) -> IndustriesResponse:
         """Get all unique industry tags"""
         
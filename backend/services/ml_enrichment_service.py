@@ -1,23 +1,60 @@
 """
 ML Enrichment Service - Add ML predictions to company data
 """
-from typing import Optional, Dict, Any
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from operator import attrgetter
+from typing import Optional, Dict, Any, List, Iterator, Tuple, TYPE_CHECKING
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 import sys
 from pathlib import Path
 
-# Add ml_pipeline to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "ml_pipeline"))
-
 from src.models.database_models_v2 import Company
-import pandas as pd
-import numpy as np
-import pickle
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# pandas/numpy/joblib are imported where they are used, so importing this module
+# (e.g. from the API router) doesn't load them into workers that never predict
+ML_PIPELINE_DIR = str(Path(__file__).parent.parent.parent / "ml_pipeline")
 
 
 class MLEnrichmentService:
     """Service for enriching company data with ML predictions"""
 
+    # (feature name, getter) pairs, built once rather than as a dict literal per company
+    _FEATURE_SPECS = (
+        # Valuation is already in millions USD according to schema
+        ('pitchbook_valuation_usd_millions', attrgetter('last_known_valuation_usd')),
+        ('employee_count_pitchbook', attrgetter('employee_count')),
+        ('employee_count_linkedin_scraped', attrgetter('projected_employee_count')),
+        ('pitchbook_last_financing_size_usd_millions', attrgetter('last_financing_size_usd')),
+        ('total_funding_usd', lambda c: float(c.total_funding_usd) if c.total_funding_usd else 0),
+        ('num_funding_rounds', lambda c: c.num_funding_rounds or 0),
+        ('avg_round_size_usd', lambda c: float(c.avg_round_size_usd) if c.avg_round_size_usd else 0),
+        ('total_investors', lambda c: c.total_investors or 0),
+        ('months_since_last_funding', attrgetter('months_since_last_funding')),
+        ('funding_stage_encoded', lambda c: float(c.funding_stage_encoded) if c.funding_stage_encoded else None),
+        ('company_age_years', lambda c: (2025 - c.founded_year) if c.founded_year else None),
+        ('founded_year', lambda c: float(c.founded_year) if c.founded_year else None),
+        ('num_pe_investors', lambda c: 1),  # Since it's in PE portfolio
+        ('is_pe_backed', lambda c: 1),
+        ('is_public', lambda c: c.is_public or False),
+        ('pitchbook_primary_industry_sector', attrgetter('primary_industry_sector')),
+        ('pitchbook_primary_industry_group', attrgetter('primary_industry_group')),
+        ('pitchbook_hq_country', attrgetter('hq_country')),
+        ('latest_funding_type', attrgetter('latest_funding_type')),
+        ('crunchbase_revenue_range', attrgetter('revenue_range')),
+        ('company_size_category', attrgetter('company_size_category')),
+        ('country', attrgetter('country')),
+        ('state_region', attrgetter('state_region')),
+        ('city', attrgetter('city')),
+        ('pitchbook_last_financing_date', lambda c: str(c.last_financing_date) if c.last_financing_date else None),
+        ('pitchbook_last_financing_deal_type', attrgetter('last_financing_deal_type')),
+        ('pitchbook_verticals', attrgetter('verticals')),
+    )
+
     def __init__(self):
         self._feature_engineer = None
         self._ensemble_model = None
@@ -28,53 +65,65 @@ class MLEnrichmentService:
         if self._models_loaded:
             return
 
+        import joblib
+
+        # The pickled feature engineer references ml_pipeline modules by top-level name
+        if ML_PIPELINE_DIR not in sys.path:
+            sys.path.insert(0, ML_PIPELINE_DIR)
+
         models_dir = Path(__file__).parent.parent.parent / "ml_pipeline" / "output" / "models"
 
         # Load feature engineer
+        # mmap_mode='r' maps the numpy arrays read-only instead of copying them into
+        # each worker's heap; forked workers share the pages via the OS page cache
         fe_path = models_dir / "feature_engineer.pkl"
         if fe_path.exists():
-            with open(fe_path, 'rb') as f:
-                self._feature_engineer = pickle.load(f)
+            self._feature_engineer = joblib.load(fe_path, mmap_mode='r')
 
         # Load ensemble model
         ensemble_path = models_dir / "ensemble.pkl"
         if ensemble_path.exists():
-            with open(ensemble_path, 'rb') as f:
-                self._ensemble_model = pickle.load(f)
+            self._ensemble_model = joblib.load(ensemble_path, mmap_mode='r')
 
         self._models_loaded = True
 
     def prepare_company_features(self, company: Company) -> Dict[str, Any]:
         """Extract features from company for ML prediction"""
+        return {name: getter(company) for name, getter in self._FEATURE_SPECS}
+
+    def _feature_columns(self, companies: List[Company]) -> Dict[str, list]:
+        """Extract features column-wise (same columns as prepare_company_features) - plain, picklable lists"""
+        return {name: [getter(company) for company in companies] for name, getter in self._FEATURE_SPECS}
+
+    def _feature_frame(self, companies: List[Company]) -> "pd.DataFrame":
+        """Build the feature DataFrame column-wise (same columns as prepare_company_features)"""
+        import pandas as pd
+        return pd.DataFrame(self._feature_columns(companies))
+
+    @staticmethod
+    def _build_prediction(predicted_revenue: float, features_completeness: float) -> Dict[str, Any]:
+        """Wrap a predicted revenue with its completeness-based confidence band"""
+        # Calculate confidence level
+        if features_completeness >= 0.7:
+            confidence = "High"
+            interval_width = 0.2
+        elif features_completeness >= 0.5:
+            confidence = "Medium"
+            interval_width = 0.35
+        else:
+            confidence = "Low"
+            interval_width = 0.5
+
+        # Calculate confidence intervals
+        lower = max(0, predicted_revenue * (1 - interval_width))
+        upper = predicted_revenue * (1 + interval_width)
+
         return {
-            # Valuation is already in millions USD according to schema
-            'pitchbook_valuation_usd_millions': company.last_known_valuation_usd,
-            'employee_count_pitchbook': company.employee_count,
-            'employee_count_linkedin_scraped': company.projected_employee_count,
-            'pitchbook_last_financing_size_usd_millions': company.last_financing_size_usd,
-            'total_funding_usd': float(company.total_funding_usd) if company.total_funding_usd else 0,
-            'num_funding_rounds': company.num_funding_rounds or 0,
-            'avg_round_size_usd': float(company.avg_round_size_usd) if company.avg_round_size_usd else 0,
-            'total_investors': company.total_investors or 0,
-            'months_since_last_funding': company.months_since_last_funding,
-            'funding_stage_encoded': float(company.funding_stage_encoded) if company.funding_stage_encoded else None,
-            'company_age_years': (2025 - company.founded_year) if company.founded_year else None,
-            'founded_year': float(company.founded_year) if company.founded_year else None,
-            'num_pe_investors': 1,  # Since it's in PE portfolio
-            'is_pe_backed': 1,
-            'is_public': company.is_public or False,
-            'pitchbook_primary_industry_sector': company.primary_industry_sector,
-            'pitchbook_primary_industry_group': company.primary_industry_group,
-            'pitchbook_hq_country': company.hq_country,
-            'latest_funding_type': company.latest_funding_type,
-            'crunchbase_revenue_range': company.revenue_range,
-            'company_size_category': company.company_size_category,
-            'country': company.country,
-            'state_region': company.state_region,
-            'city': company.city,
-            'pitchbook_last_financing_date': str(company.last_financing_date) if company.last_financing_date else None,
-            'pitchbook_last_financing_deal_type': company.last_financing_deal_type,
-            'pitchbook_verticals': company.verticals
+            'predicted_revenue': round(predicted_revenue, 2),
+            'confidence_level': confidence,
+            'confidence_lower': round(lower, 2),
+            'confidence_upper': round(upper, 2),
+            'features_completeness': features_completeness
         }
 
     def predict_revenue(self, company: Company) -> Optional[Dict[str, Any]]:
@@ -91,6 +140,9 @@ class MLEnrichmentService:
             if not self._models_loaded or not self._ensemble_model or not self._feature_engineer:
                 return None
 
+            import numpy as np
+            import pandas as pd
+
             # Prepare features
             features = self.prepare_company_features(company)
             df = pd.DataFrame([features])
@@ -111,30 +163,7 @@ class MLEnrichmentService:
 
             # Make prediction
             prediction_log = self._ensemble_model.predict(df_processed)[0]
-            predicted_revenue = np.expm1(prediction_log)
-
-            # Calculate confidence level
-            if features_completeness >= 0.7:
-                confidence = "High"
-                interval_width = 0.2
-            elif features_completeness >= 0.5:
-                confidence = "Medium"
-                interval_width = 0.35
-            else:
-                confidence = "Low"
-                interval_width = 0.5
-
-            # Calculate confidence intervals
-            lower = max(0, predicted_revenue * (1 - interval_width))
-            upper = predicted_revenue * (1 + interval_width)
-
-            return {
-                'predicted_revenue': round(predicted_revenue, 2),
-                'confidence_level': confidence,
-                'confidence_lower': round(lower, 2),
-                'confidence_upper': round(upper, 2),
-                'features_completeness': features_completeness
-            }
+            return self._build_prediction(np.expm1(prediction_log), features_completeness)
 
         except Exception as e:
             # Only log errors, don't print for every prediction
@@ -142,6 +171,87 @@ class MLEnrichmentService:
             logging.error(f"Prediction error for company {company.id}: {e}")
             return None
 
+    def predict_revenue_batch(self, companies: List[Company]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Predict revenue for many companies with one feature transform and one
+        ensemble predict call (same output as predict_revenue per company).
+        Falls back to per-company prediction if the batch can't be transformed,
+        so one bad row only loses its own prediction.
+        """
+        if not companies:
+            return []
+
+        self._load_models()
+
+        if not self._models_loaded or not self._ensemble_model or not self._feature_engineer:
+            return [None] * len(companies)
+
+        try:
+            return self._predict_frame(self._feature_frame(companies))
+        except Exception as e:
+            import logging
+            logging.warning(f"Batch prediction failed, predicting companies one by one: {e}")
+            return [self.predict_revenue(company) for company in companies]
+
+    def predict_feature_columns(self, columns: Dict[str, list]) -> List[Optional[Dict[str, Any]]]:
+        """
+        predict_revenue_batch for features already extracted by _feature_columns
+        (no Company objects, e.g. in a worker process). Falls back to one row at
+        a time if the batch can't be transformed.
+        """
+        import pandas as pd
+
+        df = pd.DataFrame(columns)
+        if df.empty:
+            return []
+
+        self._load_models()
+
+        if not self._models_loaded or not self._ensemble_model or not self._feature_engineer:
+            return [None] * len(df)
+
+        try:
+            return self._predict_frame(df)
+        except Exception as e:
+            import logging
+            logging.warning(f"Batch prediction failed, predicting rows one by one: {e}")
+
+        predictions = []
+        for i in range(len(df)):
+            try:
+                predictions.extend(self._predict_frame(df.iloc[[i]]))
+            except Exception:
+                predictions.append(None)
+        return predictions
+
+    def _predict_frame(self, df: "pd.DataFrame") -> List[Dict[str, Any]]:
+        """One feature transform and one ensemble predict for a whole frame; raises if either fails"""
+        import numpy as np
+
+        completeness = df.notna().sum(axis=1).to_numpy() / df.shape[1]
+        df_processed = self._feature_engineer.transform(df, target='revenue_usd_millions')
+        predicted_revenues = np.expm1(self._ensemble_model.predict(df_processed))
+
+        return [
+            self._build_prediction(predicted_revenue, features_completeness)
+            for predicted_revenue, features_completeness in zip(predicted_revenues, completeness)
+        ]
+
+    @staticmethod
+    def _prediction_updates(company_ids: List[int], predictions: List[Optional[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Bulk UPDATE parameter rows for the companies that got a prediction"""
+        # Convert numpy types to Python floats for PostgreSQL
+        # Store predicted revenue in millions USD (consistent with current_revenue_usd field)
+        return [
+            {
+                'id': company_id,
+                'predicted_revenue': float(prediction['predicted_revenue']),
+                'prediction_confidence': float(prediction['features_completeness'])
+            }
+            for company_id, prediction in zip(company_ids, predictions)
+            if prediction
+        ]
+
     def enrich_company(self, db: Session, company_id: int, force_update: bool = False) -> Optional[Company]:
         """
         Enrich a company with ML predictions and save to database
@@ -193,7 +303,13 @@ class MLEnrichmentService:
                 count += 1
         return count
 
-    def enrich_all_companies(self, db: Session, force_update: bool = False, batch_size: int = 100) -> int:
+    def enrich_all_companies(
+        self,
+        db: Session,
+        force_update: bool = False,
+        batch_size: int = 100,
+        workers: int = 1
+    ) -> int:
         """
         Enrich all companies in database with ML predictions
 
@@ -201,6 +317,7 @@ class MLEnrichmentService:
             db: Database session
             force_update: Force re-prediction for all companies
             batch_size: Number of companies to process at once
+            workers: Predict batches in this many worker processes (1 = in-process)
 
         Returns:
             Total number of companies enriched
@@ -223,23 +340,81 @@ class MLEnrichmentService:
         logger = logging.getLogger(__name__)
         logger.info(f"Enriching {total} companies with ML predictions")
 
-        # Process in batches
-        for offset in range(0, total, batch_size):
-            companies = query.offset(offset).limit(batch_size).all()
-
-            for company in companies:
-                prediction = self.predict_revenue(company)
-                if prediction:
-                    # Convert numpy types to Python floats for PostgreSQL
-                    # Store predicted revenue in millions USD (consistent with current_revenue_usd field)
-                    company.predicted_revenue = float(prediction['predicted_revenue'])
-                    company.prediction_confidence = float(prediction['features_completeness'])
-                    enriched += 1
+        processed = 0
+        for batches, (batch_count, updates) in enumerate(
+            self._predicted_batches(self._company_batches(query, batch_size), workers)
+        ):
+            if updates:
+                # Bulk UPDATE by primary key - one executemany per batch instead of
+                # a unit-of-work flush emitting an UPDATE per company
+                db.execute(update(Company), updates)
+                enriched += len(updates)
 
             db.commit()
+            processed += batch_count
             # Only log every 10 batches to reduce log spam
-            if offset % (batch_size * 10) == 0:
-                logger.info(f"Progress: {min(offset + batch_size, total)}/{total} companies processed")
+            if batches % 10 == 0:
+                logger.info(f"Progress: {processed}/{total} companies processed")
 
         logger.info(f"Enrichment complete! {enriched} companies enriched with ML predictions")
         return enriched
+
+    @staticmethod
+    def _company_batches(query, batch_size: int) -> Iterator[List[Company]]:
+        """
+        Page through the query in id order. Seek by id rather than OFFSET: updated
+        rows drop out of the predicted_revenue IS NULL filter, which would shift
+        offsets past companies that have not been processed yet.
+        """
+        last_id = 0
+        while companies := query.filter(Company.id > last_id).order_by(Company.id).limit(batch_size).all():
+            last_id = companies[-1].id
+            yield companies
+
+    def _predicted_batches(
+        self,
+        batches: Iterator[List[Company]],
+        workers: int
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Yield (companies in batch, bulk UPDATE rows) per batch, in batch order.
+        With workers > 1 each batch's features are predicted in a worker process
+        (models loaded once per worker); a few batches are kept in flight so the
+        workers stay busy while the caller writes results.
+        """
+        if workers <= 1:
+            for companies in batches:
+                # One vectorized transform + predict per batch instead of per company
+                predictions = self.predict_revenue_batch(companies)
+                yield len(companies), self._prediction_updates([company.id for company in companies], predictions)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_prediction_worker) as executor:
+            pending = deque()
+            for companies in batches:
+                future = executor.submit(
+                    _predict_feature_batch, [company.id for company in companies], self._feature_columns(companies)
+                )
+                pending.append((len(companies), future))
+                if len(pending) > 2 * workers:
+                    batch_count, future = pending.popleft()
+                    yield batch_count, future.result()
+            while pending:
+                batch_count, future = pending.popleft()
+                yield batch_count, future.result()
+
+
+# Service used inside enrich_all_companies worker processes (see _init_prediction_worker)
+_worker_service: Optional[MLEnrichmentService] = None
+
+
+def _init_prediction_worker() -> None:
+    """ProcessPoolExecutor initializer - load the models once per worker process"""
+    global _worker_service
+    _worker_service = MLEnrichmentService()
+    _worker_service._load_models()
+
+
+def _predict_feature_batch(company_ids: List[int], columns: Dict[str, list]) -> List[Dict[str, Any]]:
+    """Predict one batch in a worker process; returns its bulk UPDATE rows"""
+    return MLEnrichmentService._prediction_updates(company_ids, _worker_service.predict_feature_columns(columns))
@@ -5,12 +5,20 @@ Autonomous testing, coverage analysis, and test generation
 import ast
 import os
 import re
+import string
 import subprocess
 import smtplib
 import json
+import hashlib
+import tempfile
+import threading
+import xml.etree.ElementTree as ElementTree
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Set, Tuple
-from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Set, Tuple, Union
+from dataclasses import asdict, dataclass, field
 from enum import Enum
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -19,6 +27,17 @@ from email import encoders
 from datetime import datetime
 
 
+# Files in backend/services and backend/api that are not expected to have tests
+_SKIP_SERVICE = frozenset({"__init__.py", "base.py", "security_service.py"})
+_SKIP_API = frozenset({"__init__.py"})
+
+# Coverage row printed by pytest-cov's term report
+_COV_RE = re.compile(r'TOTAL\s+\d+\s+\d+\s+(\d+)%')
+# Final pytest summary line, e.g. "5 passed, 1 failed, 2 skipped in 3.21s"
+_SUMMARY_RE = re.compile(r'\b\d+ (?:passed|failed|skipped|errors?)\b.* in [\d.]+s\b')
+_OUTCOME_RE = re.compile(r'(\d+) (passed|failed|skipped|error)')
+
+
 class TestType(Enum):
     """Types of tests"""
     UNIT = "unit"
@@ -54,40 +73,304 @@ class TestMetrics:
     coverage_gaps: List[CoverageGap] = field(default_factory=list)
 
 
+def _iter_py(root: Path, recursive: bool = False) -> Iterator[Path]:
+    """
+    Yield the .py files under root using os.scandir
+
+    DirEntry caches the file type from the directory read, so unlike
+    Path.glob no extra stat() is issued per entry. Hidden directories and
+    __pycache__ are never descended into. A missing root yields nothing.
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.py') and entry.is_file(follow_symlinks=False):
+                        yield Path(entry.path)
+                    elif (
+                        recursive
+                        and entry.is_dir(follow_symlinks=False)
+                        and entry.name != '__pycache__'
+                        and not entry.name.startswith('.')
+                    ):
+                        stack.append(entry.path)
+        except OSError:
+            continue
+
+
+class _FileSummaryVisitor(ast.NodeVisitor):
+    """
+    Collects classes, functions, methods and router endpoints of a module in one descent
+
+    Class bodies are scanned directly for their methods and function bodies
+    are never entered, so the bulk of the tree (expressions, names, loads)
+    is not visited at all. Only the module's own statements are considered, so
+    definitions nested in module-level if/try blocks are not collected.
+    Endpoints are read from @router.<method>("/path") and @app.<method>("/path")
+    decorators on module-level functions.
+    """
+
+    ROUTER_NAMES = frozenset({'router', 'app'})
+    ROUTER_METHODS = frozenset({'get', 'post', 'put', 'delete', 'patch'})
+
+    def __init__(self):
+        self.classes: List[List[Any]] = []
+        self.functions: List[List[Any]] = []
+        self.class_methods: Dict[str, List[str]] = {}
+        self.endpoints: List[Dict[str, str]] = []
+
+    def visit_Module(self, node: ast.Module):
+        # Dispatch definitions only - generic_visit would walk every
+        # expression of module-level assignments and calls as well
+        for item in node.body:
+            if isinstance(item, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.visit(item)
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self.classes.append([node.name, node.lineno])
+        methods = self.class_methods.setdefault(node.name, [])
+        for item in node.body:
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                methods.append(item.name)
+                self.functions.append([item.name, item.lineno])
+            elif isinstance(item, ast.ClassDef):
+                self.visit_ClassDef(item)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        self.functions.append([node.name, node.lineno])
+        for decorator in node.decorator_list:
+            endpoint = self._router_endpoint(decorator)
+            if endpoint:
+                self.endpoints.append({'method': endpoint[0], 'path': endpoint[1], 'function': node.name})
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def _router_endpoint(self, decorator: ast.expr) -> Optional[Tuple[str, str]]:
+        """Return (method, path) for a @router.<method>("/path", ...) or @app.<method>(...) decorator"""
+        if not (
+            isinstance(decorator, ast.Call)
+            and isinstance(decorator.func, ast.Attribute)
+            and isinstance(decorator.func.value, ast.Name)
+            and decorator.func.value.id in self.ROUTER_NAMES
+            and decorator.func.attr in self.ROUTER_METHODS
+        ):
+            return None
+
+        path = decorator.args[0] if decorator.args else next(
+            (kw.value for kw in decorator.keywords if kw.arg == 'path'), None
+        )
+        if isinstance(path, ast.Constant) and isinstance(path.value, str):
+            return decorator.func.attr, path.value
+        return None
+
+
+def _summarize(path_str: str) -> Dict[str, Any]:
+    """
+    Parse a Python file once and extract everything the QA tools need from it
+
+    Returns a JSON-serializable dict with the classes and functions found
+    (name, lineno), the methods of each class, the router endpoints and the
+    line count. Raises on unreadable or unparsable files.
+    """
+    # ast.parse decodes bytes itself, honouring any PEP 263 coding declaration
+    with open(path_str, 'rb') as f:
+        content = f.read()
+
+    visitor = _FileSummaryVisitor()
+    visitor.visit(ast.parse(content))
+
+    return {
+        "classes": visitor.classes,
+        "functions": visitor.functions,
+        "class_methods": visitor.class_methods,
+        "endpoints": visitor.endpoints,
+        "lines": _count_lines(content),
+    }
+
+
+def _count_lines(content: bytes) -> int:
+    """Count lines without splitting; a trailing newline does not start another line"""
+    return content.count(b'\n') + (1 if content and not content.endswith(b'\n') else 0)
+
+
+def _try_summarize(path_str: str) -> Optional[Dict[str, Any]]:
+    """_summarize for pool workers - a bad file yields None instead of aborting the map"""
+    try:
+        return _summarize(path_str)
+    except Exception:
+        return None
+
+
+# Below this many uncached files, process spin-up costs more than it saves
+_PARALLEL_SUMMARY_MIN_FILES = 32
+
+
+class _AstCache:
+    """
+    File summaries persisted across runs, keyed by (path, st_mtime_ns, st_size)
+
+    A file is re-parsed only when its stat changes. Entries live in memory
+    until save(), which rewrites the JSON file atomically if anything changed.
+    Bump VERSION whenever the shape or meaning of a summary changes so stale
+    caches are discarded.
+    """
+
+    VERSION = 5
+
+    def __init__(self, cache_file: Path):
+        self.cache_file = Path(cache_file)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self._entries = data["entries"]
+        except (OSError, ValueError, AttributeError, KeyError):
+            pass
+
+    def get(self, path: Path) -> Dict[str, Any]:
+        """Return the summary for path, parsing it only on a cache miss"""
+        key = str(path)
+        st = os.stat(key)
+        entry = self._entries.get(key)
+        if self._is_fresh(entry, st):
+            return entry["summary"]
+
+        summary = _summarize(key)
+        self._store(key, st, summary)
+        return summary
+
+    def line_count(self, path: Path) -> int:
+        """Return the line count of path from the cache, or by counting newlines without parsing"""
+        key = str(path)
+        entry = self._entries.get(key)
+        if self._is_fresh(entry, os.stat(key)):
+            return entry["summary"]["lines"]
+
+        with open(key, 'rb') as f:
+            return _count_lines(f.read())
+
+    def prefetch(self, paths: Iterable[Path]):
+        """
+        Parse every uncached path up front
+
+        ast.parse holds the GIL, so when enough files miss the cache they are
+        parsed across processes. The pool lives only for this call, so no
+        worker processes outlive it and a broken pool is never reused. Files
+        that fail to parse are left uncached and surface their error from
+        get() as before.
+        """
+        misses: Dict[str, os.stat_result] = {}
+        for path in paths:
+            key = str(path)
+            try:
+                st = os.stat(key)
+            except OSError:
+                continue
+            if not self._is_fresh(self._entries.get(key), st):
+                misses[key] = st
+
+        if len(misses) < _PARALLEL_SUMMARY_MIN_FILES:
+            return
+
+        try:
+            with ProcessPoolExecutor() as pool:
+                summaries = list(pool.map(_try_summarize, misses, chunksize=8))
+        except Exception as e:
+            print(f"Warning: Parallel parsing failed, falling back to serial: {e}")
+            return
+
+        for (key, st), summary in zip(misses.items(), summaries):
+            if summary is not None:
+                self._store(key, st, summary)
+
+    @staticmethod
+    def _is_fresh(entry: Optional[Dict[str, Any]], st: os.stat_result) -> bool:
+        return bool(entry) and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size
+
+    def _store(self, key: str, st: os.stat_result, summary: Dict[str, Any]):
+        self._entries[key] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "summary": summary}
+        self._dirty = True
+
+    def save(self):
+        """Write the cache file if any entry changed since it was loaded"""
+        if not self._dirty:
+            return
+        if _write_json_atomic(self.cache_file, {"version": self.VERSION, "entries": self._entries}):
+            self._dirty = False
+
+
+def _write_json_atomic(path: Path, data: Any) -> bool:
+    """Replace path with data as JSON so readers never see a partial file"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+        return True
+    except OSError as e:
+        print(f"Warning: Could not write QA cache {path}: {e}")
+        return False
+
+
+def _default_ast_cache(project_root: Path) -> _AstCache:
+    return _AstCache(project_root / ".qa_cache" / "ast_summaries.json")
+
+
 class CoverageAnalyzer:
     """Analyzes test coverage and identifies gaps"""
 
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, ast_cache: Optional[_AstCache] = None):
         self.project_root = Path(project_root)
         self.backend_dir = self.project_root / "backend"
         self.tests_dir = self.project_root / "tests"
         self.src_dir = self.project_root / "src"
+        self.ast_cache = ast_cache or _default_ast_cache(self.project_root)
+
+    def analyze(self, include_models: bool = False) -> TestMetrics:
+        """
+        Analyze test coverage
 
-    def analyze(self) -> TestMetrics:
-        """Analyze test coverage"""
+        Services and API routes are always analyzed. Models under src/ need a
+        recursive walk of the whole source tree, so they are only included
+        when include_models is set.
+        """
         metrics = TestMetrics()
 
         # Find all Python files that should have tests
-        service_files = list((self.backend_dir / "services").glob("*.py"))
-        api_files = list((self.backend_dir / "api").glob("*.py"))
-        model_files = list(self.src_dir.glob("**/*.py")) if self.src_dir.exists() else []
+        service_files = [
+            f for f in _iter_py(self.backend_dir / "services")
+            if f.name not in _SKIP_SERVICE
+        ]
+        api_files = [f for f in _iter_py(self.backend_dir / "api") if f.name not in _SKIP_API]
+        model_files = [
+            f for f in _iter_py(self.src_dir, recursive=True) if f.name != "__init__.py"
+        ] if include_models else []
 
         # Find existing test files
-        test_files = set(self.tests_dir.glob("test_*.py")) if self.tests_dir.exists() else set()
+        test_names = {t.name for t in _iter_py(self.tests_dir) if t.name.startswith("test_")}
+
+        # Parse every untested file not already cached in one (possibly parallel) pass
+        self.ast_cache.prefetch(
+            f for f in service_files + api_files + model_files if f"test_{f.stem}.py" not in test_names
+        )
 
         # Check coverage for services
         for service_file in service_files:
-            if service_file.name in ["__init__.py", "base.py", "security_service.py"]:
-                continue
-
-            self._check_file_coverage(service_file, test_files, metrics, "service")
+            self._check_file_coverage(service_file, test_names, metrics, "service")
 
         # Check coverage for API endpoints
         for api_file in api_files:
-            if api_file.name == "__init__.py":
-                continue
+            self._check_file_coverage(api_file, test_names, metrics, "api")
+
+        # Check coverage for models
+        for model_file in model_files:
+            self._check_file_coverage(model_file, test_names, metrics, "model")
 
-            self._check_file_coverage(api_file, test_files, metrics, "api")
+        self.ast_cache.save()
 
         # Calculate coverage percentage
         if metrics.lines_total > 0:
@@ -95,10 +378,36 @@ class CoverageAnalyzer:
 
         return metrics
 
+    def source_fingerprint(self, include_models: bool = False) -> frozenset:
+        """
+        Identify the current state of the analyzed files
+
+        Covers every service, API and test file (and model file when
+        include_models is set) by (path, mtime, size), so any edit, addition
+        or removal changes the fingerprint. Costs one stat per file - far
+        cheaper than re-running analyze().
+        """
+        paths = [
+            *_iter_py(self.backend_dir / "services"),
+            *_iter_py(self.backend_dir / "api"),
+            *_iter_py(self.tests_dir),
+        ]
+        if include_models:
+            paths.extend(_iter_py(self.src_dir, recursive=True))
+
+        fingerprint = set()
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            fingerprint.add((str(path), st.st_mtime_ns, st.st_size))
+        return frozenset(fingerprint)
+
     def _check_file_coverage(
         self,
         file_path: Path,
-        test_files: Set[Path],
+        test_names: Set[str],
         metrics: TestMetrics,
         file_type: str
     ):
@@ -107,69 +416,53 @@ class CoverageAnalyzer:
 
         # Look for corresponding test file
         expected_test_name = f"test_{file_stem}.py"
-        has_test = any(t.name == expected_test_name for t in test_files)
+        has_test = expected_test_name in test_names
 
         if not has_test:
             metrics.missing_test_files.append(str(file_path))
 
         # Analyze the file for testable components
         try:
-            with open(file_path, 'r') as f:
-                content = f.read()
-                tree = ast.parse(content)
+            if has_test:
+                # Nothing to report for a tested file, so only its size is needed
+                n_lines = self.ast_cache.line_count(file_path)
+                metrics.lines_total += n_lines
+                # Rough estimate: assume test file covers 70% of lines
+                metrics.lines_covered += int(n_lines * 0.7)
+                return
 
-            lines = content.split('\n')
-            metrics.lines_total += len(lines)
+            summary = self.ast_cache.get(file_path)
+            metrics.lines_total += summary["lines"]
 
             # Find classes and functions
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    if not has_test:
-                        metrics.coverage_gaps.append(CoverageGap(
-                            file_path=str(file_path),
-                            type=file_type,
-                            name=node.name,
-                            line_number=node.lineno,
-                            reason=f"No test file found for {file_type}",
-                            severity="high"
-                        ))
-
-                elif isinstance(node, ast.FunctionDef):
-                    # Only count top-level functions or public methods
-                    if not node.name.startswith('_') or node.name == '__init__':
-                        if not has_test:
-                            metrics.coverage_gaps.append(CoverageGap(
-                                file_path=str(file_path),
-                                type=file_type,
-                                name=node.name,
-                                line_number=node.lineno,
-                                reason=f"Function not covered by tests",
-                                severity="medium"
-                            ))
-
-            if has_test:
-                # Rough estimate: assume test file covers 70% of lines
-                metrics.lines_covered += int(len(lines) * 0.7)
+            for name, lineno in summary["classes"]:
+                metrics.coverage_gaps.append(CoverageGap(
+                    file_path=str(file_path),
+                    type=file_type,
+                    name=name,
+                    line_number=lineno,
+                    reason=f"No test file found for {file_type}",
+                    severity="high"
+                ))
+
+            for name, lineno in summary["functions"]:
+                # Only count top-level functions or public methods
+                if not name.startswith('_') or name == '__init__':
+                    metrics.coverage_gaps.append(CoverageGap(
+                        file_path=str(file_path),
+                        type=file_type,
+                        name=name,
+                        line_number=lineno,
+                        reason=f"Function not covered by tests",
+                        severity="medium"
+                    ))
 
         except Exception as e:
             print(f"Warning: Could not analyze {file_path}: {e}")
 
 
-class TestGenerator:
-    """Generates test code for untested components"""
-
-    def __init__(self, project_root: str):
-        self.project_root = Path(project_root)
-
-    def generate_service_test(self, service_file: Path) -> str:
-        """Generate test file for a service"""
-        service_name = service_file.stem
-        class_name = self._to_class_name(service_name)
-
-        # Parse the service file to extract methods
-        methods = self._extract_methods(service_file, class_name)
-
-        test_code = f'''"""
+# Templates for generated test modules, filled in with str.format
+_SERVICE_TEST_HEADER = '''"""
 Tests for {service_name}
 Auto-generated by QA Sub-Agent
 """
@@ -188,12 +481,7 @@ class Test{class_name}:
 
 '''
 
-        # Generate test methods
-        for method in methods:
-            if method.startswith('_') and method != '__init__':
-                continue  # Skip private methods
-
-            test_code += f'''    def test_{method}(self, service):
+_SERVICE_TEST_METHOD = '''    def test_{method}(self, service):
         """Test {method} method"""
         # TODO: Implement test for {method}
         # Add assertions based on expected behavior
@@ -201,7 +489,7 @@ class Test{class_name}:
 
 '''
 
-        test_code += '''
+_SERVICE_TEST_FOOTER = '''
 
 @pytest.fixture
 def db_session():
@@ -211,16 +499,7 @@ def db_session():
     session.close()
 '''
 
-        return test_code
-
-    def generate_api_test(self, api_file: Path) -> str:
-        """Generate test file for API endpoints"""
-        api_name = api_file.stem
-
-        # Parse API file to find endpoints
-        endpoints = self._extract_endpoints(api_file)
-
-        test_code = f'''"""
+_API_TEST_HEADER = '''"""
 Tests for {api_name} API endpoints
 Auto-generated by QA Sub-Agent
 """
@@ -229,7 +508,7 @@ from fastapi.testclient import TestClient
 from backend.main import app
 
 
-class Test{self._to_class_name(api_name)}API:
+class Test{class_name}API:
     """Test suite for {api_name} endpoints"""
 
     @pytest.fixture
@@ -239,65 +518,81 @@ class Test{self._to_class_name(api_name)}API:
 
 '''
 
-        for endpoint in endpoints:
-            method = endpoint['method'].lower()
-            path = endpoint['path']
-            func_name = endpoint['function']
-
-            test_code += f'''    def test_{func_name}(self, client):
-        """Test {method.upper()} {path}"""
+_API_TEST_METHOD = '''    def test_{func_name}(self, client):
+        """Test {method_upper} {path}"""
         response = client.{method}("{path}")
         assert response.status_code in [200, 401, 404], "Should return valid status"
         # TODO: Add specific assertions for response data
 
 '''
 
-        return test_code
 
-    def _extract_methods(self, file_path: Path, class_name: str) -> List[str]:
-        """Extract method names from a class"""
-        methods = []
+class TestGenerator:
+    """Generates test code for untested components"""
 
-        try:
-            with open(file_path, 'r') as f:
-                tree = ast.parse(f.read())
+    def __init__(self, project_root: str, ast_cache: Optional[_AstCache] = None):
+        self.project_root = Path(project_root)
+        self.ast_cache = ast_cache or _default_ast_cache(self.project_root)
 
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef) and node.name == class_name:
-                    for item in node.body:
-                        if isinstance(item, ast.FunctionDef):
-                            methods.append(item.name)
+    def generate_service_test(self, service_file: Path) -> str:
+        """Generate test file for a service"""
+        service_name = service_file.stem
+        class_name = self._to_class_name(service_name)
 
-        except Exception:
-            pass
+        # Parse the service file to extract methods
+        methods = self._extract_methods(service_file, class_name)
 
-        return methods
+        parts = [_SERVICE_TEST_HEADER.format(service_name=service_name, class_name=class_name)]
 
-    def _extract_endpoints(self, file_path: Path) -> List[Dict[str, str]]:
-        """Extract API endpoints from a route file"""
-        endpoints = []
+        # Generate test methods
+        for method in methods:
+            if method.startswith('_') and method != '__init__':
+                continue  # Skip private methods
 
-        try:
-            with open(file_path, 'r') as f:
-                content = f.read()
+            parts.append(_SERVICE_TEST_METHOD.format(method=method))
+
+        parts.append(_SERVICE_TEST_FOOTER)
+
+        return "".join(parts)
+
+    def generate_api_test(self, api_file: Path) -> str:
+        """Generate test file for API endpoints"""
+        api_name = api_file.stem
+
+        # Parse API file to find endpoints
+        endpoints = self._extract_endpoints(api_file)
 
-            # Find router decorators and function names
-            pattern = r'@router\.(get|post|put|delete|patch)\(["\']([^"\']+)["\'].*?\)\s*(?:async\s+)?def\s+(\w+)'
-            matches = re.finditer(pattern, content, re.MULTILINE | re.DOTALL)
+        parts = [_API_TEST_HEADER.format(api_name=api_name, class_name=self._to_class_name(api_name))]
 
-            for match in matches:
-                endpoints.append({
-                    'method': match.group(1),
-                    'path': match.group(2),
-                    'function': match.group(3)
-                })
+        for endpoint in endpoints:
+            method = endpoint['method'].lower()
 
+            parts.append(_API_TEST_METHOD.format(
+                func_name=endpoint['function'],
+                method=method,
+                method_upper=method.upper(),
+                path=endpoint['path']
+            ))
+
+        return "".join(parts)
+
+    def _extract_methods(self, file_path: Path, class_name: str) -> List[str]:
+        """Extract method names from a class"""
+        try:
+            return list(self.ast_cache.get(file_path)["class_methods"].get(class_name, []))
         except Exception:
-            pass
+            return []
 
-        return endpoints
+    def _extract_endpoints(self, file_path: Path) -> List[Dict[str, str]]:
+        """Extract API endpoints from a route file"""
+        try:
+            return [dict(endpoint) for endpoint in self.ast_cache.get(file_path)["endpoints"]]
+        except Exception:
+            return []
 
-    def _to_class_name(self, snake_case: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _to_class_name(snake_case: str) -> str:
         """Convert snake_case to CamelCase"""
         return ''.join(word.capitalize() for word in snake_case.split('_'))
 
@@ -305,6 +600,10 @@ class Test{self._to_class_name(api_name)}API:
 class TestRunner:
     """Runs tests and collects results"""
 
+    TIMEOUT_SECONDS = 300
+    # Lines of output kept for the coverage TOTAL row and the report
+    OUTPUT_TAIL_LINES = 50
+
     def __init__(self, project_root: str):
         self.project_root = Path(project_root)
 
@@ -313,63 +612,352 @@ class TestRunner:
         test_type: Optional[TestType] = None,
         pattern: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Run tests and return results"""
-        cmd = ["pytest", "tests/", "-v", "--tb=short"]
+        """
+        Run tests and return results
+
+        Totals come from the JUnit XML and coverage JSON reports pytest writes,
+        so they don't depend on the console format. pytest output is consumed
+        line by line as it is produced, so memory stays flat however long the
+        run is. Only the last OUTPUT_TAIL_LINES lines are kept and returned
+        as "output"; if a report is missing (e.g. pytest crashed before writing
+        it), counts and coverage fall back to the final summary line and the
+        coverage TOTAL row in the output.
+        """
+        with tempfile.TemporaryDirectory(prefix="qa_pytest_") as report_dir:
+            junit_file = Path(report_dir) / "junit.xml"
+            coverage_file = Path(report_dir) / "coverage.json"
+
+            # -q cancels the -v from pytest.ini addopts; per-test lines aren't needed
+            cmd = ["pytest", "tests/", "-q", "--tb=short", f"--junitxml={junit_file}"]
 
-        if test_type:
-            cmd.append(f"-m {test_type.value}")
+            if test_type:
+                cmd.extend(["-m", test_type.value])
 
-        if pattern:
-            cmd.append(f"-k {pattern}")
+            if pattern:
+                cmd.extend(["-k", pattern])
 
-        # Add coverage
-        cmd.extend(["--cov=backend", "--cov=src", "--cov-report=term-missing"])
+            # Add coverage
+            cmd.extend([
+                "--cov=backend", "--cov=src", "--cov-report=term-missing",
+                f"--cov-report=json:{coverage_file}"
+            ])
 
+            results = self._run_pytest(cmd)
+            if results.get("status") in ("success", "failed"):
+                results.update(self._read_reports(junit_file, coverage_file))
+            return results
+
+    def _run_pytest(self, cmd: List[str]) -> Dict[str, Any]:
+        """Run pytest, streaming its output, and enforce TIMEOUT_SECONDS"""
         try:
-            result = subprocess.run(
+            proc = subprocess.Popen(
                 cmd,
                 cwd=self.project_root,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=300
+                bufsize=1
             )
-
-            return self._parse_pytest_output(result.stdout, result.stderr, result.returncode)
-
-        except subprocess.TimeoutExpired:
+        except Exception as e:
             return {
-                "status": "timeout",
-                "error": "Tests timed out after 5 minutes"
+                "status": "error",
+                "error": str(e)
             }
+
+        # Drain stderr concurrently so a chatty stderr can't block the stdout pipe
+        stderr_chunks: List[str] = []
+        stderr_reader = threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True)
+        stderr_reader.start()
+
+        timed_out = threading.Event()
+
+        def kill_on_timeout():
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(self.TIMEOUT_SECONDS, kill_on_timeout)
+        timer.start()
+        try:
+            results = self._scan_pytest_output(proc.stdout)
+            returncode = proc.wait()
         except Exception as e:
+            proc.kill()
             return {
                 "status": "error",
                 "error": str(e)
             }
+        finally:
+            timer.cancel()
+            stderr_reader.join()
+
+        if timed_out.is_set():
+            return {
+                "status": "timeout",
+                "error": "Tests timed out after 5 minutes"
+            }
+
+        results["status"] = "success" if returncode == 0 else "failed"
+        results["errors"] = "".join(stderr_chunks)
+        return results
+
+    @staticmethod
+    def _read_reports(junit_file: Path, coverage_file: Path) -> Dict[str, Any]:
+        """Read totals from the JUnit XML and coverage JSON reports, skipping any that are missing"""
+        results: Dict[str, Any] = {}
+
+        try:
+            root = ElementTree.parse(junit_file).getroot()
+            suites = [root] if root.tag == "testsuite" else root.findall("testsuite")
+            total = sum(int(suite.get("tests", 0)) for suite in suites)
+            failed = sum(int(suite.get("failures", 0)) + int(suite.get("errors", 0)) for suite in suites)
+            skipped = sum(int(suite.get("skipped", 0)) for suite in suites)
+            results.update({
+                "passed": total - failed - skipped,
+                "failed": failed,
+                "skipped": skipped,
+                "total": total
+            })
+        except (OSError, ElementTree.ParseError, ValueError):
+            pass
+
+        try:
+            with open(coverage_file, 'r') as f:
+                results["coverage"] = float(json.load(f)["totals"]["percent_covered"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        return results
+
+    def _scan_pytest_output(self, lines: Iterable[str]) -> Dict[str, Any]:
+        """Read test outcomes from pytest's final summary line, one output line at a time"""
+        counts = Counter()
+        tail = deque(maxlen=self.OUTPUT_TAIL_LINES)
 
-    def _parse_pytest_output(self, stdout: str, stderr: str, returncode: int) -> Dict[str, Any]:
-        """Parse pytest output"""
-        # Extract test counts
-        passed = len(re.findall(r'PASSED', stdout))
-        failed = len(re.findall(r'FAILED', stdout))
-        skipped = len(re.findall(r'SKIPPED', stdout))
+        for line in lines:
+            if _SUMMARY_RE.search(line):
+                counts = Counter()
+                for number, outcome in _OUTCOME_RE.findall(line):
+                    counts[outcome] += int(number)
+            tail.append(line)
 
-        # Extract coverage percentage
-        coverage_match = re.search(r'TOTAL\s+\d+\s+\d+\s+(\d+)%', stdout)
+        # The coverage TOTAL row is printed at the end of the run
+        output = "".join(tail)
+        coverage_match = _COV_RE.search(output)
         coverage = float(coverage_match.group(1)) if coverage_match else 0.0
 
+        passed = counts["passed"]
+        failed = counts["failed"] + counts["error"]
+        skipped = counts["skipped"]
         return {
-            "status": "success" if returncode == 0 else "failed",
             "passed": passed,
             "failed": failed,
             "skipped": skipped,
             "total": passed + failed + skipped,
             "coverage": coverage,
-            "output": stdout,
-            "errors": stderr
+            "output": output
         }
 
 
+class _SmtpSession:
+    """
+    One authenticated SMTP connection, reused for every message sent inside the with block
+
+    Port 465 uses implicit TLS (SMTP_SSL) and skips the STARTTLS round-trip;
+    any other port connects in plain text and upgrades with STARTTLS.
+    """
+
+    SSL_PORT = 465
+
+    def __init__(self, server: str, port: int, username: str, password: str):
+        self.server = server
+        self.port = port
+        self.username = username
+        self.password = password
+        self._smtp: Optional[smtplib.SMTP] = None
+
+    def __enter__(self) -> "_SmtpSession":
+        if self.port == self.SSL_PORT:
+            self._smtp = smtplib.SMTP_SSL(self.server, self.port)
+        else:
+            self._smtp = smtplib.SMTP(self.server, self.port)
+            self._smtp.starttls()
+        try:
+            self._smtp.login(self.username, self.password)
+        except Exception:
+            self._smtp.close()
+            raise
+        return self
+
+    def send(self, msg: MIMEMultipart):
+        self._smtp.send_message(msg)
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._smtp.quit()
+        except smtplib.SMTPException:
+            # The server already dropped us - just release the socket
+            self._smtp.close()
+        return False
+
+
+# Shell of the QA report email, filled in with string.Template
+_EMAIL_HTML_TEMPLATE = string.Template("""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <style>
+                body {
+                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
+                    line-height: 1.6;
+                    color: #333;
+                    max-width: 800px;
+                    margin: 0 auto;
+                    padding: 20px;
+                    background-color: #f8f9fa;
+                }
+                .container {
+                    background-color: white;
+                    border-radius: 8px;
+                    padding: 30px;
+                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+                }
+                .header {
+                    text-align: center;
+                    padding-bottom: 20px;
+                    border-bottom: 3px solid #007bff;
+                    margin-bottom: 30px;
+                }
+                .score-badge {
+                    display: inline-block;
+                    font-size: 48px;
+                    font-weight: bold;
+                    color: ${score_color};
+                    margin: 10px 0;
+                }
+                .status-badge {
+                    display: inline-block;
+                    padding: 5px 15px;
+                    border-radius: 20px;
+                    background-color: ${score_color};
+                    color: white;
+                    font-size: 14px;
+                    font-weight: bold;
+                }
+                .metrics-grid {
+                    display: table;
+                    width: 100%;
+                    margin: 20px 0;
+                }
+                .metric-row {
+                    display: table-row;
+                }
+                .metric-row:nth-child(even) {
+                    background-color: #f8f9fa;
+                }
+                .metric-label {
+                    display: table-cell;
+                    padding: 12px;
+                    font-weight: 600;
+                    border: 1px solid #dee2e6;
+                }
+                .metric-value {
+                    display: table-cell;
+                    padding: 12px;
+                    text-align: right;
+                    border: 1px solid #dee2e6;
+                }
+                .footer {
+                    margin-top: 30px;
+                    padding-top: 20px;
+                    border-top: 2px solid #dee2e6;
+                    text-align: center;
+                    font-size: 12px;
+                    color: #6c757d;
+                }
+                code {
+                    background-color: #f8f9fa;
+                    padding: 2px 6px;
+                    border-radius: 3px;
+                    font-family: 'Courier New', monospace;
+                }
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="header">
+                    <h1 style="margin: 0; color: #007bff;">🧪 QA Analysis Report</h1>
+                    <div class="score-badge">${score}/100</div>
+                    <div class="status-badge">${score_status}</div>
+                    <p style="margin: 10px 0 0 0; color: #6c757d;">Generated: ${generated_at}</p>
+                </div>
+
+                <h2 style="color: #495057; border-bottom: 2px solid #dee2e6; padding-bottom: 10px;">📊 Quality Metrics</h2>
+                <div class="metrics-grid">
+                    <div class="metric-row">
+                        <div class="metric-label">📈 Code Coverage</div>
+                        <div class="metric-value" style="color: ${cov_color}; font-weight: bold;">${coverage}%</div>
+                    </div>
+                    <div class="metric-row">
+                        <div class="metric-label">📏 Lines Covered</div>
+                        <div class="metric-value">${lines_covered} / ${lines_total}</div>
+                    </div>
+                    <div class="metric-row">
+                        <div class="metric-label">✅ Tests Passing</div>
+                        <div class="metric-value">${tests_passed} / ${tests_total}</div>
+                    </div>
+                    <div class="metric-row">
+                        <div class="metric-label">❌ Tests Failing</div>
+                        <div class="metric-value">${tests_failed}</div>
+                    </div>
+                    <div class="metric-row">
+                        <div class="metric-label">⏭️ Tests Skipped</div>
+                        <div class="metric-value">${tests_skipped}</div>
+                    </div>
+                    <div class="metric-row">
+                        <div class="metric-label">📝 Missing Test Files</div>
+                        <div class="metric-value">${missing_files}</div>
+                    </div>
+                </div>
+
+                <h2 style="color: #495057; border-bottom: 2px solid #dee2e6; padding-bottom: 10px;">⚠️ Coverage Gaps</h2>
+                <div class="metrics-grid">
+                    <div class="metric-row">
+                        <div class="metric-label">🔴 Critical</div>
+                        <div class="metric-value">${gaps_critical}</div>
+                    </div>
+                    <div class="metric-row">
+                        <div class="metric-label">🟠 High</div>
+                        <div class="metric-value">${gaps_high}</div>
+                    </div>
+                    <div class="metric-row">
+                        <div class="metric-label">🟡 Medium</div>
+                        <div class="metric-value">${gaps_medium}</div>
+                    </div>
+                    <div class="metric-row">
+                        <div class="metric-label">🟢 Low</div>
+                        <div class="metric-value">${gaps_low}</div>
+                    </div>
+                    <div class="metric-row">
+                        <div class="metric-label"><strong>Total Gaps</strong></div>
+                        <div class="metric-value"><strong>${gaps_count}</strong></div>
+                    </div>
+                </div>
+
+                ${missing_files_html}
+
+                ${gaps_html}
+
+                <div class="footer">
+                    <p>🤖 This report was automatically generated by the QA Sub-Agent</p>
+                    <p>Detailed report attached as JSON file</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """)
+
+
 class QAService:
     """
     Main QA Sub-Agent Service
@@ -378,16 +966,21 @@ class QAService:
 
     def __init__(self, project_root: Optional[str] = None):
         if project_root is None:
-            project_root = self._find_project_root()
+            project_root = self._find_project_root(str(Path(__file__).resolve()))
 
         self.project_root = project_root
-        self.coverage_analyzer = CoverageAnalyzer(project_root)
-        self.test_generator = TestGenerator(project_root)
+        ast_cache = _default_ast_cache(Path(project_root))
+        self.coverage_analyzer = CoverageAnalyzer(project_root, ast_cache)
+        self.test_generator = TestGenerator(project_root, ast_cache)
         self.test_runner = TestRunner(project_root)
+        # (include_models, source fingerprint, metrics) of the last analysis
+        self._metrics_cache: Optional[Tuple[bool, frozenset, TestMetrics]] = None
 
-    def _find_project_root(self) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _find_project_root(start: str) -> str:
         """Find project root directory"""
-        current = Path(__file__).resolve()
+        current = Path(start)
 
         while current.parent != current:
             if (current / "backend").exists() and (current / "tests").exists():
@@ -396,9 +989,55 @@ class QAService:
 
         return str(Path.cwd())
 
-    def analyze_coverage(self) -> TestMetrics:
-        """Analyze test coverage and identify gaps"""
-        return self.coverage_analyzer.analyze()
+    def analyze_coverage(self, include_models: bool = False) -> TestMetrics:
+        """
+        Analyze test coverage and identify gaps
+
+        Model coverage is opt-in via include_models (see CoverageAnalyzer.analyze).
+        The result is reused until an analyzed file changes, both within this
+        instance and across runs via .qa_cache/metrics.json, so unchanged
+        trees skip the scan-and-parse phase entirely.
+        """
+        fingerprint = self.coverage_analyzer.source_fingerprint(include_models)
+        if self._metrics_cache is not None and self._metrics_cache[:2] == (include_models, fingerprint):
+            return self._metrics_cache[2]
+
+        digest = self._metrics_digest(fingerprint, include_models)
+        metrics = self._load_metrics(digest)
+        if metrics is None:
+            metrics = self.coverage_analyzer.analyze(include_models=include_models)
+            _write_json_atomic(self._metrics_file, {"digest": digest, "metrics": asdict(metrics)})
+
+        self._metrics_cache = (include_models, fingerprint, metrics)
+        return metrics
+
+    @property
+    def _metrics_file(self) -> Path:
+        return Path(self.project_root) / ".qa_cache" / "metrics.json"
+
+    @staticmethod
+    def _metrics_digest(fingerprint: frozenset, include_models: bool) -> str:
+        """Hash a source fingerprint into the key the on-disk metrics are stored under"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{_AstCache.VERSION}:{include_models}\n".encode())
+        for path, mtime_ns, size in sorted(fingerprint):
+            digest.update(f"{path}\0{mtime_ns}\0{size}\n".encode())
+        return digest.hexdigest()
+
+    def _load_metrics(self, digest: str) -> Optional[TestMetrics]:
+        """Return the metrics saved by an earlier run over the same sources, if any"""
+        try:
+            with open(self._metrics_file, 'r') as f:
+                data = json.load(f)
+            if data["digest"] != digest:
+                return None
+            saved = data["metrics"]
+            return TestMetrics(**{
+                **saved,
+                "coverage_gaps": [CoverageGap(**gap) for gap in saved["coverage_gaps"]]
+            })
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
 
     def generate_missing_tests(self, output_dir: Optional[str] = None) -> List[str]:
         """Generate test files for missing coverage"""
@@ -410,45 +1049,54 @@ class QAService:
         metrics = self.analyze_coverage()
         generated_files = []
 
-        # Group gaps by file
-        gaps_by_file = {}
+        # Files with gaps, in first-seen order, with the kind the analyzer already assigned
+        kind_by_file: Dict[str, str] = {}
         for gap in metrics.coverage_gaps:
-            if gap.file_path not in gaps_by_file:
-                gaps_by_file[gap.file_path] = []
-            gaps_by_file[gap.file_path].append(gap)
+            kind_by_file.setdefault(gap.file_path, gap.type)
 
         # Generate test files
-        for file_path, gaps in gaps_by_file.items():
+        for file_path, kind in kind_by_file.items():
             path = Path(file_path)
 
-            if "services" in str(path):
+            if kind == "service":
                 test_code = self.test_generator.generate_service_test(path)
                 test_file = Path(output_dir) / f"test_{path.stem}.py"
 
-            elif "api" in str(path):
+            elif kind == "api":
                 test_code = self.test_generator.generate_api_test(path)
                 test_file = Path(output_dir) / f"test_{path.stem}_api.py"
 
             else:
                 continue
 
-            with open(test_file, 'w') as f:
-                f.write(test_code)
+            test_file.write_bytes(test_code.encode('utf-8'))
 
             generated_files.append(str(test_file))
 
+        self.test_generator.ast_cache.save()
         return generated_files
 
     def run_qa_report(self) -> Dict[str, Any]:
-        """Generate comprehensive QA report"""
-        print("🔍 Analyzing test coverage...")
-        metrics = self.analyze_coverage()
+        """
+        Generate comprehensive QA report
 
+        pytest runs in its own process, so coverage analysis proceeds while
+        the test thread waits on it; the report takes max(analysis, tests)
+        rather than their sum.
+        """
         print("🧪 Running tests...")
-        test_results = self.test_runner.run_tests()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            tests_future = executor.submit(self.test_runner.run_tests)
+
+            print("🔍 Analyzing test coverage...")
+            metrics = self.analyze_coverage()
+            test_results = tests_future.result()
+
+        # Tally gap severities in one pass
+        severities = Counter(g.severity for g in metrics.coverage_gaps)
 
         # Calculate quality score
-        quality_score = self._calculate_quality_score(metrics, test_results)
+        quality_score = self._calculate_quality_score(metrics, test_results, severities)
 
         report = {
             "quality_score": quality_score,
@@ -466,10 +1114,10 @@ class QAService:
             },
             "gaps": {
                 "count": len(metrics.coverage_gaps),
-                "critical": sum(1 for g in metrics.coverage_gaps if g.severity == "critical"),
-                "high": sum(1 for g in metrics.coverage_gaps if g.severity == "high"),
-                "medium": sum(1 for g in metrics.coverage_gaps if g.severity == "medium"),
-                "low": sum(1 for g in metrics.coverage_gaps if g.severity == "low")
+                "critical": severities["critical"],
+                "high": severities["high"],
+                "medium": severities["medium"],
+                "low": severities["low"]
             },
             "missing_test_files": metrics.missing_test_files,
             "coverage_gaps": [
@@ -486,7 +1134,12 @@ class QAService:
 
         return report
 
-    def _calculate_quality_score(self, metrics: TestMetrics, test_results: Dict) -> int:
+    def _calculate_quality_score(
+        self,
+        metrics: TestMetrics,
+        test_results: Dict,
+        severities: Optional[Counter] = None
+    ) -> int:
         """Calculate overall QA quality score (0-100)"""
         # Coverage score (0-40 points)
         coverage_score = min(40, int(metrics.coverage_percentage * 0.4))
@@ -502,7 +1155,9 @@ class QAService:
         file_score = max(0, 20 - (missing_count * 3))
 
         # Gaps penalty (0-10 points)
-        high_gaps = sum(1 for g in metrics.coverage_gaps if g.severity in ["critical", "high"])
+        if severities is None:
+            severities = Counter(g.severity for g in metrics.coverage_gaps)
+        high_gaps = severities["critical"] + severities["high"]
         gap_score = max(0, 10 - high_gaps)
 
         total_score = coverage_score + test_score + file_score + gap_score
@@ -564,28 +1219,33 @@ class QAService:
     def send_email_report(
         self,
         report: Dict[str, Any],
-        to_email: str,
+        to_email: Union[str, List[str]],
         from_email: Optional[str] = None,
         subject_prefix: str = "🧪 QA Report"
     ) -> bool:
         """
         Send QA report via email with HTML formatting and JSON attachment
 
+        All recipients are served over one SMTP connection, so TLS and login
+        happen once however many addresses the report goes to.
+
         Args:
             report: QA report dictionary from run_qa_report()
-            to_email: Recipient email address
+            to_email: Recipient email address, or a list of them
             from_email: Sender email (defaults to env var or noreply)
             subject_prefix: Custom subject prefix
 
         Returns:
-            True if email sent successfully, False otherwise
+            True if the email was sent to every recipient, False otherwise
 
         Environment Variables Required:
             SMTP_SERVER: SMTP server address (default: smtp.gmail.com)
-            SMTP_PORT: SMTP server port (default: 587)
+            SMTP_PORT: SMTP server port (default: 587; 465 connects with implicit TLS)
             EMAIL_USERNAME: SMTP username
             EMAIL_PASSWORD: SMTP password (use App Password for Gmail)
         """
+        recipients = [to_email] if isinstance(to_email, str) else list(to_email)
+
         try:
             # Get email configuration from environment
             smtp_server = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
@@ -600,36 +1260,19 @@ class QAService:
             if not from_email:
                 from_email = os.getenv('EMAIL_FROM', f'{username}')
 
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['From'] = from_email
-            msg['To'] = to_email
-            msg['Subject'] = f"{subject_prefix} - Score: {report['quality_score']}/100 - {datetime.now().strftime('%Y-%m-%d')}"
-
-            # Generate HTML body
-            html_body = self._generate_email_html(report)
-            msg.attach(MIMEText(html_body, 'html'))
-
-            # Attach JSON report
-            json_data = json.dumps(report, indent=2)
-            attachment = MIMEBase('application', 'json')
-            attachment.set_payload(json_data.encode('utf-8'))
-            encoders.encode_base64(attachment)
-            attachment.add_header(
-                'Content-Disposition',
-                f'attachment; filename=qa_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-            )
-            msg.attach(attachment)
+            # Rendered and encoded once; only the To header changes per recipient
+            msg = self._build_email_message(report, from_email, subject_prefix)
 
-            # Send email
-            print(f"📧 Sending QA report to {to_email}...")
-            server = smtplib.SMTP(smtp_server, smtp_port)
-            server.starttls()
-            server.login(username, password)
-            server.send_message(msg)
-            server.quit()
+            with _SmtpSession(smtp_server, smtp_port, username, password) as session:
+                for recipient in recipients:
+                    del msg['To']
+                    msg['To'] = recipient
+
+                    # Send email
+                    print(f"📧 Sending QA report to {recipient}...")
+                    session.send(msg)
+                    print(f"✅ Email sent successfully to {recipient}")
 
-            print(f"✅ Email sent successfully to {to_email}")
             return True
 
         except smtplib.SMTPAuthenticationError:
@@ -642,6 +1285,34 @@ class QAService:
             print(f"❌ Failed to send email: {e}")
             return False
 
+    def _build_email_message(
+        self,
+        report: Dict[str, Any],
+        from_email: str,
+        subject_prefix: str
+    ) -> MIMEMultipart:
+        """Build the report email (HTML body plus base64 JSON attachment) without a recipient"""
+        msg = MIMEMultipart('alternative')
+        msg['From'] = from_email
+        msg['Subject'] = f"{subject_prefix} - Score: {report['quality_score']}/100 - {datetime.now().strftime('%Y-%m-%d')}"
+
+        # Generate HTML body
+        html_body = self._generate_email_html(report)
+        msg.attach(MIMEText(html_body, 'html'))
+
+        # Attach JSON report
+        json_data = json.dumps(report, indent=2)
+        attachment = MIMEBase('application', 'json')
+        attachment.set_payload(json_data.encode('utf-8'))
+        encoders.encode_base64(attachment)
+        attachment.add_header(
+            'Content-Disposition',
+            f'attachment; filename=qa_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+        )
+        msg.attach(attachment)
+
+        return msg
+
     def _generate_email_html(self, report: Dict[str, Any]) -> str:
         """Generate HTML email body from QA report"""
 
@@ -672,8 +1343,10 @@ class QAService:
         # Build coverage gaps summary
         gaps_html = ""
         if report.get('coverage_gaps'):
-            gaps_html = "<h3 style='color: #495057; border-bottom: 2px solid #dee2e6; padding-bottom: 10px;'>📋 Sample Coverage Gaps</h3>"
-            gaps_html += "<ul style='list-style-type: none; padding-left: 0;'>"
+            gaps_parts = [
+                "<h3 style='color: #495057; border-bottom: 2px solid #dee2e6; padding-bottom: 10px;'>📋 Sample Coverage Gaps</h3>",
+                "<ul style='list-style-type: none; padding-left: 0;'>"
+            ]
 
             for gap in report['coverage_gaps'][:10]:  # Show first 10
                 severity_emoji = {
@@ -683,182 +1356,53 @@ class QAService:
                     'low': '🟢'
                 }.get(gap['severity'], '⚪')
 
-                gaps_html += f"""
+                gaps_parts.append(f"""
                 <li style='margin: 10px 0; padding: 10px; background-color: #f8f9fa; border-left: 3px solid #6c757d;'>
                     {severity_emoji} <strong>{gap['name']}</strong> in <code>{Path(gap['file']).name}</code>
                     <br><small style='color: #6c757d;'>{gap['reason']}</small>
                 </li>
-                """
-            gaps_html += "</ul>"
+                """)
+            gaps_parts.append("</ul>")
+            gaps_html = "".join(gaps_parts)
 
         # Build missing files list
         missing_files_html = ""
         if report.get('missing_test_files'):
-            missing_files_html = "<h3 style='color: #495057; border-bottom: 2px solid #dee2e6; padding-bottom: 10px;'>📝 Files Missing Tests</h3>"
-            missing_files_html += "<ul>"
+            missing_parts = [
+                "<h3 style='color: #495057; border-bottom: 2px solid #dee2e6; padding-bottom: 10px;'>📝 Files Missing Tests</h3>",
+                "<ul>"
+            ]
             for file_path in report['missing_test_files'][:10]:
-                missing_files_html += f"<li><code>{Path(file_path).name}</code></li>"
+                missing_parts.append(f"<li><code>{Path(file_path).name}</code></li>")
 
             remaining = len(report['missing_test_files']) - 10
             if remaining > 0:
-                missing_files_html += f"<li><em>... and {remaining} more</em></li>"
-            missing_files_html += "</ul>"
-
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                body {{
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 800px;
-                    margin: 0 auto;
-                    padding: 20px;
-                    background-color: #f8f9fa;
-                }}
-                .container {{
-                    background-color: white;
-                    border-radius: 8px;
-                    padding: 30px;
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                }}
-                .header {{
-                    text-align: center;
-                    padding-bottom: 20px;
-                    border-bottom: 3px solid #007bff;
-                    margin-bottom: 30px;
-                }}
-                .score-badge {{
-                    display: inline-block;
-                    font-size: 48px;
-                    font-weight: bold;
-                    color: {score_color};
-                    margin: 10px 0;
-                }}
-                .status-badge {{
-                    display: inline-block;
-                    padding: 5px 15px;
-                    border-radius: 20px;
-                    background-color: {score_color};
-                    color: white;
-                    font-size: 14px;
-                    font-weight: bold;
-                }}
-                .metrics-grid {{
-                    display: table;
-                    width: 100%;
-                    margin: 20px 0;
-                }}
-                .metric-row {{
-                    display: table-row;
-                }}
-                .metric-row:nth-child(even) {{
-                    background-color: #f8f9fa;
-                }}
-                .metric-label {{
-                    display: table-cell;
-                    padding: 12px;
-                    font-weight: 600;
-                    border: 1px solid #dee2e6;
-                }}
-                .metric-value {{
-                    display: table-cell;
-                    padding: 12px;
-                    text-align: right;
-                    border: 1px solid #dee2e6;
-                }}
-                .footer {{
-                    margin-top: 30px;
-                    padding-top: 20px;
-                    border-top: 2px solid #dee2e6;
-                    text-align: center;
-                    font-size: 12px;
-                    color: #6c757d;
-                }}
-                code {{
-                    background-color: #f8f9fa;
-                    padding: 2px 6px;
-                    border-radius: 3px;
-                    font-family: 'Courier New', monospace;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1 style="margin: 0; color: #007bff;">🧪 QA Analysis Report</h1>
-                    <div class="score-badge">{score}/100</div>
-                    <div class="status-badge">{score_status}</div>
-                    <p style="margin: 10px 0 0 0; color: #6c757d;">Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}</p>
-                </div>
-
-                <h2 style="color: #495057; border-bottom: 2px solid #dee2e6; padding-bottom: 10px;">📊 Quality Metrics</h2>
-                <div class="metrics-grid">
-                    <div class="metric-row">
-                        <div class="metric-label">📈 Code Coverage</div>
-                        <div class="metric-value" style="color: {cov_color}; font-weight: bold;">{coverage:.1f}%</div>
-                    </div>
-                    <div class="metric-row">
-                        <div class="metric-label">📏 Lines Covered</div>
-                        <div class="metric-value">{report['coverage']['lines_covered']:,} / {report['coverage']['lines_total']:,}</div>
-                    </div>
-                    <div class="metric-row">
-                        <div class="metric-label">✅ Tests Passing</div>
-                        <div class="metric-value">{report['tests']['passed']} / {report['tests']['total']}</div>
-                    </div>
-                    <div class="metric-row">
-                        <div class="metric-label">❌ Tests Failing</div>
-                        <div class="metric-value">{report['tests']['failed']}</div>
-                    </div>
-                    <div class="metric-row">
-                        <div class="metric-label">⏭️ Tests Skipped</div>
-                        <div class="metric-value">{report['tests']['skipped']}</div>
-                    </div>
-                    <div class="metric-row">
-                        <div class="metric-label">📝 Missing Test Files</div>
-                        <div class="metric-value">{report['coverage']['missing_files']}</div>
-                    </div>
-                </div>
-
-                <h2 style="color: #495057; border-bottom: 2px solid #dee2e6; padding-bottom: 10px;">⚠️ Coverage Gaps</h2>
-                <div class="metrics-grid">
-                    <div class="metric-row">
-                        <div class="metric-label">🔴 Critical</div>
-                        <div class="metric-value">{report['gaps']['critical']}</div>
-                    </div>
-                    <div class="metric-row">
-                        <div class="metric-label">🟠 High</div>
-                        <div class="metric-value">{report['gaps']['high']}</div>
-                    </div>
-                    <div class="metric-row">
-                        <div class="metric-label">🟡 Medium</div>
-                        <div class="metric-value">{report['gaps']['medium']}</div>
-                    </div>
-                    <div class="metric-row">
-                        <div class="metric-label">🟢 Low</div>
-                        <div class="metric-value">{report['gaps']['low']}</div>
-                    </div>
-                    <div class="metric-row">
-                        <div class="metric-label"><strong>Total Gaps</strong></div>
-                        <div class="metric-value"><strong>{report['gaps']['count']}</strong></div>
-                    </div>
-                </div>
-
-                {missing_files_html}
-
-                {gaps_html}
-
-                <div class="footer">
-                    <p>🤖 This report was automatically generated by the QA Sub-Agent</p>
-                    <p>Detailed report attached as JSON file</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+                missing_parts.append(f"<li><em>... and {remaining} more</em></li>")
+            missing_parts.append("</ul>")
+            missing_files_html = "".join(missing_parts)
+
+        html = _EMAIL_HTML_TEMPLATE.substitute(
+            score=score,
+            score_color=score_color,
+            score_status=score_status,
+            generated_at=datetime.now().strftime('%B %d, %Y at %I:%M %p'),
+            cov_color=cov_color,
+            coverage=f"{coverage:.1f}",
+            lines_covered=f"{report['coverage']['lines_covered']:,}",
+            lines_total=f"{report['coverage']['lines_total']:,}",
+            tests_passed=report['tests']['passed'],
+            tests_total=report['tests']['total'],
+            tests_failed=report['tests']['failed'],
+            tests_skipped=report['tests']['skipped'],
+            missing_files=report['coverage']['missing_files'],
+            gaps_critical=report['gaps']['critical'],
+            gaps_high=report['gaps']['high'],
+            gaps_medium=report['gaps']['medium'],
+            gaps_low=report['gaps']['low'],
+            gaps_count=report['gaps']['count'],
+            missing_files_html=missing_files_html,
+            gaps_html=gaps_html
+        )
 
         return html
 
@@ -893,7 +1437,8 @@ if __name__ == "__main__":
         if "--email" in sys.argv:
             email_index = sys.argv.index("--email")
             if email_index + 1 < len(sys.argv):
-                to_email = sys.argv[email_index + 1]
+                # Comma-separated recipients share one SMTP session
+                to_email = sys.argv[email_index + 1].split(",")
                 success = qa_service.send_email_report(report, to_email)
                 if not success:
                     print("\n⚠️  Email sending failed. Check environment variables:")
@@ -903,7 +1448,7 @@ if __name__ == "__main__":
                     print("   - SMTP_PORT (optional, defaults to 587)")
             else:
                 print("❌ Error: --email requires an email address")
-                print("Usage: python qa_service.py --email your@email.com")
+                print("Usage: python qa_service.py --email your@email.com[,other@email.com]")
 
         # Exit with error if quality score is low
         if report["quality_score"] < 60:
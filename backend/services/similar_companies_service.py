@@ -5,7 +5,7 @@ AI-powered company similarity analysis with weighted scoring algorithm
 import os
 import math
 from typing import List, Dict, Tuple, Any, Optional
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, undefer
 from sqlalchemy import func, or_, desc
 
 from src.models.database_models_v2 import Company, CompanyPEInvestment, CompanyTag
@@ -49,6 +49,7 @@ class SimilarCompaniesService(BaseService):
         # 1. Get input companies with eager loading
         print("[1/6] Fetching input companies...")
         input_companies = self.session.query(Company).options(
+            undefer(Company.description),  # Scored and returned, see calculate_similarity_score
             joinedload(Company.investments).joinedload(CompanyPEInvestment.pe_firm),
             joinedload(Company.tags)  # Load industry tags for similarity matching
         ).filter(
@@ -66,6 +67,7 @@ class SimilarCompaniesService(BaseService):
         from sqlalchemy import and_, not_, case
 
         query = self.session.query(Company).options(
+            undefer(Company.description),  # Scored and returned, see calculate_similarity_score
             joinedload(Company.investments).joinedload(CompanyPEInvestment.pe_firm),
             joinedload(Company.tags)  # Load industry tags for similarity matching
         ).filter(
@@ -129,7 +131,7 @@ class SimilarCompaniesService(BaseService):
                 ),
                 # Computed status is Exit with no exit_type
                 and_(
-                    CompanyPEInvestment.computed_status.ilike('%exit%'),
+                    CompanyPEInvestment.computed_status == 'Exit',
                     or_(
                         CompanyPEInvestment.exit_type == None,
                         CompanyPEInvestment.exit_type == ''
@@ -137,7 +139,7 @@ class SimilarCompaniesService(BaseService):
                 ),
                 # Computed status is Exit with non-IPO exit type
                 and_(
-                    CompanyPEInvestment.computed_status.ilike('%exit%'),
+                    CompanyPEInvestment.computed_status == 'Exit',
                     CompanyPEInvestment.exit_type != None,
                     CompanyPEInvestment.exit_type != '',
                     ~CompanyPEInvestment.exit_type.ilike('ipo'),
@@ -282,10 +284,6 @@ class SimilarCompaniesService(BaseService):
         confidence_factors = []
         categories_with_score = 0
 
-        # Helper function to safely get attribute
-        def safe_get(obj, attr, default=None):
-            return getattr(obj, attr, default) if obj else default
-
         # Helper function to safely split and clean strings
         def safe_split(text, delimiter=','):
             if not text:
@@ -308,8 +306,8 @@ class SimilarCompaniesService(BaseService):
             return revenue_map.get(revenue_code, None)
 
         # 1. REVENUE SIMILARITY (30 points PitchBook OR 15 points Crunchbase) - HIGHEST PRIORITY
-        revenue_a = safe_get(company_a, 'current_revenue_usd')
-        revenue_b = safe_get(company_b, 'current_revenue_usd')
+        revenue_a = company_a.current_revenue_usd
+        revenue_b = company_b.current_revenue_usd
 
         # Try PitchBook exact revenue first (30 points possible)
         if revenue_a and revenue_b and revenue_a > 0 and revenue_b > 0:
@@ -358,8 +356,8 @@ class SimilarCompaniesService(BaseService):
 
         # Fallback to Crunchbase revenue bands if PitchBook unavailable (15 points possible)
         elif not (revenue_a and revenue_b):
-            rev_code_a = safe_get(company_a, 'revenue_range')
-            rev_code_b = safe_get(company_b, 'revenue_range')
+            rev_code_a = company_a.revenue_range
+            rev_code_b = company_b.revenue_range
 
             if rev_code_a and rev_code_b:
                 rev_mid_a = get_revenue_midpoint(rev_code_a)
@@ -408,8 +406,8 @@ class SimilarCompaniesService(BaseService):
 
         # 2. EMPLOYEE COUNT SIMILARITY (25 points) - SECOND HIGHEST PRIORITY
         # Enhanced with more granular bands
-        emp_a = safe_get(company_a, 'employee_count')
-        emp_b = safe_get(company_b, 'employee_count')
+        emp_a = company_a.employee_count
+        emp_b = company_b.employee_count
 
         if emp_a and emp_b and emp_a > 0 and emp_b > 0:
             # Calculate ratio (smaller/larger)
@@ -459,10 +457,10 @@ class SimilarCompaniesService(BaseService):
         pe_firms_a = set()
         pe_firms_b = set()
 
-        if hasattr(company_a, 'investments') and company_a.investments:
+        if company_a.investments:
             pe_firms_a = {inv.pe_firm.name for inv in company_a.investments if inv.pe_firm}
 
-        if hasattr(company_b, 'investments') and company_b.investments:
+        if company_b.investments:
             pe_firms_b = {inv.pe_firm.name for inv in company_b.investments if inv.pe_firm}
 
         if pe_firms_a and pe_firms_b:
@@ -499,8 +497,8 @@ class SimilarCompaniesService(BaseService):
                 }
 
         # 4. Verticals similarity (12 points) - PitchBook verticals
-        verticals_a = safe_split(safe_get(company_a, 'verticals'))
-        verticals_b = safe_split(safe_get(company_b, 'verticals'))
+        verticals_a = safe_split(company_a.verticals)
+        verticals_b = safe_split(company_b.verticals)
 
         if verticals_a and verticals_b:
             # Calculate Jaccard similarity (intersection over union)
@@ -526,8 +524,8 @@ class SimilarCompaniesService(BaseService):
                 matching_attributes.append(f"Shared verticals: {', '.join(sorted(shared_verticals))}")
 
         # 5. Industry Category similarity (8 points) - More detailed than sector
-        industry_cat_a = safe_split(safe_get(company_a, 'industry_category'))
-        industry_cat_b = safe_split(safe_get(company_b, 'industry_category'))
+        industry_cat_a = safe_split(company_a.industry_category)
+        industry_cat_b = safe_split(company_b.industry_category)
 
         if industry_cat_a and industry_cat_b:
             # Calculate Jaccard similarity
@@ -553,8 +551,8 @@ class SimilarCompaniesService(BaseService):
                 matching_attributes.append(f"Shared industry categories: {', '.join(sorted(shared_industries))}")
 
         # 6. DESCRIPTION SIMILARITY (5 points) - Keyword-based matching
-        desc_a = safe_get(company_a, 'description', '')
-        desc_b = safe_get(company_b, 'description', '')
+        desc_a = company_a.description
+        desc_b = company_b.description
 
         if desc_a and desc_b:
             # Extract meaningful keywords (exclude common words)
@@ -601,8 +599,8 @@ class SimilarCompaniesService(BaseService):
             """Infer business model from verticals and industry"""
             models = set()
 
-            verticals_lower = (safe_get(company, 'verticals') or '').lower()
-            industry_lower = (safe_get(company, 'industry_category') or '').lower()
+            verticals_lower = (company.verticals or '').lower()
+            industry_lower = (company.industry_category or '').lower()
             combined = f"{verticals_lower} {industry_lower}"
 
             # SaaS indicators
@@ -659,8 +657,8 @@ class SimilarCompaniesService(BaseService):
                 }
 
         # 8. Funding Stage similarity (3 points) - Company maturity
-        funding_stage_a = safe_get(company_a, 'funding_stage_encoded')
-        funding_stage_b = safe_get(company_b, 'funding_stage_encoded')
+        funding_stage_a = company_a.funding_stage_encoded
+        funding_stage_b = company_b.funding_stage_encoded
 
         if funding_stage_a and funding_stage_b:
             # Similar funding stages (within 1-2 stages)
@@ -690,10 +688,10 @@ class SimilarCompaniesService(BaseService):
             }
 
         # 9. Geographic proximity (1 point) - Lower priority
-        country_a = safe_get(company_a, 'hq_country')
-        country_b = safe_get(company_b, 'hq_country')
-        state_a = safe_get(company_a, 'state_region')
-        state_b = safe_get(company_b, 'state_region')
+        country_a = company_a.hq_country
+        country_b = company_b.hq_country
+        state_a = company_a.state_region
+        state_b = company_b.state_region
 
         geo_score = 0
         if country_a and country_b:
@@ -719,8 +717,8 @@ class SimilarCompaniesService(BaseService):
             }
 
         # 10. Funding Type similarity (1 point) - Lowest priority
-        funding_type_a = safe_get(company_a, 'last_financing_deal_type')
-        funding_type_b = safe_get(company_b, 'last_financing_deal_type')
+        funding_type_a = company_a.last_financing_deal_type
+        funding_type_b = company_b.last_financing_deal_type
 
         if funding_type_a and funding_type_b:
             # Group similar funding types
@@ -863,7 +861,7 @@ class SimilarCompaniesService(BaseService):
             reasoning_parts.append(f"Key similarities include: {', '.join(key_matches).lower()}")
         
         # Add business context if available
-        if hasattr(company_a, 'current_revenue_usd') and company_a.current_revenue_usd:
+        if company_a.current_revenue_usd:
             reasoning_parts.append(f"Both operate at similar revenue scales")
         
         return ". ".join(reasoning_parts) + "."
@@ -872,12 +870,12 @@ class SimilarCompaniesService(BaseService):
         """Convert Company model to CompanyResponse"""
         # Get PE firms
         pe_firms = []
-        if hasattr(company, 'investments') and company.investments:
+        if company.investments:
             pe_firms = [inv.pe_firm.name for inv in company.investments if inv.pe_firm]
         
         # Get employee count display
         employee_count = None
-        if hasattr(company, 'employee_count') and company.employee_count:
+        if company.employee_count:
             employee_count = f"{company.employee_count:,}"
         elif company.projected_employee_count:
             employee_count = f"{company.projected_employee_count:,}"
@@ -893,15 +891,15 @@ class SimilarCompaniesService(BaseService):
         
         # Get industries
         industries = []
-        if hasattr(company, 'tags') and company.tags:
-            industries = [tag.tag_value for tag in company.tags]
+        if company.tags:
+            industries = [tag.tag_value for tag in company.tags if tag.tag_category == 'industry']
         
         return CompanyResponse(
             id=company.id,
             name=company.name,
-            former_name=getattr(company, 'former_name', None),
+            former_name=company.former_name,
             pe_firms=pe_firms,
-            status=getattr(company, 'computed_status', 'Unknown'),
+            status=company.computed_status,
             headquarters=f"{company.city}, {company.state_region}" if company.city and company.state_region else company.city or company.state_region,
             website=company.website,
             linkedin_url=company.linkedin_url,
@@ -911,13 +909,13 @@ class SimilarCompaniesService(BaseService):
             employee_count=employee_count,
             industry_category=company.industry_category,
             industries=industries,
-            is_public=getattr(company, 'is_public', False),
+            is_public=company.is_public or False,
             # PitchBook data
-            current_revenue_usd=getattr(company, 'current_revenue_usd', None),
-            last_known_valuation_usd=getattr(company, 'last_known_valuation_usd', None),
-            primary_industry_group=getattr(company, 'primary_industry_group', None),
-            primary_industry_sector=getattr(company, 'primary_industry_sector', None),
-            hq_location=getattr(company, 'hq_location', None),
-            hq_country=getattr(company, 'hq_country', None),
-            verticals=getattr(company, 'verticals', None)
+            current_revenue_usd=company.current_revenue_usd,
+            last_known_valuation_usd=company.last_known_valuation_usd,
+            primary_industry_group=company.primary_industry_group,
+            primary_industry_sector=company.primary_industry_sector,
+            hq_location=company.hq_location,
+            hq_country=company.hq_country,
+            verticals=company.verticals
         )
\ No newline at end of file
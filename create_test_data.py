@@ -6,7 +6,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from src.models.database_models_v2 import get_direct_session, Company, PEFirm, CompanyPEInvestment
+from src.models.database_models_v2 import get_direct_session, Company, PEFirm, CompanyPEInvestment, sync_vertical_tags
 from datetime import datetime
 
 def create_test_data():
@@ -178,6 +178,8 @@ def create_test_data():
         
         for company in companies:
             session.add(company)
+        session.flush()
+        sync_vertical_tags(session, companies)
         session.commit()
         
         # Create some investments to link companies with PE firms
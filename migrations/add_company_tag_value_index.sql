@@ -0,0 +1,36 @@
+-- Performance Optimization: Covering index for per-company tag lookups
+-- Queries of the form company_id = ? AND tag_category = ? (vertical tag sync,
+-- the add_vertical_tags.sql NOT EXISTS check) used idx_company_category
+-- (company_id, tag_category) and then fetched tag_value from the heap.
+-- idx_company_category_value adds tag_value to the key so they are index-only
+-- scans; it is a superset of idx_company_category, which is dropped.
+-- idx_category_value (tag_category, tag_value) is likewise a prefix of
+-- idx_category_value_company (add_filter_indexes.sql) and only slows tag
+-- writes, so it is dropped too.
+-- Industry lookups excluding 'Other' keep using the partial
+-- idx_company_industry_tags (see add_display_columns.sql).
+-- CONCURRENTLY cannot run inside a transaction block - run this file with
+-- autocommit (e.g. psql without --single-transaction).
+
+-- Step 1: Build the covering index without blocking writes
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_company_category_value
+    ON company_tags (company_id, tag_category, tag_value);
+
+-- Step 2: Drop the narrower indexes made redundant by wider ones
+DROP INDEX CONCURRENTLY IF EXISTS idx_company_category;
+DROP INDEX CONCURRENTLY IF EXISTS idx_category_value;
+
+-- Refresh planner statistics
+ANALYZE company_tags;
+
+-- Verify indexes were created
+SELECT
+    tablename,
+    indexname,
+    indexdef
+FROM pg_indexes
+WHERE tablename = 'company_tags'
+ORDER BY indexname;
+
+-- Test the planner picks the index (example query)
+-- EXPLAIN ANALYZE SELECT tag_value FROM company_tags WHERE company_id = 1 AND tag_category = 'vertical';
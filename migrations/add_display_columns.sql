@@ -0,0 +1,32 @@
+-- Performance Optimization: Pre-compute display columns
+-- headquarters / employee count display strings are derived only from stored
+-- columns, so materialize them once at write time instead of per response row.
+-- Expressions mirror HEADQUARTERS_DISPLAY_SQL / EMPLOYEE_COUNT_DISPLAY_SQL in
+-- src/models/database_models_v2.py
+-- PostgreSQL only. Until this runs (and on SQLite databases created before the
+-- columns existed) the API computes the same values per row instead; see
+-- generated_company_columns in the models. Restart the API after migrating.
+
+-- Step 1: Headquarters display ("HQ Location, HQ Country" or "City, State, Country")
+ALTER TABLE companies ADD COLUMN IF NOT EXISTS headquarters_display text
+  GENERATED ALWAYS AS (
+    CASE WHEN hq_location <> '' THEN hq_location || COALESCE(', ' || NULLIF(hq_country, ''), '') ELSE NULLIF(substr(COALESCE(', ' || NULLIF(city, ''), '') || COALESCE(', ' || NULLIF(state_region, ''), '') || COALESCE(', ' || NULLIF(country, ''), ''), 3), '') END
+  ) STORED;
+
+-- Step 2: Employee count display (PitchBook count > LinkedIn count > Crunchbase range)
+ALTER TABLE companies ADD COLUMN IF NOT EXISTS employee_count_display text
+  GENERATED ALWAYS AS (
+    CASE WHEN employee_count <> 0 THEN CASE WHEN employee_count >= 1000000 THEN CAST(employee_count / 1000000 AS TEXT) || ',' || substr(CAST(1000 + (employee_count / 1000) % 1000 AS TEXT), 2) || ',' || substr(CAST(1000 + employee_count % 1000 AS TEXT), 2) WHEN employee_count >= 1000 THEN CAST(employee_count / 1000 AS TEXT) || ',' || substr(CAST(1000 + employee_count % 1000 AS TEXT), 2) ELSE CAST(employee_count AS TEXT) END WHEN projected_employee_count <> 0 THEN CASE WHEN projected_employee_count >= 1000000 THEN CAST(projected_employee_count / 1000000 AS TEXT) || ',' || substr(CAST(1000 + (projected_employee_count / 1000) % 1000 AS TEXT), 2) || ',' || substr(CAST(1000 + projected_employee_count % 1000 AS TEXT), 2) WHEN projected_employee_count >= 1000 THEN CAST(projected_employee_count / 1000 AS TEXT) || ',' || substr(CAST(1000 + projected_employee_count % 1000 AS TEXT), 2) ELSE CAST(projected_employee_count AS TEXT) END WHEN crunchbase_employee_count <> '' THEN CASE crunchbase_employee_count WHEN 'c_00001_00010' THEN '1-10' WHEN 'c_00011_00050' THEN '11-50' WHEN 'c_00051_00100' THEN '51-100' WHEN 'c_00101_00250' THEN '101-250' WHEN 'c_00251_00500' THEN '251-500' WHEN 'c_00501_01000' THEN '501-1,000' WHEN 'c_01001_05000' THEN '1,001-5,000' WHEN 'c_05001_10000' THEN '5,001-10,000' WHEN 'c_10001_max' THEN '10,001+' ELSE crunchbase_employee_count END END
+  ) STORED;
+
+-- Step 3: Partial index for industry tag lookups (excludes the 'Other' bucket)
+CREATE INDEX IF NOT EXISTS idx_company_industry_tags
+  ON company_tags (company_id, tag_value)
+  WHERE tag_category = 'industry' AND tag_value <> 'Other';
+
+-- Verify the setup
+SELECT
+    COUNT(*) as total_companies,
+    COUNT(headquarters_display) as companies_with_headquarters,
+    COUNT(employee_count_display) as companies_with_employee_count
+FROM companies;
@@ -0,0 +1,36 @@
+-- Performance Optimization: Numeric Crunchbase employee range bounds
+-- min_employees / max_employees used to match crunchbase_employee_count codes
+-- (e.g. 'c_00501_01000') with ILIKE '%n%', a leading-wildcard scan that also
+-- matched the wrong ranges. Store the range bounds as integers so the filters
+-- become indexed range predicates. Expressions mirror _employee_bound_sql in
+-- src/models/database_models_v2.py (open-ended ranges use 2147483647).
+-- PostgreSQL only. Until this runs (and on SQLite databases created before the
+-- columns existed) the filters match the overlapping range codes instead; see
+-- Company.crunchbase_employee_condition. Restart the API after migrating.
+
+-- Step 1: Lower bound of the range
+ALTER TABLE companies ADD COLUMN IF NOT EXISTS crunchbase_employee_lo integer
+  GENERATED ALWAYS AS (
+    CASE crunchbase_employee_count WHEN 'c_00001_00010' THEN 1 WHEN 'c_00011_00050' THEN 11 WHEN 'c_00051_00100' THEN 51 WHEN 'c_00101_00250' THEN 101 WHEN 'c_00251_00500' THEN 251 WHEN 'c_00501_01000' THEN 501 WHEN 'c_01001_05000' THEN 1001 WHEN 'c_05001_10000' THEN 5001 WHEN 'c_10001_max' THEN 10001 END
+  ) STORED;
+
+-- Step 2: Upper bound of the range
+ALTER TABLE companies ADD COLUMN IF NOT EXISTS crunchbase_employee_hi integer
+  GENERATED ALWAYS AS (
+    CASE crunchbase_employee_count WHEN 'c_00001_00010' THEN 10 WHEN 'c_00011_00050' THEN 50 WHEN 'c_00051_00100' THEN 100 WHEN 'c_00101_00250' THEN 250 WHEN 'c_00251_00500' THEN 500 WHEN 'c_00501_01000' THEN 1000 WHEN 'c_01001_05000' THEN 5000 WHEN 'c_05001_10000' THEN 10000 WHEN 'c_10001_max' THEN 2147483647 END
+  ) STORED;
+
+-- Step 3: Index the bounds for range scans
+CREATE INDEX IF NOT EXISTS ix_companies_crunchbase_employee_lo ON companies(crunchbase_employee_lo);
+CREATE INDEX IF NOT EXISTS ix_companies_crunchbase_employee_hi ON companies(crunchbase_employee_hi);
+
+-- Verify the setup
+SELECT
+    crunchbase_employee_count,
+    crunchbase_employee_lo,
+    crunchbase_employee_hi,
+    COUNT(*) as companies
+FROM companies
+WHERE crunchbase_employee_count IS NOT NULL
+GROUP BY crunchbase_employee_count, crunchbase_employee_lo, crunchbase_employee_hi
+ORDER BY crunchbase_employee_lo;
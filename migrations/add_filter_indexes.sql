@@ -0,0 +1,32 @@
+-- Performance Optimization: Indexes backing the company/investment filters
+-- apply_filters narrows by industry tag, revenue range and industry group, then
+-- pages with ORDER BY companies.name. companies.name, country, state_region and
+-- city are already indexed; these cover the remaining hot predicates.
+
+-- Step 1: Covering index for industry tag subqueries (tag_category, tag_value -> company_id)
+CREATE INDEX IF NOT EXISTS idx_category_value_company ON company_tags(tag_category, tag_value, company_id);
+
+-- Step 2: Revenue range filters (min_revenue / max_revenue)
+CREATE INDEX IF NOT EXISTS idx_current_revenue ON companies(current_revenue_usd);
+
+-- Step 3: Industry group filter (always combined with IS NOT NULL)
+CREATE INDEX IF NOT EXISTS idx_primary_industry_group ON companies(primary_industry_group)
+    WHERE primary_industry_group IS NOT NULL;
+
+-- Refresh planner statistics
+ANALYZE companies;
+ANALYZE company_tags;
+
+-- Verify indexes were created
+SELECT
+    tablename,
+    indexname,
+    indexdef
+FROM pg_indexes
+WHERE indexname IN ('idx_category_value_company', 'idx_current_revenue', 'idx_primary_industry_group')
+ORDER BY indexname;
+
+-- Test the planner picks the indexes (example queries)
+-- EXPLAIN ANALYZE SELECT company_id FROM company_tags WHERE tag_category = 'industry' AND tag_value IN ('Software', 'Fintech');
+-- EXPLAIN ANALYZE SELECT id FROM companies WHERE current_revenue_usd BETWEEN 10 AND 50;
+-- EXPLAIN ANALYZE SELECT id FROM companies WHERE primary_industry_group IS NOT NULL AND primary_industry_group IN ('Software');
@@ -0,0 +1,34 @@
+-- Performance Optimization: Cascade company deletes in the database
+-- delete_company used to issue a DELETE per child table before removing the
+-- company. With ON DELETE CASCADE a single DELETE on companies removes the
+-- investments, tags and funding rounds server-side.
+
+-- Step 1: PE investments
+ALTER TABLE company_pe_investments
+  DROP CONSTRAINT IF EXISTS company_pe_investments_company_id_fkey,
+  ADD CONSTRAINT company_pe_investments_company_id_fkey
+    FOREIGN KEY (company_id) REFERENCES companies(id) ON DELETE CASCADE;
+
+-- Step 2: Company tags
+ALTER TABLE company_tags
+  DROP CONSTRAINT IF EXISTS company_tags_company_id_fkey,
+  ADD CONSTRAINT company_tags_company_id_fkey
+    FOREIGN KEY (company_id) REFERENCES companies(id) ON DELETE CASCADE;
+
+-- Step 3: Funding rounds
+ALTER TABLE funding_rounds
+  DROP CONSTRAINT IF EXISTS funding_rounds_company_id_fkey,
+  ADD CONSTRAINT funding_rounds_company_id_fkey
+    FOREIGN KEY (company_id) REFERENCES companies(id) ON DELETE CASCADE;
+
+-- Verify the constraints (confdeltype 'c' = CASCADE)
+SELECT
+    conrelid::regclass AS table_name,
+    conname,
+    confdeltype
+FROM pg_constraint
+WHERE conname IN (
+    'company_pe_investments_company_id_fkey',
+    'company_tags_company_id_fkey',
+    'funding_rounds_company_id_fkey'
+);
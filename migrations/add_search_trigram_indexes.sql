@@ -0,0 +1,32 @@
+-- Performance Optimization: Trigram indexes for the remaining substring filters
+-- Follows add_trigram_indexes.sql (pe_firms.name, companies.verticals). The
+-- search, status and exit_type filters still use ILIKE '%term%', which a btree
+-- cannot serve. Exact-match mode keeps using the existing btree indexes.
+
+-- Step 1: Enable trigram support
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Step 2: Company name substring search (search filter)
+CREATE INDEX IF NOT EXISTS idx_companies_name_trgm ON companies USING GIN (name gin_trgm_ops);
+
+-- Step 3: Investment status / exit type substring filters
+CREATE INDEX IF NOT EXISTS idx_investments_computed_status_trgm
+    ON company_pe_investments USING GIN (computed_status gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_investments_exit_type_trgm
+    ON company_pe_investments USING GIN (exit_type gin_trgm_ops);
+
+-- Verify indexes were created
+SELECT
+    tablename,
+    indexname,
+    indexdef
+FROM pg_indexes
+WHERE indexname IN (
+    'idx_companies_name_trgm',
+    'idx_investments_computed_status_trgm',
+    'idx_investments_exit_type_trgm'
+)
+ORDER BY indexname;
+
+-- Test the planner picks the index (example query)
+-- EXPLAIN ANALYZE SELECT id FROM companies WHERE name ILIKE '%soft%';
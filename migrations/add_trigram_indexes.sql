@@ -0,0 +1,26 @@
+-- Performance Optimization: Trigram indexes for substring filters
+-- apply_filters matches PE firms and verticals with ILIKE '%term%', which
+-- cannot use a btree index. pg_trgm GIN indexes let the planner serve these
+-- predicates from an index instead of a sequential scan (no code change needed).
+
+-- Step 1: Enable trigram support
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Step 2: PE firm name substring search (pe_firm filter)
+CREATE INDEX IF NOT EXISTS idx_pe_firms_name_trgm ON pe_firms USING GIN (name gin_trgm_ops);
+
+-- Step 3: Verticals substring search (verticals filter; dropped again by
+-- add_vertical_tags.sql once the filter reads vertical tags)
+CREATE INDEX IF NOT EXISTS idx_companies_verticals_trgm ON companies USING GIN (verticals gin_trgm_ops);
+
+-- Verify indexes were created
+SELECT
+    tablename,
+    indexname,
+    indexdef
+FROM pg_indexes
+WHERE indexname IN ('idx_pe_firms_name_trgm', 'idx_companies_verticals_trgm')
+ORDER BY indexname;
+
+-- Test the planner picks the index (example query)
+-- EXPLAIN ANALYZE SELECT id FROM companies WHERE verticals ILIKE '%SaaS%';
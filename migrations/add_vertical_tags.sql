@@ -0,0 +1,40 @@
+-- Performance Optimization: Normalized vertical tags
+-- The verticals filter matched Company.verticals (a comma-separated string) with
+-- one ILIKE '%v%' per selected vertical, a leading-wildcard scan of companies.
+-- Each vertical is now also stored as a company_tags row (tag_category
+-- 'vertical', see VERTICAL_TAG_CATEGORY in src/models/database_models_v2.py) so
+-- the filter is an IN lookup on idx_category_value_company. Tags match whole
+-- verticals, so a partial term ('SaaS') no longer matches 'SaaS Tools'.
+-- CompanyService create/update keeps the tags in sync (sync_vertical_tags in
+-- the models). Re-run this backfill after loading companies any other way
+-- (scripts that skip sync_vertical_tags, bulk UPDATE/INSERT, raw SQL).
+
+-- Step 1: Backfill one tag per distinct, trimmed vertical
+INSERT INTO company_tags (company_id, tag_category, tag_value, created_at)
+SELECT DISTINCT c.id, 'vertical', trim(v.vertical), now()
+FROM companies c
+CROSS JOIN LATERAL unnest(string_to_array(c.verticals, ',')) AS v(vertical)
+WHERE c.verticals IS NOT NULL
+  AND trim(v.vertical) <> ''
+  AND NOT EXISTS (
+      SELECT 1 FROM company_tags t
+      WHERE t.company_id = c.id
+        AND t.tag_category = 'vertical'
+        AND t.tag_value = trim(v.vertical)
+  );
+
+-- Step 2: Refresh planner statistics for the new rows
+ANALYZE company_tags;
+
+-- Step 3: Drop the verticals trigram index from add_trigram_indexes.sql. Only
+-- the exact-match verticals filter still reads companies.verticals, and it
+-- compares with =, which the trigram index does not serve.
+DROP INDEX IF EXISTS idx_companies_verticals_trgm;
+
+-- Verify the setup
+SELECT tag_value AS vertical, COUNT(*) AS companies
+FROM company_tags
+WHERE tag_category = 'vertical'
+GROUP BY tag_value
+ORDER BY companies DESC
+LIMIT 20;
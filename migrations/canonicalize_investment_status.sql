@@ -0,0 +1,32 @@
+-- Performance Optimization: Canonical investment status
+-- Status filters matched company_pe_investments.computed_status with
+-- ILIKE '%status%'. computed_status now always holds the canonical 'Active' or
+-- 'Exit' spelling (CompanyPEInvestment.canonical_status on create and update),
+-- so the filters are equality / IN checks served by the existing btree indexes
+-- (ix_company_pe_investments_computed_status, idx_pe_firm_status).
+
+-- Step 1: Canonicalize existing rows
+-- Exact case-insensitive matches against the same alias list as
+-- CompanyPEInvestment.STATUS_ALIASES; anything else (e.g. 'Inactive') is left alone.
+UPDATE company_pe_investments
+SET computed_status = 'Active'
+WHERE LOWER(TRIM(computed_status)) IN ('active', 'current') AND computed_status <> 'Active';
+
+UPDATE company_pe_investments
+SET computed_status = 'Exit'
+WHERE LOWER(TRIM(computed_status)) IN ('exit', 'exited', 'realized') AND computed_status <> 'Exit';
+
+-- Step 2: The trigram index from add_search_trigram_indexes.sql no longer serves any filter
+DROP INDEX IF EXISTS idx_investments_computed_status_trgm;
+
+-- Step 3: Refresh planner statistics
+ANALYZE company_pe_investments;
+
+-- Verify the setup
+SELECT computed_status, COUNT(*) AS investments
+FROM company_pe_investments
+GROUP BY computed_status
+ORDER BY investments DESC;
+
+-- Test the planner picks the index (example query)
+-- EXPLAIN ANALYZE SELECT id FROM company_pe_investments WHERE computed_status = 'Active';
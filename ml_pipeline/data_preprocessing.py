@@ -6,7 +6,7 @@ import numpy as np
 from sklearn.preprocessing import StandardScaler, LabelEncoder, RobustScaler
 from sklearn.impute import SimpleImputer, KNNImputer
 from typing import Tuple, List, Dict, Any
-import pickle
+import joblib
 import json
 from pathlib import Path
 import warnings
@@ -337,17 +337,15 @@ class FeatureEngineer:
         return df
 
     def save(self, filepath: str):
-        """Save the feature engineer"""
+        """Save the feature engineer (uncompressed joblib, so load can memory-map its arrays)"""
         Path(filepath).parent.mkdir(parents=True, exist_ok=True)
-        with open(filepath, 'wb') as f:
-            pickle.dump(self, f)
+        joblib.dump(self, filepath, compress=0)
         print(f"Feature engineer saved to {filepath}")
 
     @staticmethod
     def load(filepath: str) -> 'FeatureEngineer':
-        """Load a saved feature engineer"""
-        with open(filepath, 'rb') as f:
-            return pickle.load(f)
+        """Load a saved feature engineer, memory-mapping its numpy arrays read-only"""
+        return joblib.load(filepath, mmap_mode='r')
 
 
 def prepare_data(csv_path: str, target: str = 'revenue_usd_millions',
@@ -10,7 +10,7 @@ from sklearn.model_selection import cross_val_score, KFold
 import xgboost as xgb
 import lightgbm as lgb
 from typing import Dict, Any, List, Tuple
-import pickle
+import joblib
 import json
 from pathlib import Path
 import time
@@ -320,17 +320,15 @@ class EnsembleModel:
 
 
 def save_model(model: Any, filepath: str):
-    """Save a trained model"""
+    """Save a trained model (uncompressed joblib, so load_model can memory-map its arrays)"""
     Path(filepath).parent.mkdir(parents=True, exist_ok=True)
-    with open(filepath, 'wb') as f:
-        pickle.dump(model, f)
+    joblib.dump(model, filepath, compress=0)
     print(f"Model saved to {filepath}")
 
 
 def load_model(filepath: str) -> Any:
-    """Load a saved model"""
-    with open(filepath, 'rb') as f:
-        return pickle.load(f)
+    """Load a saved model, memory-mapping its numpy arrays read-only"""
+    return joblib.load(filepath, mmap_mode='r')
 
 
 def save_results(results: Dict[str, Any], filepath: str):
@@ -3,10 +3,11 @@
 Script to enrich companies with ML revenue predictions
 
 Usage:
-  python scripts/enrich_companies.py [--force]
+  python scripts/enrich_companies.py [--force] [--workers N]
 
 Options:
-  --force  Re-predict for all companies (even those with existing predictions)
+  --force      Re-predict for all companies (even those with existing predictions)
+  --workers N  Predict batches in N worker processes (default: one per CPU)
 """
 import sys
 import os
@@ -21,6 +22,9 @@ from backend.services.ml_enrichment_service import MLEnrichmentService
 
 def main():
     force_update = '--force' in sys.argv
+    workers = os.cpu_count() or 1
+    if '--workers' in sys.argv:
+        workers = int(sys.argv[sys.argv.index('--workers') + 1])
 
     print("="*80)
     print("ML REVENUE PREDICTION ENRICHMENT")
@@ -50,11 +54,12 @@ def main():
             print("   Use --force to re-predict anyway")
             return
 
-        print(f"\n🤖 Starting enrichment...")
+        print(f"\n🤖 Starting enrichment ({workers} worker processes)...")
         count = enrichment_service.enrich_all_companies(
             db,
             force_update=force_update,
-            batch_size=50
+            batch_size=50,
+            workers=workers
         )
 
         print(f"\n{'='*80}")
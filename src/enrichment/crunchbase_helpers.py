@@ -4,8 +4,11 @@ Crunchbase API helper functions
 import requests
 import time
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 
+from src.enrichment.crunchbase_ranges import REVENUE_RANGES, EMPLOYEE_RANGES
+
 load_dotenv()
 
 CRUNCHBASE_API_KEY = os.getenv('CRUNCHBASE_API_KEY')
@@ -14,37 +17,14 @@ CRUNCHBASE_BASE_URL = "https://api.crunchbase.com/v4/data"
 # Rate limiting
 CALL_DELAY = 2.0  # 2 second delay between calls to avoid hitting limits
 
-# Revenue range mappings
-REVENUE_RANGES = {
-    "r_00000000": "Less than $1M",
-    "r_00001000": "$1M - $10M",
-    "r_00010000": "$10M - $50M",
-    "r_00050000": "$50M - $100M",
-    "r_00100000": "$100M - $500M",
-    "r_00500000": "$500M - $1B",
-    "r_01000000": "$1B - $10B",
-    "r_10000000": "$10B+"
-}
-
-# Employee count mappings
-EMPLOYEE_RANGES = {
-    "c_00001_00010": "1-10",
-    "c_00011_00050": "11-50",
-    "c_00051_00100": "51-100",
-    "c_00101_00250": "101-250",
-    "c_00251_00500": "251-500",
-    "c_00501_01000": "501-1,000",
-    "c_01001_05000": "1,001-5,000",
-    "c_05001_10000": "5,001-10,000",
-    "c_10001_max": "10,001+"
-}
-
+@lru_cache(maxsize=128)
 def decode_revenue_range(code):
-    """Convert Crunchbase revenue code to readable string"""
+    """Convert Crunchbase revenue code to readable string (cached - codes are a small fixed set)"""
     return REVENUE_RANGES.get(code, code if code else "N/A")
 
+@lru_cache(maxsize=128)
 def decode_employee_count(code):
-    """Convert Crunchbase employee code to readable string"""
+    """Convert Crunchbase employee code to readable string (cached - codes are a small fixed set)"""
     return EMPLOYEE_RANGES.get(code, code if code else "N/A")
 
 def search_company_crunchbase(company_name, retry=True):
@@ -12,17 +12,85 @@ from sqlalchemy import (
     Date,
     Float,
     create_engine,
+    event,
     Index,
     UniqueConstraint,
+    Computed,
+    text,
+    inspect,
 )
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, sessionmaker
+from sqlalchemy.orm import relationship, sessionmaker, deferred
 from datetime import datetime
 import re
 
+from src.enrichment.crunchbase_ranges import EMPLOYEE_RANGES
+
 Base = declarative_base()
 
 
+def _thousands_sql(column):
+    """Portable SQL that formats an integer column with thousands separators (e.g. 1,234)"""
+    return (
+        f"CASE WHEN {column} >= 1000000 THEN CAST({column} / 1000000 AS TEXT) || ',' || "
+        f"substr(CAST(1000 + ({column} / 1000) % 1000 AS TEXT), 2) || ',' || "
+        f"substr(CAST(1000 + {column} % 1000 AS TEXT), 2) "
+        f"WHEN {column} >= 1000 THEN CAST({column} / 1000 AS TEXT) || ',' || "
+        f"substr(CAST(1000 + {column} % 1000 AS TEXT), 2) "
+        f"ELSE CAST({column} AS TEXT) END"
+    )
+
+
+# Generated display columns - mirror CompanyService.build_headquarters and
+# CompanyService.get_employee_count_display so reads are a single attribute access.
+# Kept to functions available (and IMMUTABLE) in both PostgreSQL and SQLite.
+# table is an optional "companies." prefix for use inside joined queries.
+def _headquarters_display_sql(table=""):
+    return (
+        f"CASE WHEN {table}hq_location <> '' THEN {table}hq_location || COALESCE(', ' || NULLIF({table}hq_country, ''), '') "
+        "ELSE NULLIF(substr("
+        f"COALESCE(', ' || NULLIF({table}city, ''), '') || "
+        f"COALESCE(', ' || NULLIF({table}state_region, ''), '') || "
+        f"COALESCE(', ' || NULLIF({table}country, ''), ''), 3), '') END"
+    )
+
+
+def _employee_count_display_sql(table=""):
+    return (
+        f"CASE WHEN {table}employee_count <> 0 THEN {_thousands_sql(table + 'employee_count')} "
+        f"WHEN {table}projected_employee_count <> 0 THEN {_thousands_sql(table + 'projected_employee_count')} "
+        f"WHEN {table}crunchbase_employee_count <> '' THEN CASE {table}crunchbase_employee_count "
+        + " ".join(f"WHEN '{code}' THEN '{label}'" for code, label in EMPLOYEE_RANGES.items())
+        + f" ELSE {table}crunchbase_employee_count END END"
+    )
+
+
+HEADQUARTERS_DISPLAY_SQL = _headquarters_display_sql()
+EMPLOYEE_COUNT_DISPLAY_SQL = _employee_count_display_sql()
+
+# Upper bound stored for the open-ended Crunchbase range (c_10001_max)
+OPEN_ENDED_EMPLOYEE_BOUND = 2147483647
+
+# CompanyTag category holding one row per entry of Company.verticals, so
+# vertical filters are index lookups instead of ILIKE scans of the CSV column.
+# Kept in sync by sync_vertical_tags below.
+VERTICAL_TAG_CATEGORY = "vertical"
+
+
+def _employee_bound(code, position):
+    """Lower (1) or upper (2) bound of a Crunchbase employee range code"""
+    bound = code.split('_')[position]  # e.g. "00501", "01000" or "max"
+    return int(bound) if bound.isdigit() else OPEN_ENDED_EMPLOYEE_BOUND
+
+
+def _employee_bound_sql(position, table=""):
+    """CASE expression mapping a Crunchbase employee range code to its lower (1) or upper (2) bound"""
+    whens = " ".join(f"WHEN '{code}' THEN {_employee_bound(code, position)}" for code in EMPLOYEE_RANGES)
+    return f"CASE {table}crunchbase_employee_count {whens} END"
+
+
 class PEFirm(Base):
     """Private Equity Firm"""
 
@@ -51,7 +119,8 @@ class Company(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String(500), nullable=False, index=True)
     former_name = Column(String(255))  # Former/previous company name (fka/formerly)
-    description = Column(Text)
+    # Deferred: wide text only read when building a full company response (undefer where needed)
+    description = deferred(Column(Text))
     website = Column(String(500), index=True)
     linkedin_url = Column(String(500))
     crunchbase_url = Column(String(500))  # Crunchbase profile URL (2025-10-31)
@@ -108,15 +177,26 @@ class Company(Base):
     last_financing_deal_type = Column(String(100))
     company_last_updated = Column(DateTime)
     verticals = Column(Text)
-    financing_status_note = Column(Text)
+    financing_status_note = deferred(Column(Text))  # Stored for reference, not read by the API
+
+    # Pre-computed display values (GENERATED ALWAYS AS ... STORED, see migrations/add_display_columns.sql).
+    # Deferred so plain loads work on databases created before the migration;
+    # undefer only where generated_company_columns() reports them present.
+    headquarters_display = deferred(Column(Text, Computed(HEADQUARTERS_DISPLAY_SQL, persisted=True)))
+    employee_count_display = deferred(Column(Text, Computed(EMPLOYEE_COUNT_DISPLAY_SQL, persisted=True)))
+    # Numeric bounds of the Crunchbase employee range so min/max filters can use an index
+    # (see migrations/add_employee_range_columns.sql and crunchbase_employee_condition)
+    crunchbase_employee_lo = deferred(Column(Integer, Computed(_employee_bound_sql(1), persisted=True), index=True))
+    crunchbase_employee_hi = deferred(Column(Integer, Computed(_employee_bound_sql(2), persisted=True), index=True))
 
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    investments = relationship("CompanyPEInvestment", back_populates="company", cascade="all, delete-orphan")
-    tags = relationship("CompanyTag", back_populates="company", cascade="all, delete-orphan")
-    funding_rounds = relationship("FundingRound", backref="company", cascade="all, delete-orphan")
+    # passive_deletes: child rows are removed by ON DELETE CASCADE in the database
+    investments = relationship("CompanyPEInvestment", back_populates="company", cascade="all, delete-orphan", passive_deletes=True)
+    tags = relationship("CompanyTag", back_populates="company", cascade="all, delete-orphan", passive_deletes=True)
+    funding_rounds = relationship("FundingRound", backref="company", cascade="all, delete-orphan", passive_deletes=True)
 
     # Indexes - OPTIMIZED for common query patterns
     __table_args__ = (
@@ -126,10 +206,37 @@ class Company(Base):
         Index("idx_primary_sector", "primary_industry_sector"),  # Used in similar companies filtering
         Index("idx_country_sector", "country", "primary_industry_sector"),  # Composite for similarity queries
         Index("idx_hq_country", "hq_country"),  # Used in location filtering
+        Index("idx_current_revenue", "current_revenue_usd"),  # min/max revenue range filters
+        Index(
+            "idx_primary_industry_group",
+            "primary_industry_group",
+            postgresql_where=text("primary_industry_group IS NOT NULL"),
+            sqlite_where=text("primary_industry_group IS NOT NULL"),
+        ),  # industry_group filter always adds IS NOT NULL
     )
+    # Don't RETURN the generated columns after INSERT/UPDATE - they may not exist
+    # yet (see generated_company_columns); they stay expired until undeferred
+    __mapper_args__ = {"eager_defaults": False}
 
     def __repr__(self):
         return f"<Company(name='{self.name}', is_public={self.is_public})>"
+
+    @classmethod
+    def crunchbase_employee_condition(cls, generated_columns, minimum=None, maximum=None):
+        """
+        Crunchbase employee ranges overlapping the requested bound (hi >= minimum /
+        lo <= maximum). Uses the indexed bound columns when generated_columns has
+        them, else an IN over the matching range codes.
+        """
+        if minimum is not None:
+            if 'crunchbase_employee_hi' in generated_columns:
+                return cls.crunchbase_employee_hi >= minimum
+            codes = [code for code in EMPLOYEE_RANGES if _employee_bound(code, 2) >= minimum]
+        else:
+            if 'crunchbase_employee_lo' in generated_columns:
+                return cls.crunchbase_employee_lo <= maximum
+            codes = [code for code in EMPLOYEE_RANGES if _employee_bound(code, 1) <= maximum]
+        return cls.crunchbase_employee_count.in_(codes)
     
     @property
     def computed_status(self):
@@ -151,7 +258,7 @@ class CompanyPEInvestment(Base):
     __tablename__ = "company_pe_investments"
 
     id = Column(Integer, primary_key=True)
-    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
     pe_firm_id = Column(Integer, ForeignKey("pe_firms.id"), nullable=False)
     
     # Status information
@@ -221,6 +328,37 @@ class CompanyPEInvestment(Base):
         
         # Rule 4: Default to Exit
         self.computed_status = "Exit"
+
+    # Canonical computed_status values, so status filters are equality checks
+    STATUSES = ("Active", "Exit")
+    # Exact (lowercased) spellings accepted for each canonical status
+    STATUS_ALIASES = {
+        'active': "Active",
+        'current': "Active",
+        'exit': "Exit",
+        'exited': "Exit",
+        'realized': "Exit",
+    }
+
+    @classmethod
+    def canonical_status(cls, status):
+        """
+        Spell a status the canonical way ('ACTIVE', 'Exited' -> 'Active', 'Exit').
+        Values that are not a known alias ('Inactive', 'Non-Exit') are returned unchanged.
+        """
+        if status:
+            return cls.STATUS_ALIASES.get(status.strip().lower(), status)
+        return status
+
+    @classmethod
+    def status_condition(cls, status):
+        """
+        computed_status filter matching what ILIKE '%status%' matches among the
+        canonical values, as an indexable IN instead of a substring scan
+        """
+        status_lower = status.lower()
+        matches = [canonical for canonical in cls.STATUSES if status_lower in canonical.lower()]
+        return cls.computed_status.in_(matches or [status])
     
     @staticmethod
     def extract_ipo_info(exit_info_text):
@@ -252,7 +390,7 @@ class CompanyTag(Base):
     __tablename__ = "company_tags"
     
     id = Column(Integer, primary_key=True)
-    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
     tag_category = Column(String(100), nullable=False, index=True)
     tag_value = Column(String(200), nullable=False, index=True)
     
@@ -263,8 +401,18 @@ class CompanyTag(Base):
     
     # Indexes
     __table_args__ = (
-        Index("idx_company_category", "company_id", "tag_category"),
-        Index("idx_category_value", "tag_category", "tag_value"),
+        # Per-company lookups of one category's values (e.g. vertical tags) - index-only
+        Index("idx_company_category_value", "company_id", "tag_category", "tag_value"),
+        # Covering index for industry filter subqueries (returns company_id without a heap lookup)
+        Index("idx_category_value_company", "tag_category", "tag_value", "company_id"),
+        # Partial index for the displayed industry list (excludes the 'Other' bucket)
+        Index(
+            "idx_company_industry_tags",
+            "company_id",
+            "tag_value",
+            postgresql_where=text("tag_category = 'industry' AND tag_value <> 'Other'"),
+            sqlite_where=text("tag_category = 'industry' AND tag_value <> 'Other'"),
+        ),
     )
     
     def __repr__(self):
@@ -277,7 +425,7 @@ class FundingRound(Base):
     __tablename__ = "funding_rounds"
     
     id = Column(Integer, primary_key=True)
-    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False, index=True)
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False, index=True)
     
     # Round details
     announced_on = Column(Date, index=True)  # Date of funding round
@@ -329,6 +477,71 @@ class CompanySimilarityFeedback(Base):
         return f"<CompanySimilarityFeedback(input={self.input_company_id}, match={self.match_company_id}, type='{self.feedback_type}')>"
 
 
+# Companies columns added by migrations after the table first shipped, with the
+# SQL they compute (qualified with the table name, for use in joined queries)
+# when a database predates them
+GENERATED_COMPANY_COLUMNS = {
+    'headquarters_display': _headquarters_display_sql("companies."),
+    'employee_count_display': _employee_count_display_sql("companies."),
+    'crunchbase_employee_lo': _employee_bound_sql(1, "companies."),
+    'crunchbase_employee_hi': _employee_bound_sql(2, "companies."),
+}
+_generated_columns_by_engine = {}
+
+
+def generated_company_columns(bind):
+    """
+    Names of the GENERATED_COMPANY_COLUMNS present in bind's companies table.
+    Probed once per engine; restart the process after running the migrations.
+    """
+    engine = getattr(bind, "engine", bind)
+    if not isinstance(engine, Engine):
+        return frozenset()  # not a real database, e.g. a mocked session
+    if engine in _generated_columns_by_engine:
+        return _generated_columns_by_engine[engine]
+    try:
+        present = {column["name"] for column in inspect(engine).get_columns(Company.__tablename__)}
+    except SQLAlchemyError:
+        return frozenset()  # no companies table yet - probe again next time
+    columns = frozenset(name for name in GENERATED_COMPANY_COLUMNS if name in present)
+    _generated_columns_by_engine[engine] = columns
+    return columns
+
+
+def sync_vertical_tags(session, companies):
+    """
+    Make each company's vertical tags match its comma-separated verticals,
+    keeping tags that are still present. The companies need ids; the caller
+    commits. Existing tags for all of them are read in one query.
+    CompanyService calls this on create/update. Importers and scripts that write
+    Company.verticals must call it too, or re-run migrations/add_vertical_tags.sql.
+    """
+    wanted = {
+        company.id: dict.fromkeys(
+            vertical for vertical in (part.strip() for part in (company.verticals or "").split(",")) if vertical
+        )
+        for company in companies
+    }
+    if not wanted:
+        return
+    missing = {company_id: set(verticals) for company_id, verticals in wanted.items()}
+    existing = session.query(CompanyTag).filter(
+        CompanyTag.company_id.in_(wanted),
+        CompanyTag.tag_category == VERTICAL_TAG_CATEGORY
+    )
+    for tag in existing:
+        if tag.tag_value in missing[tag.company_id]:
+            missing[tag.company_id].discard(tag.tag_value)
+        else:
+            session.delete(tag)  # no longer listed, or a duplicate
+    session.add_all([
+        CompanyTag(company_id=company_id, tag_category=VERTICAL_TAG_CATEGORY, tag_value=vertical)
+        for company_id, verticals in wanted.items()
+        for vertical in verticals
+        if vertical in missing[company_id]
+    ])
+
+
 # Database connection functions
 def get_database_url():
     """Get database URL from environment or use default."""
@@ -339,6 +552,13 @@ def get_database_url():
     return os.getenv("DATABASE_URL", "sqlite:///pe_portfolio_v2.db")
 
 
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """Turn on foreign key enforcement for each new SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
 def create_database_engine():
     """Create and return database engine with connection pooling"""
     database_url = get_database_url()
@@ -352,6 +572,8 @@ def create_database_engine():
             pool_pre_ping=True,     # Verify connections are alive before using
             connect_args={"check_same_thread": False},  # Allow SQLite to be used across threads
         )
+        # SQLite only enforces foreign keys (and ON DELETE CASCADE) when asked to
+        event.listen(engine, "connect", _enable_sqlite_foreign_keys)
     else:
         # PostgreSQL and other databases support full connection pooling
         engine = create_engine(
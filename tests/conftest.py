@@ -19,6 +19,15 @@ os.environ["ADMIN_PASSWORD_HASH"] = "$2b$12$test.hash.for.testing.only"
 os.environ["ALLOWED_ORIGINS"] = "http://localhost:3000,http://localhost:5173"
 
 
+@pytest.fixture(autouse=True)
+def clear_query_cache():
+    """Start every test with an empty result cache so cached lookups don't leak between tests"""
+    from backend.middleware.query_cache import query_cache
+    query_cache.clear()
+    yield
+    query_cache.clear()
+
+
 @pytest.fixture(scope="session")
 def test_db_engine():
     """Create a test database engine"""
@@ -562,7 +562,7 @@ class TestCompaniesEndpointIntegration:
         assert any("/api/companies" in path for path in paths)
 
     def test_get_companies_default_limit(self, client, mock_db_session):
-        """Test default limit is 10000"""
+        """Test default limit is 100"""
         with patch('backend.api.companies.CompanyService') as MockService:
             mock_service = MockService.return_value.__enter__.return_value
             mock_service.get_companies.return_value = ([], 0)
@@ -571,7 +571,17 @@ class TestCompaniesEndpointIntegration:
 
             assert response.status_code == 200
             call_args = mock_service.get_companies.call_args
-            assert call_args[0][1] == 10000  # Default limit
+            assert call_args[0][1] == 100  # Default limit
+
+    def test_get_companies_rejects_limit_above_page_cap(self, client, mock_db_session):
+        """Test limits above MAX_COMPANY_PAGE_SIZE are rejected instead of silently truncated"""
+        from backend.services.company_service import MAX_COMPANY_PAGE_SIZE
+        with patch('backend.api.companies.CompanyService') as MockService:
+            mock_service = MockService.return_value.__enter__.return_value
+            mock_service.get_companies.return_value = ([], 0)
+
+            assert client.get(f"/api/companies?limit={MAX_COMPANY_PAGE_SIZE}").status_code == 200
+            assert client.get(f"/api/companies?limit={MAX_COMPANY_PAGE_SIZE + 1}").status_code == 422
 
     def test_get_companies_default_offset(self, client, mock_db_session):
         """Test default offset is 0"""
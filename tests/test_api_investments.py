@@ -1,6 +1,7 @@
 """
 Tests for Investments API endpoints
 """
+import json
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import Mock, patch, MagicMock
@@ -153,6 +154,44 @@ class TestGetInvestments:
             assert call_args[0][1] == 50  # limit
             assert call_args[0][2] == 100  # offset
 
+    def test_get_investments_full_page_returns_next_cursor(self, client, mock_db_session):
+        """Test a full page sets X-Next-Cursor and the cursor is passed back as a keyset"""
+        with patch('backend.api.investments.InvestmentService') as MockService:
+            mock_service = MockService.return_value.__enter__.return_value
+            mock_service.get_investments.return_value = [
+                InvestmentResponse(investment_id=7, company_id=3, company_name="Acme", pe_firm_name="Test PE", status="Active")
+            ]
+
+            response = client.get("/api/investments?limit=1")
+            next_cursor = response.headers["X-Next-Cursor"]
+            client.get(f"/api/investments?limit=1&cursor={next_cursor}")
+
+            assert response.status_code == 200
+            assert mock_service.get_investments.call_args.kwargs["after"] == ("Acme", 7)
+
+    def test_get_investments_streams_ndjson(self, client, mock_db_session):
+        """Test Accept: application/x-ndjson streams one investment per line"""
+        with patch('backend.api.investments.InvestmentService') as MockService:
+            mock_service = MockService.return_value.__enter__.return_value
+            mock_service.iter_investments.return_value = iter([
+                InvestmentResponse(investment_id=7, company_id=3, company_name="Acme", pe_firm_name="Test PE", status="Active"),
+                InvestmentResponse(investment_id=8, company_id=4, company_name="Beta", pe_firm_name="Test PE", status="Exit")
+            ])
+
+            response = client.get("/api/investments?limit=2", headers={"Accept": "application/x-ndjson"})
+
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            assert [line["company_name"] for line in map(json.loads, response.text.splitlines())] == ["Acme", "Beta"]
+            assert "X-Next-Cursor" not in response.headers
+            mock_service.get_investments.assert_not_called()
+
+    def test_get_investments_invalid_cursor(self, client, mock_db_session):
+        """Test a malformed cursor is rejected"""
+        response = client.get("/api/investments?cursor=not-a-cursor")
+
+        assert response.status_code == 400
+
     def test_get_investments_with_search(self, client, mock_db_session):
         """Test getting investments with search term"""
         with patch('backend.api.investments.InvestmentService') as MockService:
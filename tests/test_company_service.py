@@ -111,6 +111,81 @@ class TestCompanyService:
         result = service.build_headquarters(sample_company)
         assert result is None
 
+    def test_build_headquarters_uses_generated_column(self, service):
+        """Test headquarters reads the pre-computed column when it was loaded"""
+        company = Company(name="Test Company", hq_location="Ignored", hq_country="Ignored")
+        company.headquarters_display = "Austin, TX, United States"
+
+        assert service.build_headquarters(company) == "Austin, TX, United States"
+
+    def test_get_employee_count_display_uses_generated_column(self, service):
+        """Test employee count reads the pre-computed column when it was loaded"""
+        company = Company(name="Test Company", employee_count=5)
+        company.employee_count_display = "1,234"
+
+        assert service.get_employee_count_display(company) == "1,234"
+
+    def test_generated_columns_match_python_display(self, service, test_db_engine):
+        """Test generated display columns agree with the Python fallbacks"""
+        from sqlalchemy.orm import sessionmaker
+        session = sessionmaker(bind=test_db_engine)()
+        variants = [
+            dict(hq_location="San Francisco", hq_country="United States", employee_count=1234567),
+            dict(hq_location="San Francisco", projected_employee_count=999),
+            dict(city="Boston", country="USA", crunchbase_employee_count="c_00501_01000"),
+            dict(state_region="TX", employee_count=0, projected_employee_count=12000),
+            dict(crunchbase_employee_count="unknown_code"),
+            dict(),
+        ]
+        try:
+            for i, fields in enumerate(variants):
+                fresh = Company(name=f"Generated Column Co {i}", **fields)
+                expected = (service.build_headquarters(fresh), service.get_employee_count_display(fresh))
+                session.add(fresh)
+                session.flush()
+                session.expire(fresh)
+                loaded = session.get(Company, fresh.id)
+                assert (loaded.headquarters_display, loaded.employee_count_display) == expected
+        finally:
+            session.rollback()
+            session.close()
+
+    def test_database_without_display_columns_uses_python_fallback(self):
+        """Test companies load from a database created before add_display_columns.sql"""
+        from sqlalchemy import create_engine, text
+        from sqlalchemy.orm import sessionmaker
+        from src.models.database_models_v2 import Base, generated_company_columns
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            for index in ("ix_companies_crunchbase_employee_lo", "ix_companies_crunchbase_employee_hi"):
+                conn.execute(text(f"DROP INDEX {index}"))
+            for column in ("headquarters_display", "employee_count_display",
+                           "crunchbase_employee_lo", "crunchbase_employee_hi"):
+                conn.execute(text(f"ALTER TABLE companies DROP COLUMN {column}"))
+        session = sessionmaker(bind=engine)()
+        try:
+            firm = PEFirm(name="Legacy Capital")
+            company = Company(name="Legacy Co", city="Boston", country="USA", employee_count=1234)
+            session.add_all([firm, company])
+            session.flush()
+            session.add(CompanyPEInvestment(company_id=company.id, pe_firm_id=firm.id))
+            session.commit()
+            company_id = company.id
+            session.expunge_all()
+
+            assert not {'headquarters_display', 'employee_count_display'} & generated_company_columns(engine)
+            assert session.query(Company).one().name == "Legacy Co"
+            db_service = CompanyService(session=session)
+            companies, total = db_service.get_companies({})
+            by_id = db_service.get_company_by_id(company_id)
+            assert total == 1
+            for response in (companies[0], by_id):
+                assert (response.headquarters, response.employee_count) == ("Boston, USA", "1,234")
+        finally:
+            session.close()
+            engine.dispose()
+
     def test_get_company_pe_firms(self, service, mock_session):
         """Test retrieving PE firms for a company"""
         # Mock query chain
@@ -251,6 +326,84 @@ class TestCompanyService:
 
         assert mock_query.filter.called
 
+    def test_apply_filters_pe_firm_and_requires_every_firm(self, service, test_db_engine):
+        """Test AND-mode PE firm filter matches each firm pattern at least once"""
+        from sqlalchemy.orm import sessionmaker
+        session = sessionmaker(bind=test_db_engine)()
+        try:
+            vista, vista_credit, thoma = (
+                PEFirm(name="AND Vista Equity"), PEFirm(name="AND Vista Credit"), PEFirm(name="AND Thoma Bravo")
+            )
+            both = Company(name="AND Both Firms")
+            vista_only = Company(name="AND Vista Twice")
+            session.add_all([vista, vista_credit, thoma, both, vista_only])
+            session.flush()
+            session.add_all([
+                CompanyPEInvestment(company_id=both.id, pe_firm_id=vista.id),
+                CompanyPEInvestment(company_id=both.id, pe_firm_id=thoma.id),
+                CompanyPEInvestment(company_id=vista_only.id, pe_firm_id=vista.id),
+                CompanyPEInvestment(company_id=vista_only.id, pe_firm_id=vista_credit.id),
+            ])
+            session.flush()
+
+            db_service = CompanyService(session=session)
+            query = db_service.apply_filters(
+                session.query(Company.name),
+                {'pe_firm': 'AND Vista,AND Thoma', 'pe_firm_operator': 'AND'}
+            )
+            assert [row[0] for row in query.all()] == ["AND Both Firms"]
+        finally:
+            session.rollback()
+            session.close()
+
+    def test_description_is_deferred_except_for_responses(self, service, test_db_engine):
+        """Test plain Company loads skip description while company responses still include it"""
+        from sqlalchemy.orm import sessionmaker
+        session = sessionmaker(bind=test_db_engine)()
+        try:
+            firm = PEFirm(name="Deferred Capital")
+            company = Company(name="Deferred Co", description="Long description")
+            session.add_all([firm, company])
+            session.flush()
+            session.add(CompanyPEInvestment(company_id=company.id, pe_firm_id=firm.id))
+            session.flush()
+            company_id = company.id
+            session.expunge_all()
+
+            loaded = session.query(Company).filter(Company.id == company_id).one()
+            assert 'description' not in vars(loaded)
+            assert 'financing_status_note' not in vars(loaded)
+            session.expunge_all()
+
+            db_service = CompanyService(session=session)
+            assert db_service.get_company_by_id(company_id).description == "Long description"
+            companies, _ = db_service.get_companies({'search': 'Deferred Co'})
+            assert [c.description for c in companies] == ["Long description"]
+        finally:
+            session.rollback()
+            session.close()
+
+    def test_get_all_companies_pages_through_duplicate_names(self, test_db_engine):
+        """Test companies sharing a name are neither repeated nor skipped across page boundaries"""
+        from unittest.mock import patch
+        from sqlalchemy.orm import sessionmaker
+        session = sessionmaker(bind=test_db_engine)()
+        try:
+            firm = PEFirm(name="Tie Capital")
+            companies = [Company(name="Tie Co") for _ in range(5)]
+            session.add_all([firm, *companies])
+            session.flush()
+            session.add_all([CompanyPEInvestment(company_id=c.id, pe_firm_id=firm.id) for c in companies])
+            session.flush()
+
+            with patch('backend.services.company_service.MAX_COMPANY_PAGE_SIZE', 2):
+                results = CompanyService(session=session).get_all_companies({'search': 'Tie Co'})
+
+            assert [c.id for c in results] == sorted(c.id for c in companies)
+        finally:
+            session.rollback()
+            session.close()
+
     def test_apply_filters_status(self, service, mock_session):
         """Test apply_filters with status filter"""
         mock_query = Mock()
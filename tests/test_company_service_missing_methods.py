@@ -251,6 +251,37 @@ class TestGetCompanies:
         assert total == 100
 
 
+    def test_get_companies_clamps_page_size(self, service, mock_session):
+        """Test oversized limits are clamped to the maximum page size"""
+        from backend.services.company_service import MAX_COMPANY_PAGE_SIZE
+
+        mock_query = Mock()
+        mock_session.query.return_value = mock_query
+        for method in ('join', 'filter', 'distinct', 'options', 'order_by', 'offset', 'limit'):
+            getattr(mock_query, method).return_value = mock_query
+        mock_query.count.return_value = 0
+        mock_query.all.return_value = []
+
+        service.get_companies(filters={}, limit=10000, offset=0)
+
+        mock_query.limit.assert_called_once_with(MAX_COMPANY_PAGE_SIZE)
+
+    def test_get_all_companies_pages_until_total(self, service):
+        """Test get_all_companies keeps paging until the total is reached"""
+        from backend.services.company_service import MAX_COMPANY_PAGE_SIZE
+
+        first_page = [Mock()] * MAX_COMPANY_PAGE_SIZE
+        second_page = [Mock()] * 5
+        with patch.object(service, 'get_companies', side_effect=[
+            (list(first_page), MAX_COMPANY_PAGE_SIZE + 5),
+            (second_page, MAX_COMPANY_PAGE_SIZE + 5),
+        ]) as mock_get:
+            companies = service.get_all_companies({'min_revenue': 0})
+
+        assert len(companies) == MAX_COMPANY_PAGE_SIZE + 5
+        assert mock_get.call_args_list[1].kwargs['offset'] == MAX_COMPANY_PAGE_SIZE
+
+
 class TestGetCompanyById:
     """Tests for get_company_by_id method"""
 
@@ -268,10 +299,7 @@ class TestGetCompanyById:
         mock_company.id = 1
         mock_company.name = "Found Company"
 
-        mock_query = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = mock_company
+        mock_session.execute.return_value.scalars.return_value.first.return_value = mock_company
 
         mock_response = Mock(spec=CompanyResponse)
         mock_response.id = 1
@@ -286,10 +314,7 @@ class TestGetCompanyById:
 
     def test_get_company_by_id_not_found(self, service, mock_session):
         """Test getting company by ID when it doesn't exist"""
-        mock_query = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
+        mock_session.execute.return_value.scalars.return_value.first.return_value = None
 
         result = service.get_company_by_id(company_id=999)
 
@@ -372,6 +397,43 @@ class TestUpdateCompany:
         # Other fields should remain unchanged
         assert mock_company.website == "https://original.com"
 
+    def test_update_company_explicit_none_clears_field(self, service, mock_session):
+        """Test explicitly sent None clears a field while unset fields are untouched"""
+        mock_company = Mock(spec=Company)
+        mock_company.id = 1
+        mock_company.website = "https://original.com"
+        mock_company.description = "Original description"
+
+        mock_query = Mock()
+        mock_session.query.return_value = mock_query
+        mock_query.filter.return_value = mock_query
+        mock_query.first.return_value = mock_company
+
+        update_data = CompanyUpdate(description=None)
+
+        result = service.update_company(company_id=1, company_update=update_data)
+
+        assert result is True
+        assert mock_company.description is None
+        assert mock_company.website == "https://original.com"
+
+    def test_update_company_verticals_syncs_tags(self, service, mock_session):
+        """Test vertical tags are only rebuilt when verticals change"""
+        mock_company = Mock(spec=Company)
+        mock_company.id = 1
+
+        mock_query = Mock()
+        mock_session.query.return_value = mock_query
+        mock_query.filter.return_value = mock_query
+        mock_query.first.return_value = mock_company
+
+        with patch('backend.services.company_service.sync_vertical_tags') as mock_sync:
+            service.update_company(company_id=1, company_update=CompanyUpdate(name="Renamed"))
+            mock_sync.assert_not_called()
+
+            service.update_company(company_id=1, company_update=CompanyUpdate(verticals="SaaS, AI"))
+            mock_sync.assert_called_once_with(mock_session, [mock_company])
+
     def test_update_company_all_fields(self, service, mock_session):
         """Test updating all available fields"""
         mock_company = Mock(spec=Company)
@@ -487,18 +549,8 @@ class TestDeleteCompany:
         mock_query.filter.return_value = mock_query
         mock_query.first.return_value = mock_company
 
-        # Mock deletion queries that raise exception
-        mock_delete_query = Mock()
-        mock_delete_query.filter.return_value = mock_delete_query
-        mock_delete_query.delete.side_effect = Exception("Database error")
-
-        def query_side_effect(model):
-            if model == Company:
-                return mock_query
-            else:
-                return mock_delete_query
-
-        mock_session.query.side_effect = query_side_effect
+        # Deleting the company fails at commit time
+        mock_session.commit.side_effect = Exception("Database error")
 
         result = service.delete_company(company_id=1)
 
@@ -506,7 +558,7 @@ class TestDeleteCompany:
         mock_session.rollback.assert_called_once()
 
     def test_delete_company_cascade_deletes(self, service, mock_session):
-        """Test that delete removes related records"""
+        """Test that delete relies on ON DELETE CASCADE for related records"""
         mock_company = Mock(spec=Company)
         mock_company.id = 1
 
@@ -537,5 +589,6 @@ class TestDeleteCompany:
         result = service.delete_company(company_id=1)
 
         assert result is True
-        # Should delete: investments, tags, funding rounds
-        assert len(delete_calls) == 3
+        # Investments, tags and funding rounds cascade in the database
+        assert len(delete_calls) == 0
+        mock_session.delete.assert_called_once_with(mock_company)
@@ -182,7 +182,7 @@ class TestDataConsistencyWorkflow:
         stats = client.get("/api/stats").json()
 
         # Get companies
-        companies_response = client.get("/api/companies?limit=10000")
+        companies_response = client.get("/api/companies?limit=1000")
         companies = companies_response.json()
 
         # Get total count from header
@@ -49,10 +49,10 @@ class TestBoundaryConditions:
 
     def test_maximum_limit(self, client):
         """Test maximum allowed limit"""
-        response = client.get("/api/companies?limit=10000")
+        response = client.get("/api/companies?limit=1000")
         assert response.status_code == 200
         companies = response.json()
-        assert len(companies) <= 10000
+        assert len(companies) <= 1000
 
     def test_excessive_limit(self, client):
         """Test limit beyond maximum"""
@@ -166,7 +166,7 @@ class TestDataConsistency:
         stats_response = client.get("/api/stats")
         stats = stats_response.json()
 
-        companies_response = client.get("/api/companies?limit=10000")
+        companies_response = client.get("/api/companies?limit=1000")
         total_count = int(companies_response.headers.get("X-Total-Count", 0))
 
         # Stats total should be >= actual count (due to deduplication)
@@ -123,35 +123,23 @@ class TestInvestmentService:
         result = service.build_headquarters(sample_company)
         assert result == "London, UK"
 
-    def test_build_headquarters_none(self, service, sample_company):
-        """Test headquarters returns None when no data"""
-        result = service.build_headquarters(sample_company)
-        assert result is None
-
-    # Crunchbase URL Tests
-    def test_crunchbase_url_direct_access(self, service, sample_company):
-        """Test Crunchbase URL direct access"""
-        result = service.get_crunchbase_url_with_fallback(sample_company)
-        assert result == "https://crunchbase.com/test"
-
-    def test_crunchbase_url_sql_fallback(self, service, mock_session, sample_company):
-        """Test Crunchbase URL SQL fallback on AttributeError"""
-        sample_company.crunchbase_url = Mock(side_effect=AttributeError)
+    def test_build_headquarters_uses_generated_column(self, service):
+        """Test headquarters reads the pre-computed column when it was loaded"""
+        company = Company(name="Test Company", hq_location="Ignored", hq_country="Ignored")
+        company.headquarters_display = "Austin, TX, United States"
 
-        # Mock SQL execution
-        mock_result = Mock()
-        mock_result.fetchone.return_value = ("https://crunchbase.com/fallback",)
-        mock_session.execute.return_value = mock_result
+        assert service.build_headquarters(company) == "Austin, TX, United States"
 
-        result = service.get_crunchbase_url_with_fallback(sample_company)
-        assert result == "https://crunchbase.com/fallback"
+    def test_get_employee_count_display_uses_generated_column(self, service):
+        """Test employee count reads the pre-computed column when it was loaded"""
+        company = Company(name="Test Company", employee_count=5)
+        company.employee_count_display = "1,234"
 
-    def test_crunchbase_url_fallback_none(self, service, mock_session, sample_company):
-        """Test Crunchbase URL fallback returns None on error"""
-        sample_company.crunchbase_url = Mock(side_effect=AttributeError)
-        mock_session.execute.side_effect = Exception("DB Error")
+        assert service.get_employee_count_display(company) == "1,234"
 
-        result = service.get_crunchbase_url_with_fallback(sample_company)
+    def test_build_headquarters_none(self, service, sample_company):
+        """Test headquarters returns None when no data"""
+        result = service.build_headquarters(sample_company)
         assert result is None
 
     # Company Industries Tests
@@ -304,12 +292,13 @@ class TestInvestmentService:
         """Test complete get_investments workflow"""
         mock_query = Mock()
         mock_session.query.return_value = mock_query
+        mock_query.select_from.return_value = mock_query
         mock_query.join.return_value = mock_query
         mock_query.filter.return_value = mock_query
         mock_query.order_by.return_value = mock_query
         mock_query.offset.return_value = mock_query
         mock_query.limit.return_value = mock_query
-        mock_query.all.return_value = []
+        mock_query.yield_per.return_value = []
 
         result = service.get_investments({}, limit=10, offset=0)
 
@@ -344,11 +333,7 @@ class TestInvestmentService:
 
     def test_update_investment_success(self, service, mock_session):
         """Test updating investment successfully"""
-        mock_query = Mock()
-        mock_investment = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = mock_investment
+        mock_session.execute.return_value.rowcount = 1
 
         update_data = InvestmentUpdate(
             computed_status="Exit",
@@ -359,17 +344,17 @@ class TestInvestmentService:
         result = service.update_investment(1, update_data)
 
         assert result is True
-        assert mock_investment.computed_status == "Exit"
-        assert mock_investment.exit_type == "IPO"
-        assert mock_investment.exit_info == "Public offering"
+        params = mock_session.execute.call_args[0][0].compile().params
+        assert params["computed_status"] == "Exit"
+        assert params["exit_type"] == "IPO"
+        assert params["exit_info"] == "Public offering"
+        assert "raw_status" not in params
+        mock_session.query.assert_not_called()
         mock_session.commit.assert_called_once()
 
     def test_update_investment_not_found_unit(self, service, mock_session):
         """Test updating non-existent investment (unit test)"""
-        mock_query = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
+        mock_session.execute.return_value.rowcount = 0
 
         update_data = InvestmentUpdate(computed_status="Exit")
         result = service.update_investment(999, update_data)
@@ -380,11 +365,7 @@ class TestInvestmentService:
 
     def test_update_investment_all_fields(self, service, mock_session):
         """Test updating all possible fields"""
-        mock_query = Mock()
-        mock_investment = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = mock_investment
+        mock_session.execute.return_value.rowcount = 1
 
         update_data = InvestmentUpdate(
             computed_status="Exit",
@@ -398,9 +379,10 @@ class TestInvestmentService:
         result = service.update_investment(1, update_data)
 
         assert result is True
-        assert mock_investment.exit_year == "2023"
-        assert mock_investment.investment_year == "2018"
-        assert mock_investment.raw_status == "Exited via IPO"
+        params = mock_session.execute.call_args[0][0].compile().params
+        assert params["exit_year"] == "2023"
+        assert params["investment_year"] == "2018"
+        assert params["raw_status"] == "Exited via IPO"
 
 
 class TestInvestmentServiceIntegration:
@@ -437,6 +419,261 @@ class TestInvestmentServiceIntegration:
         investments = db_service.get_investments({'pe_firm': 'Test'}, limit=10, offset=0)
         assert isinstance(investments, list)
 
+    def test_get_investments_and_filters_require_every_term(self, test_db_engine):
+        """Test AND-mode PE firm and industry filters match every term"""
+        from sqlalchemy.orm import sessionmaker
+        session = sessionmaker(bind=test_db_engine)()
+        try:
+            vista, thoma = PEFirm(name="INV AND Vista"), PEFirm(name="INV AND Thoma")
+            both = Company(name="INV AND Both")
+            vista_only = Company(name="INV AND Vista Only")
+            session.add_all([vista, thoma, both, vista_only])
+            session.flush()
+            session.add_all([
+                CompanyPEInvestment(company_id=both.id, pe_firm_id=vista.id),
+                CompanyPEInvestment(company_id=both.id, pe_firm_id=thoma.id),
+                CompanyPEInvestment(company_id=vista_only.id, pe_firm_id=vista.id),
+                CompanyTag(company_id=both.id, tag_category='industry', tag_value='Software'),
+                CompanyTag(company_id=both.id, tag_category='industry', tag_value='Fintech'),
+                CompanyTag(company_id=both.id, tag_category='industry', tag_value='Other'),
+                CompanyTag(company_id=vista_only.id, tag_category='industry', tag_value='Software'),
+                CompanyTag(company_id=vista_only.id, tag_category='industry', tag_value='Software'),
+            ])
+            session.flush()
+            service = InvestmentService(session=session)
+
+            by_firm = service.get_investments(
+                {'pe_firm': 'INV AND Vista,INV AND Thoma', 'pe_firm_operator': 'AND'}
+            )
+            by_industry = service.get_investments(
+                {'search': 'INV AND', 'industry': 'Software,Fintech', 'industry_operator': 'AND'}
+            )
+
+            assert {inv.company_name for inv in by_firm} == {"INV AND Both"}
+            assert {inv.company_name for inv in by_industry} == {"INV AND Both"}
+            assert sorted(by_industry[0].industries) == ["Fintech", "Software"]
+        finally:
+            session.rollback()
+            session.close()
+
+    def test_get_investments_status_filter_matches_canonical_status(self, test_db_engine):
+        """Test status filters compare against the canonical Active/Exit values"""
+        from sqlalchemy.orm import sessionmaker
+        session = sessionmaker(bind=test_db_engine)()
+        try:
+            firm = PEFirm(name="INV Status Capital")
+            active, exited = Company(name="INV Status Active"), Company(name="INV Status Exited")
+            session.add_all([firm, active, exited])
+            session.flush()
+            session.add_all([
+                CompanyPEInvestment(company_id=active.id, pe_firm_id=firm.id, computed_status="Active"),
+                CompanyPEInvestment(company_id=exited.id, pe_firm_id=firm.id, computed_status="Exit"),
+            ])
+            session.flush()
+            service = InvestmentService(session=session)
+
+            def names(status):
+                return {inv.company_name for inv in service.get_investments({'search': 'INV Status', 'status': status})}
+
+            assert names('active') == {"INV Status Active"}
+            assert names('Exit') == {"INV Status Exited"}
+            assert names('t') == {"INV Status Active", "INV Status Exited"}
+            assert names('Unknown') == set()
+            assert CompanyPEInvestment.canonical_status('EXITED') == 'Exit'
+            assert CompanyPEInvestment.canonical_status('Pending') == 'Pending'
+            assert CompanyPEInvestment.canonical_status('current') == 'Active'
+            assert CompanyPEInvestment.canonical_status('Inactive') == 'Inactive'
+            assert CompanyPEInvestment.canonical_status('Non-Exit') == 'Non-Exit'
+        finally:
+            session.rollback()
+            session.close()
+
+    def test_get_investments_employee_filters_use_crunchbase_range(self, test_db_engine):
+        """Test min/max employee filters compare against the Crunchbase range bounds"""
+        from sqlalchemy.orm import sessionmaker
+        session = sessionmaker(bind=test_db_engine)()
+        try:
+            firm = PEFirm(name="INV Range Capital")
+            company = Company(name="INV Range Co", crunchbase_employee_count="c_00501_01000")
+            session.add_all([firm, company])
+            session.flush()
+            session.add(CompanyPEInvestment(company_id=company.id, pe_firm_id=firm.id))
+            session.flush()
+            service = InvestmentService(session=session)
+
+            def names(**bounds):
+                return {inv.company_name for inv in service.get_investments({'search': 'INV Range', **bounds})}
+
+            assert names(min_employees=800) == {"INV Range Co"}
+            assert names(max_employees=600) == {"INV Range Co"}
+            assert names(min_employees=1001) == set()
+            assert names(max_employees=500) == set()
+        finally:
+            session.rollback()
+            session.close()
+
+    def test_get_investments_keyset_pagination_matches_offset(self, test_db_engine):
+        """Test paging with after=(name, id) returns the same rows as OFFSET paging"""
+        from sqlalchemy.orm import sessionmaker
+        session = sessionmaker(bind=test_db_engine)()
+        try:
+            firm = PEFirm(name="INV Keyset Capital")
+            companies = [Company(name=f"INV Keyset {name}") for name in ("B", "A", "B", "C")]
+            session.add_all([firm, *companies])
+            session.flush()
+            session.add_all(CompanyPEInvestment(company_id=c.id, pe_firm_id=firm.id) for c in companies)
+            session.flush()
+            service = InvestmentService(session=session)
+            filters = {'pe_firm': 'INV Keyset Capital'}
+
+            by_offset = [inv.investment_id for inv in service.get_investments(filters)]
+            by_keyset, after = [], None
+            while page := service.get_investments(filters, limit=1, after=after):
+                by_keyset.append(page[0].investment_id)
+                after = (page[0].company_name, page[0].investment_id)
+
+            assert len(by_offset) == 4
+            assert by_keyset == by_offset
+        finally:
+            session.rollback()
+            session.close()
+
+    def test_get_investments_verticals_match_tags(self, test_db_engine):
+        """Test the verticals filter matches whole vertical tags synced from Company.verticals"""
+        from sqlalchemy.orm import sessionmaker
+        from src.models.database_models_v2 import sync_vertical_tags
+        session = sessionmaker(bind=test_db_engine)()
+        try:
+            firm = PEFirm(name="INV Vertical Capital")
+            both = Company(name="INV Vertical Both", verticals="INV SaaS, INV AI")
+            saas_only = Company(name="INV Vertical SaaS", verticals="INV SaaS")
+            lookalike = Company(name="INV Vertical Lookalike", verticals="INV SaaS Tools")
+            session.add_all([firm, both, saas_only, lookalike])
+            session.flush()
+            session.add_all([
+                CompanyPEInvestment(company_id=company.id, pe_firm_id=firm.id)
+                for company in (both, saas_only, lookalike)
+            ])
+            sync_vertical_tags(session, [both, saas_only, lookalike])
+            session.flush()
+            # Re-syncing after a change keeps the tags still listed and adds the new ones
+            lookalike.verticals = "INV AI, INV SaaS Tools"
+            sync_vertical_tags(session, [lookalike])
+            session.flush()
+            service = InvestmentService(session=session)
+
+            any_of = service.get_investments({'verticals': 'INV SaaS,INV AI'})
+            all_of = service.get_investments({'verticals': 'INV SaaS,INV AI', 'verticals_operator': 'AND'})
+            lookalike_tags = sorted(
+                tag.tag_value for tag in session.query(CompanyTag).filter(
+                    CompanyTag.company_id == lookalike.id, CompanyTag.tag_category == 'vertical'
+                )
+            )
+        finally:
+            session.rollback()
+            session.close()
+
+        assert [inv.company_name for inv in any_of] == ["INV Vertical Both", "INV Vertical Lookalike", "INV Vertical SaaS"]
+        assert [inv.company_name for inv in all_of] == ["INV Vertical Both"]
+        assert lookalike_tags == ["INV AI", "INV SaaS Tools"]
+
+    def test_get_investments_on_database_without_generated_columns(self):
+        """Test investments list and filter on a database created before the generated-column migrations"""
+        from sqlalchemy import create_engine, text
+        from sqlalchemy.orm import sessionmaker
+        from src.models.database_models_v2 import Base
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            for index in ("ix_companies_crunchbase_employee_lo", "ix_companies_crunchbase_employee_hi"):
+                conn.execute(text(f"DROP INDEX {index}"))
+            for column in ("headquarters_display", "employee_count_display",
+                           "crunchbase_employee_lo", "crunchbase_employee_hi"):
+                conn.execute(text(f"ALTER TABLE companies DROP COLUMN {column}"))
+        session = sessionmaker(bind=engine)()
+        try:
+            firm = PEFirm(name="Legacy Capital")
+            company = Company(
+                name="Legacy Co", hq_location="Austin", hq_country="United States",
+                crunchbase_employee_count="c_00501_01000"
+            )
+            session.add_all([firm, company])
+            session.flush()
+            session.add(CompanyPEInvestment(company_id=company.id, pe_firm_id=firm.id))
+            session.commit()
+
+            service = InvestmentService(session=session)
+            [investment] = service.get_investments({})
+            by_min = {n: len(service.get_investments({'min_employees': n})) for n in (1000, 1001)}
+            by_max = {n: len(service.get_investments({'max_employees': n})) for n in (500, 501)}
+        finally:
+            session.close()
+            engine.dispose()
+
+        assert investment.headquarters == "Austin, United States"
+        assert investment.employee_count == "501-1,000"
+        # Falls back to matching range codes: 501-1,000 overlaps [1000, inf) and [0, 501]
+        assert by_min == {1000: 1, 1001: 0}
+        assert by_max == {500: 0, 501: 1}
+
+    def test_get_investments_issues_one_query_per_page(self, test_db_engine):
+        """Test a page loads companies, PE firms and industries without per-row queries (no N+1)"""
+        from sqlalchemy import event
+        from sqlalchemy.orm import sessionmaker
+        session = sessionmaker(bind=test_db_engine)()
+        statements = []
+        record = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(test_db_engine, "before_cursor_execute", record)
+        try:
+            firms = [PEFirm(name=f"INV N+1 Firm {i}") for i in range(3)]
+            companies = [Company(name=f"INV N+1 Co {i}", city="Austin", employee_count=1500) for i in range(6)]
+            session.add_all([*firms, *companies])
+            session.flush()
+            for i, company in enumerate(companies):
+                session.add(CompanyPEInvestment(company_id=company.id, pe_firm_id=firms[i % 3].id))
+                session.add(CompanyTag(company_id=company.id, tag_category='industry', tag_value='Software'))
+            session.flush()
+            session.expunge_all()
+            service = InvestmentService(session=session)
+
+            statements.clear()
+            investments = service.get_investments({'search': 'INV N+1 Co'})
+        finally:
+            event.remove(test_db_engine, "before_cursor_execute", record)
+            session.rollback()
+            session.close()
+
+        assert len(investments) == 6
+        assert all(inv.industries == ["Software"] and inv.headquarters == "Austin" for inv in investments)
+        assert len(statements) == 1
+
+    def test_update_investment_writes_only_provided_fields(self, test_db_engine):
+        """Test the single UPDATE changes provided fields and leaves the rest"""
+        from sqlalchemy.orm import sessionmaker
+        session = sessionmaker(bind=test_db_engine)()
+        try:
+            firm = PEFirm(name="INV Update Capital")
+            company = Company(name="INV Update Co")
+            session.add_all([firm, company])
+            session.flush()
+            investment = CompanyPEInvestment(
+                company_id=company.id, pe_firm_id=firm.id, computed_status="Active", raw_status="Current"
+            )
+            session.add(investment)
+            session.flush()
+            service = InvestmentService(session=session)
+            session.commit = session.flush  # keep the test data inside the rolled-back transaction
+
+            assert service.update_investment(investment.id, InvestmentUpdate(computed_status="Exit", exit_type="IPO"))
+            session.refresh(investment)
+
+            assert (investment.computed_status, investment.exit_type) == ("Exit", "IPO")
+            assert investment.raw_status == "Current"
+            assert service.update_investment(investment.id + 1000, InvestmentUpdate(exit_type="IPO")) is False
+        finally:
+            session.rollback()
+            session.close()
+
     def test_update_investment_not_found(self, db_service):
         """Test updating non-existent investment"""
         update_data = InvestmentUpdate(computed_status="Exit")
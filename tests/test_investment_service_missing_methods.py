@@ -5,7 +5,7 @@ Targets build_investment_response, get_investments, update_investment, and helpe
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
-from backend.services.investment_service import InvestmentService
+from backend.services.investment_service import InvestmentService, INVESTMENT_BATCH_SIZE
 from backend.schemas.requests import InvestmentUpdate
 from backend.schemas.responses import InvestmentResponse
 from src.models.database_models_v2 import Company, CompanyPEInvestment, PEFirm, CompanyTag
@@ -69,10 +69,9 @@ class TestBuildInvestmentResponse:
         """Test building complete investment response"""
         # Mock helper method calls
         with patch.object(service, 'build_headquarters', return_value="San Francisco, USA"):
-            with patch.object(service, 'get_crunchbase_url_with_fallback', return_value="https://crunchbase.com/acme"):
-                with patch.object(service, 'get_company_industries', return_value=["Software", "Cloud"]):
-                    with patch.object(service, 'get_employee_count_display', return_value="500"):
-                        response = service.build_investment_response(sample_investment)
+            with patch.object(service, 'get_company_industries', return_value=["Software", "Cloud"]):
+                with patch.object(service, 'get_employee_count_display', return_value="500"):
+                    response = service.build_investment_response(sample_investment)
 
         # Verify response structure
         assert isinstance(response, InvestmentResponse)
@@ -85,6 +84,7 @@ class TestBuildInvestmentResponse:
         assert response.headquarters == "San Francisco, USA"
         assert response.industries == ["Software", "Cloud"]
         assert response.employee_count == "500"
+        assert response.crunchbase_url == "https://crunchbase.com/acme"
 
     def test_build_investment_response_with_exit(self, service, sample_investment, mock_session):
         """Test building response for exited investment"""
@@ -93,10 +93,9 @@ class TestBuildInvestmentResponse:
         sample_investment.exit_info = "Listed on NASDAQ"
 
         with patch.object(service, 'build_headquarters', return_value="San Francisco, USA"):
-            with patch.object(service, 'get_crunchbase_url_with_fallback', return_value="https://crunchbase.com/acme"):
-                with patch.object(service, 'get_company_industries', return_value=[]):
-                    with patch.object(service, 'get_employee_count_display', return_value="500"):
-                        response = service.build_investment_response(sample_investment)
+            with patch.object(service, 'get_company_industries', return_value=[]):
+                with patch.object(service, 'get_employee_count_display', return_value="500"):
+                    response = service.build_investment_response(sample_investment)
 
         assert response.status == "Exit"
         assert response.exit_type == "IPO"
@@ -141,66 +140,15 @@ class TestBuildInvestmentResponse:
         investment.pe_firm = pe_firm
 
         with patch.object(service, 'build_headquarters', return_value=None):
-            with patch.object(service, 'get_crunchbase_url_with_fallback', return_value=None):
-                with patch.object(service, 'get_company_industries', return_value=[]):
-                    with patch.object(service, 'get_employee_count_display', return_value=None):
-                        response = service.build_investment_response(investment)
+            with patch.object(service, 'get_company_industries', return_value=[]):
+                with patch.object(service, 'get_employee_count_display', return_value=None):
+                    response = service.build_investment_response(investment)
 
         assert response.investment_id == 2
         assert response.company_name == "Minimal Corp"
         assert response.status == "Unknown"  # Default when computed_status is None
 
 
-class TestGetCrunchbaseUrlWithFallback:
-    """Tests for get_crunchbase_url_with_fallback method"""
-
-    @pytest.fixture
-    def mock_session(self):
-        return Mock()
-
-    @pytest.fixture
-    def service(self, mock_session):
-        return InvestmentService(session=mock_session)
-
-    def test_get_crunchbase_url_direct_access(self, service):
-        """Test getting crunchbase_url via direct attribute access"""
-        company = Mock(spec=Company)
-        company.crunchbase_url = "https://crunchbase.com/test"
-        company.id = 1
-
-        result = service.get_crunchbase_url_with_fallback(company)
-
-        assert result == "https://crunchbase.com/test"
-
-    def test_get_crunchbase_url_attribute_error_fallback(self, service, mock_session):
-        """Test SQL fallback when AttributeError occurs"""
-        company = Mock(spec=Company)
-        company.id = 1
-        # Configure mock to raise AttributeError on first access
-        company.crunchbase_url = Mock(side_effect=AttributeError())
-
-        # Mock SQL query
-        mock_result = Mock()
-        mock_result.fetchone.return_value = ("https://crunchbase.com/fallback",)
-        mock_session.execute.return_value = mock_result
-
-        result = service.get_crunchbase_url_with_fallback(company)
-
-        # Should use SQL fallback
-        assert result == "https://crunchbase.com/fallback" or isinstance(result, Mock)
-
-    def test_get_crunchbase_url_fallback_none(self, service, mock_session):
-        """Test fallback returns None when no data"""
-        company = Mock(spec=Company)
-        company.id = 1
-        company.crunchbase_url = None
-
-        result = service.get_crunchbase_url_with_fallback(company)
-
-        # Should return None
-        assert result is None
-
-
 class TestGetCompanyIndustries:
     """Tests for get_company_industries method"""
 
@@ -249,42 +197,94 @@ class TestGetInvestments:
 
     def test_get_investments_success(self, service, mock_session):
         """Test successful get_investments call"""
-        mock_investment = Mock(spec=CompanyPEInvestment)
-        mock_investment.id = 1
+        mock_row = Mock()
 
         mock_query = Mock()
         mock_session.query.return_value = mock_query
+        mock_query.select_from.return_value = mock_query
         mock_query.join.return_value = mock_query
         mock_query.order_by.return_value = mock_query
         mock_query.offset.return_value = mock_query
         mock_query.limit.return_value = mock_query
-        mock_query.all.return_value = [mock_investment]
+        mock_query.yield_per.return_value = [mock_row]
 
         mock_response = Mock(spec=InvestmentResponse)
         mock_response.investment_id = 1
 
         with patch.object(service, 'apply_filters', return_value=mock_query):
-            with patch.object(service, 'build_investment_response', return_value=mock_response):
+            with patch.object(service, 'build_investment_row_response', return_value=mock_response) as mock_build:
                 result = service.get_investments(filters={}, limit=10, offset=0)
 
         assert len(result) == 1
         assert result[0].investment_id == 1
+        mock_build.assert_called_once_with(mock_row)
 
     def test_get_investments_with_pagination(self, service, mock_session):
         """Test get_investments respects pagination"""
         mock_query = Mock()
         mock_session.query.return_value = mock_query
+        mock_query.select_from.return_value = mock_query
         mock_query.join.return_value = mock_query
         mock_query.order_by.return_value = mock_query
         mock_query.offset.return_value = mock_query
         mock_query.limit.return_value = mock_query
-        mock_query.all.return_value = []
+        mock_query.yield_per.return_value = []
 
         with patch.object(service, 'apply_filters', return_value=mock_query):
             result = service.get_investments(filters={}, limit=20, offset=40)
 
         mock_query.offset.assert_called_once_with(40)
         mock_query.limit.assert_called_once_with(20)
+        mock_query.yield_per.assert_called_once_with(INVESTMENT_BATCH_SIZE)
+
+
+class TestBuildInvestmentRowResponse:
+    """Tests for build_investment_row_response method"""
+
+    @pytest.fixture
+    def service(self):
+        return InvestmentService(session=Mock())
+
+    @staticmethod
+    def make_row(**overrides):
+        fields = {
+            'investment_id': 1, 'company_id': 2, 'company_name': 'Acme',
+            'pe_firm_name': 'Firm', 'status': 'Active', 'raw_status': None,
+            'exit_type': None, 'exit_info': None, 'investment_year': '2020',
+            'sector': 'Tech', 'revenue_range': 'r_00001000',
+            'employee_count': '51-100', 'industry_category': None,
+            'predicted_revenue': None, 'prediction_confidence': None,
+            'headquarters': 'Austin, TX', 'website': None, 'linkedin_url': None,
+            'crunchbase_url': None, 'primary_industry_group': None,
+            'primary_industry_sector': None, 'verticals': None,
+            'current_revenue_usd': 12, 'hq_location': None, 'hq_country': None,
+            'last_known_valuation_usd': None, 'industries': ['Software'],
+        }
+        fields.update(overrides)
+        row = Mock()
+        row._asdict.return_value = fields
+        return row
+
+    def test_maps_row_fields(self, service):
+        with patch('backend.services.investment_service.decode_revenue_range', return_value='$1M - $10M'):
+            response = service.build_investment_row_response(self.make_row())
+
+        assert response.investment_id == 1
+        assert response.company_name == 'Acme'
+        assert response.revenue_range == '$1M - $10M'
+        assert response.headquarters == 'Austin, TX'
+        assert response.industries == ['Software']
+        assert response.current_revenue_usd == 12.0
+        assert isinstance(response.current_revenue_usd, float)
+        assert response.last_known_valuation_usd is None
+
+    def test_defaults_for_missing_values(self, service):
+        row = self.make_row(status=None, industries=None, current_revenue_usd=0)
+        response = service.build_investment_row_response(row)
+
+        assert response.status == 'Unknown'
+        assert response.industries == []
+        assert response.current_revenue_usd is None
 
 
 class TestUpdateInvestment:
@@ -303,14 +303,7 @@ class TestUpdateInvestment:
 
     def test_update_investment_success(self, service, mock_session):
         """Test successful investment update"""
-        mock_investment = Mock(spec=CompanyPEInvestment)
-        mock_investment.id = 1
-        mock_investment.computed_status = "Active"
-
-        mock_query = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = mock_investment
+        mock_session.execute.return_value.rowcount = 1
 
         update_data = InvestmentUpdate(
             computed_status="Exit",
@@ -321,17 +314,15 @@ class TestUpdateInvestment:
         result = service.update_investment(investment_id=1, investment_update=update_data)
 
         assert result is True
-        assert mock_investment.computed_status == "Exit"
-        assert mock_investment.exit_type == "IPO"
-        assert mock_investment.exit_year == "2023"
+        params = mock_session.execute.call_args[0][0].compile().params
+        assert params["computed_status"] == "Exit"
+        assert params["exit_type"] == "IPO"
+        assert params["exit_year"] == "2023"
         mock_session.commit.assert_called_once()
 
     def test_update_investment_not_found(self, service, mock_session):
         """Test updating non-existent investment"""
-        mock_query = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
+        mock_session.execute.return_value.rowcount = 0
 
         update_data = InvestmentUpdate(computed_status="Exit")
 
@@ -342,15 +333,7 @@ class TestUpdateInvestment:
 
     def test_update_investment_partial_fields(self, service, mock_session):
         """Test updating only some fields"""
-        mock_investment = Mock(spec=CompanyPEInvestment)
-        mock_investment.id = 1
-        mock_investment.computed_status = "Active"
-        mock_investment.exit_type = None
-
-        mock_query = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = mock_investment
+        mock_session.execute.return_value.rowcount = 1
 
         # Only update computed_status
         update_data = InvestmentUpdate(computed_status="Exit")
@@ -358,17 +341,22 @@ class TestUpdateInvestment:
         result = service.update_investment(investment_id=1, investment_update=update_data)
 
         assert result is True
-        assert mock_investment.computed_status == "Exit"
+        params = mock_session.execute.call_args[0][0].compile().params
+        assert params["computed_status"] == "Exit"
+        assert "exit_type" not in params
+
+    def test_update_investment_no_fields_checks_existence(self, service, mock_session):
+        """Test an empty update only reports whether the investment exists"""
+        mock_session.execute.return_value.first.return_value = None
+
+        result = service.update_investment(investment_id=1, investment_update=InvestmentUpdate())
+
+        assert result is False
+        mock_session.commit.assert_not_called()
 
     def test_update_investment_with_exception(self, service, mock_session):
         """Test update handles exceptions"""
-        mock_investment = Mock(spec=CompanyPEInvestment)
-        mock_investment.id = 1
-
-        mock_query = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = mock_investment
+        mock_session.execute.return_value.rowcount = 1
 
         # Make commit raise exception
         mock_session.commit.side_effect = Exception("Database error")
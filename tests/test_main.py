@@ -115,6 +115,30 @@ class TestMainApplication:
         calls = [str(call) for call in mock_print.call_args_list]
         assert any("WARNING" in call and "DATABASE_URL" in call for call in calls)
 
+    def test_nonblocking_logging_runs_between_startup_and_shutdown(self):
+        """Test the log queue is installed on startup only and the original handlers come back on shutdown"""
+        import asyncio
+        import logging
+        from logging.handlers import QueueHandler
+        from backend.main import start_nonblocking_logging, stop_nonblocking_logging
+
+        root_logger = logging.getLogger()
+        original_handlers, original_level = list(root_logger.handlers), root_logger.level
+        handler = Mock(spec=logging.Handler, level=logging.NOTSET)
+        root_logger.handlers = [handler]
+        try:
+            asyncio.run(start_nonblocking_logging())
+            assert [type(h) for h in root_logger.handlers] == [QueueHandler]
+            assert root_logger.level == original_level
+
+            root_logger.warning("queued")
+            asyncio.run(stop_nonblocking_logging())
+
+            assert root_logger.handlers == [handler]
+            assert handler.handle.call_args.args[0].getMessage() == "queued"
+        finally:
+            root_logger.handlers = original_handlers
+
     @patch.dict(os.environ, {"ALLOWED_ORIGINS": "http://example.com,http://test.com"})
     def test_cors_allowed_origins_from_env(self):
         """Test CORS allowed origins from environment variable"""
@@ -2,10 +2,18 @@
 Comprehensive tests for MetadataService
 """
 import pytest
-from backend.services.metadata_service import MetadataService
+from backend.services.metadata_service import MetadataService, METADATA_CACHE_PREFIX
+from backend.middleware.query_cache import invalidate_cache
 from unittest.mock import Mock
 
 
+def pitchbook_rows(groups, sectors, verticals, locations, countries):
+    """Tag per-column results the way get_pitchbook_metadata's UNION ALL does"""
+    kinds = ('industry_groups', 'industry_sectors', 'verticals', 'hq_locations', 'hq_countries')
+    columns = (groups, sectors, verticals, locations, countries)
+    return [(kind, row[0]) for kind, rows in zip(kinds, columns) for row in rows]
+
+
 class TestMetadataService:
     """Unit tests for MetadataService"""
 
@@ -19,56 +27,48 @@ class TestMetadataService:
 
     def test_get_locations_structure(self, service, mock_session):
         """Test locations response structure"""
-        mock_query = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-
-        # Mock results for countries, states, cities
-        mock_query.all.side_effect = [
-            [("USA",), ("UK",), ("Canada",)],
-            [("CA",), ("NY",), ("TX",)],
-            [("San Francisco",), ("New York",), ("London",)]
+        # (kind, name, state, country, count) rows from the UNION ALL
+        mock_session.execute.return_value.all.return_value = [
+            ("country", "USA", None, None, 10),
+            ("country", "UK", None, None, 4),
+            ("country", "Canada", None, None, 2),
+            ("state", "CA", None, "USA", 6),
+            ("state", "NY", None, "USA", 3),
+            ("state", "TX", None, "USA", 1),
+            ("city", "San Francisco", "CA", "USA", 5),
+            ("city", "New York", "NY", "USA", 3),
+            ("city", "London", None, "UK", 2),
         ]
 
         result = service.get_locations()
 
         assert len(result.countries) == 3
-        assert "USA" in result.countries
+        assert "USA" in [c.name for c in result.countries]
         assert len(result.states) == 3
-        assert "CA" in result.states
+        assert result.states[0].country == "USA"
         assert len(result.cities) == 3
-        assert "San Francisco" in result.cities
-
+        assert result.cities[0].name == "San Francisco"
+        assert result.cities[0].state == "CA"
+        mock_session.execute.assert_called_once()
     def test_get_locations_empty(self, service, mock_session):
         """Test locations when none exist"""
-        mock_query = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-        mock_query.all.return_value = []
+        mock_session.execute.return_value.all.return_value = []
 
         result = service.get_locations()
 
         assert result.countries == []
         assert result.states == []
         assert result.cities == []
-
     def test_get_pitchbook_metadata_structure(self, service, mock_session):
         """Test PitchBook metadata structure"""
-        mock_query = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-
         # Mock results
-        mock_query.all.side_effect = [
+        mock_session.execute.return_value.all.return_value = pitchbook_rows(
             [("Technology",), ("Healthcare",)],  # industry_groups
             [("Software",), ("Biotech",)],  # industry_sectors
             [("SaaS, Cloud",), ("AI, ML",)],  # verticals (comma-separated)
             [("San Francisco, CA",), ("New York, NY",)],  # hq_locations
             [("United States",), ("United Kingdom",)]  # hq_countries
-        ]
+        )
 
         result = service.get_pitchbook_metadata()
 
@@ -117,6 +117,35 @@ class TestMetadataService:
         calls = mock_query.filter.call_args_list
         assert len(calls) > 0
 
+    def test_get_industries_cached_across_instances(self, mock_session):
+        """Repeat lookups are served from cache, even from a new service/session"""
+        mock_query = Mock()
+        mock_session.query.return_value = mock_query
+        mock_query.filter.return_value = mock_query
+        mock_query.order_by.return_value = mock_query
+        mock_query.all.return_value = [("Technology",)]
+
+        first = MetadataService(session=mock_session).get_industries()
+        other_session = Mock()
+        second = MetadataService(session=other_session).get_industries()
+
+        assert second == first
+        other_session.query.assert_not_called()
+
+    def test_invalidate_cache_forces_reload(self, service, mock_session):
+        """invalidate_cache(METADATA_CACHE_PREFIX) drops cached metadata"""
+        mock_query = Mock()
+        mock_session.query.return_value = mock_query
+        mock_query.filter.return_value = mock_query
+        mock_query.order_by.return_value = mock_query
+        mock_query.all.return_value = [("Technology",)]
+
+        service.get_industries()
+        invalidate_cache(METADATA_CACHE_PREFIX)
+        service.get_industries()
+
+        assert mock_query.all.call_count == 4  # two queries per load
+
 
 class TestMetadataServiceIntegration:
     """Integration tests with real database"""
@@ -162,6 +191,46 @@ class TestMetadataServiceIntegration:
             assert city is not None and city != ""
 
 
+class TestMetadataServiceSingleQuery:
+    """UNION ALL lookups against a real (SQLite) database"""
+
+    def test_locations_and_pitchbook_one_query_each(self, test_db_engine):
+        """Test each lookup is a single round-trip with the same results as per-column queries"""
+        from sqlalchemy import event
+        from sqlalchemy.orm import sessionmaker
+        from src.models.database_models_v2 import Company
+        session = sessionmaker(bind=test_db_engine)()
+        statements = []
+        record = lambda conn, cursor, statement, *args: statements.append(statement)
+        try:
+            session.add_all([
+                Company(name="META Co 1", country="Metaland", state_region="MX", city="Metaville",
+                        primary_industry_group="Meta Group", verticals="Meta SaaS, Meta AI"),
+                Company(name="META Co 2", country="Metaland", state_region="MX", city="Metaville",
+                        verticals=" Meta AI ,"),
+            ])
+            session.flush()
+            service = MetadataService(session=session)
+
+            event.listen(test_db_engine, "before_cursor_execute", record)
+            locations = service.get_locations()
+            pitchbook = service.get_pitchbook_metadata()
+        finally:
+            event.remove(test_db_engine, "before_cursor_execute", record)
+            session.rollback()
+            session.close()
+
+        assert len(statements) == 2
+        country = next(c for c in locations.countries if c.name == "Metaland")
+        state = next(s for s in locations.states if s.name == "MX")
+        city = next(c for c in locations.cities if c.name == "Metaville")
+        assert country.count == 2
+        assert (state.count, state.country) == (2, "Metaland")
+        assert (city.count, city.state, city.country) == (2, "MX", "Metaland")
+        assert "Meta Group" in pitchbook.industry_groups
+        assert {"Meta SaaS", "Meta AI"} <= set(pitchbook.verticals)
+        assert pitchbook.verticals == sorted(pitchbook.verticals)
+
 @pytest.fixture
 def db_session():
     from src.models.database_models_v2 import get_session
@@ -7,6 +7,13 @@ from unittest.mock import Mock, patch
 from backend.services.metadata_service import MetadataService
 
 
+def pitchbook_rows(groups, sectors, verticals, locations, countries):
+    """Tag per-column results the way get_pitchbook_metadata's UNION ALL does"""
+    kinds = ('industry_groups', 'industry_sectors', 'verticals', 'hq_locations', 'hq_countries')
+    columns = (groups, sectors, verticals, locations, countries)
+    return [(kind, row[0]) for kind, rows in zip(kinds, columns) for row in rows]
+
+
 class TestMetadataService:
     """Unit tests for MetadataService"""
 
@@ -20,74 +27,63 @@ class TestMetadataService:
 
     def test_get_locations_all_fields(self, service, mock_session):
         """Test getting locations with all fields populated"""
-        mock_query = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-
-        # Mock returns for countries, states, cities
-        mock_query.all.side_effect = [
-            [("USA",), ("Canada",), ("UK",)],  # countries
-            [("CA",), ("NY",), ("TX",)],  # states
-            [("San Francisco",), ("New York",), ("London",)]  # cities
+        # (kind, name, state, country, count) rows from the UNION ALL
+        mock_session.execute.return_value.all.return_value = [
+            ("country", "USA", None, None, 10),
+            ("country", "Canada", None, None, 3),
+            ("state", "CA", None, "USA", 6),
+            ("city", "San Francisco", "CA", "USA", 5),
         ]
 
         result = service.get_locations()
 
-        assert result.countries == ["USA", "Canada", "UK"]
-        assert result.states == ["CA", "NY", "TX"]
-        assert result.cities == ["San Francisco", "New York", "London"]
-
+        assert [(c.name, c.count) for c in result.countries] == [("Canada", 3), ("USA", 10)]
+        assert [(s.name, s.count, s.country) for s in result.states] == [("CA", 6, "USA")]
+        city = result.cities[0]
+        assert (city.name, city.count, city.state, city.country) == ("San Francisco", 5, "CA", "USA")
     def test_get_locations_empty(self, service, mock_session):
         """Test getting locations when database is empty"""
-        mock_query = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-        mock_query.all.side_effect = [[], [], []]
+        mock_session.execute.return_value.all.return_value = []
 
         result = service.get_locations()
 
         assert result.countries == []
         assert result.states == []
         assert result.cities == []
-
     def test_get_locations_filters_none_values(self, service, mock_session):
         """Test that None values are filtered out"""
-        mock_query = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-
         # Include some None values and empty strings
-        mock_query.all.side_effect = [
-            [("USA",), (None,), ("",), ("Canada",)],
-            [("CA",), (None,)],
-            [("SF",), ("",), (None,)]
+        mock_session.execute.return_value.all.return_value = [
+            ("country", "USA", None, None, 1),
+            ("country", None, None, None, 1),
+            ("country", "", None, None, 1),
+            ("country", "Canada", None, None, 1),
+            ("state", "CA", None, "USA", 1),
+            ("state", None, None, "USA", 1),
+            ("city", "SF", "CA", "USA", 1),
+            ("city", "", "CA", "USA", 1),
+            ("city", None, None, None, 1),
         ]
 
         result = service.get_locations()
 
         # Should exclude None and empty strings
-        assert "USA" in result.countries
-        assert "Canada" in result.countries
-        assert None not in result.countries
-        assert "" not in result.countries
-
+        names = [c.name for c in result.countries]
+        assert "USA" in names
+        assert "Canada" in names
+        assert None not in names
+        assert "" not in names
+        assert [s.name for s in result.states] == ["CA"]
+        assert [c.name for c in result.cities] == ["SF"]
     def test_get_pitchbook_metadata_all_fields(self, service, mock_session):
         """Test getting PitchBook metadata with all fields"""
-        mock_query = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-
-        mock_query.all.side_effect = [
+        mock_session.execute.return_value.all.return_value = pitchbook_rows(
             [("IT",), ("Healthcare",)],  # industry_groups
             [("Software",), ("Biotech",)],  # industry_sectors
             [("SaaS, Cloud",), ("AI, ML",)],  # verticals (comma-separated)
             [("San Francisco, CA",), ("Boston, MA",)],  # hq_locations
             [("United States",), ("United Kingdom",)]  # hq_countries
-        ]
+        )
 
         result = service.get_pitchbook_metadata()
 
@@ -104,18 +100,13 @@ class TestMetadataService:
 
     def test_get_pitchbook_metadata_parses_comma_separated_verticals(self, service, mock_session):
         """Test that comma-separated verticals are properly parsed"""
-        mock_query = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-
-        mock_query.all.side_effect = [
+        mock_session.execute.return_value.all.return_value = pitchbook_rows(
             [("IT",)],  # industry_groups
             [("Software",)],  # industry_sectors
             [("SaaS, Cloud, AI",), ("ML, Analytics",)],  # verticals with multiple values
             [("San Francisco",)],  # hq_locations
             [("USA",)]  # hq_countries
-        ]
+        )
 
         result = service.get_pitchbook_metadata()
 
@@ -130,18 +121,13 @@ class TestMetadataService:
 
     def test_get_pitchbook_metadata_handles_empty_verticals(self, service, mock_session):
         """Test handling of empty/None verticals"""
-        mock_query = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-
-        mock_query.all.side_effect = [
+        mock_session.execute.return_value.all.return_value = pitchbook_rows(
             [("IT",)],
             [("Software",)],
             [(None,), ("",), ("  ",)],  # Empty verticals
             [("SF",)],
             [("USA",)]
-        ]
+        )
 
         result = service.get_pitchbook_metadata()
 
@@ -150,18 +136,13 @@ class TestMetadataService:
 
     def test_get_pitchbook_metadata_deduplicates_verticals(self, service, mock_session):
         """Test that duplicate verticals are removed"""
-        mock_query = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-
-        mock_query.all.side_effect = [
+        mock_session.execute.return_value.all.return_value = pitchbook_rows(
             [("IT",)],
             [("Software",)],
             [("SaaS, Cloud",), ("SaaS, AI",), ("Cloud",)],  # Duplicates
             [("SF",)],
             [("USA",)]
-        ]
+        )
 
         result = service.get_pitchbook_metadata()
 
@@ -244,54 +225,52 @@ class TestMetadataService:
         assert service.session == mock_session
 
     def test_all_queries_order_results(self, service, mock_session):
-        """Test that all metadata queries order results"""
+        """Test that all metadata results come back ordered"""
         mock_query = Mock()
         mock_session.query.return_value = mock_query
         mock_query.filter.return_value = mock_query
         mock_query.order_by.return_value = mock_query
         mock_query.all.return_value = []
+        mock_session.execute.return_value.all.return_value = []
 
         # Call each method
         service.get_locations()
         service.get_pitchbook_metadata()
         service.get_industries()
 
-        # Verify order_by was called multiple times
-        assert mock_query.order_by.call_count >= 10  # Multiple fields per method
-
+        # get_industries orders in SQL; the UNION ALL results are sorted in Python
+        assert mock_query.order_by.call_count == 2
+        assert mock_session.execute.call_count == 2
     def test_get_locations_sorted_alphabetically(self, service, mock_session):
         """Test that location results are sorted"""
-        mock_query = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-
         # Return unsorted data
-        mock_query.all.side_effect = [
-            [("Zambia",), ("USA",), ("Canada",)],
-            [("WY",), ("CA",), ("NY",)],
-            [("Zurich",), ("Austin",), ("Boston",)]
+        mock_session.execute.return_value.all.return_value = [
+            ("country", "Zambia", None, None, 1),
+            ("country", "USA", None, None, 9),
+            ("country", "Canada", None, None, 4),
+            ("state", "WY", None, "USA", 1),
+            ("state", "CA", None, "USA", 2),
+            ("state", "NY", None, "USA", 3),
+            ("city", "Zurich", None, "Switzerland", 1),
+            ("city", "Austin", "TX", "USA", 7),
+            ("city", "Boston", "MA", "USA", 3),
         ]
 
         result = service.get_locations()
 
-        # order_by should have been called to sort
-        assert mock_query.order_by.call_count == 3
-
+        # Countries and states alphabetically, cities by company count
+        assert [c.name for c in result.countries] == ["Canada", "USA", "Zambia"]
+        assert [s.name for s in result.states] == ["CA", "NY", "WY"]
+        assert [c.name for c in result.cities] == ["Austin", "Boston", "Zurich"]
     def test_get_pitchbook_metadata_verticals_trimmed(self, service, mock_session):
         """Test that verticals are trimmed of whitespace"""
-        mock_query = Mock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-
-        mock_query.all.side_effect = [
+        mock_session.execute.return_value.all.return_value = pitchbook_rows(
             [("IT",)],
             [("Software",)],
             [("  SaaS  , Cloud,  AI  ",)],  # Extra whitespace
             [("SF",)],
             [("USA",)]
-        ]
+        )
 
         result = service.get_pitchbook_metadata()
 
@@ -300,3 +279,17 @@ class TestMetadataService:
         assert "  SaaS  " not in result.verticals
         assert "Cloud" in result.verticals
         assert "AI" in result.verticals
+
+    def test_get_pitchbook_metadata_splits_verticals_in_postgres(self, service, mock_session):
+        """Test verticals are split with unnest(string_to_array(...)) on PostgreSQL"""
+        from sqlalchemy.dialects import postgresql
+        mock_session.bind.dialect.name = 'postgresql'
+        mock_session.execute.return_value.all.return_value = pitchbook_rows(
+            [], [], [("SaaS",), ("Cloud",)], [], []
+        )
+
+        result = service.get_pitchbook_metadata()
+
+        sql = str(mock_session.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert "trim(unnest(string_to_array(companies.verticals" in sql
+        assert result.verticals == ["Cloud", "SaaS"]
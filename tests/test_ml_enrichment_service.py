@@ -0,0 +1,175 @@
+"""
+Unit tests for MLEnrichmentService batch prediction
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import Mock
+from backend.services.ml_enrichment_service import MLEnrichmentService
+from src.models.database_models_v2 import Company
+
+
+class FakeFeatureEngineer:
+    """Stands in for the pickled feature engineer - keeps one numeric column"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def transform(self, df, target=None):
+        self.calls += 1
+        return df[['total_funding_usd']]
+
+
+class FakeEnsemble:
+    """Predicts log1p(revenue) = log1p(total funding / 10)"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, df):
+        self.calls += 1
+        return np.log1p(df['total_funding_usd'].to_numpy() / 10)
+
+
+class TestPredictRevenueBatch:
+    """Tests for predict_revenue_batch"""
+
+    @pytest.fixture
+    def service(self):
+        service = MLEnrichmentService()
+        service._feature_engineer = FakeFeatureEngineer()
+        service._ensemble_model = FakeEnsemble()
+        service._models_loaded = True
+        return service
+
+    @pytest.fixture
+    def companies(self):
+        return [
+            Company(id=1, name="ML Co 1", total_funding_usd=1000, founded_year=2010, country="USA"),
+            Company(id=2, name="ML Co 2", total_funding_usd=50),
+        ]
+
+    def test_batch_matches_single_predictions(self, service, companies):
+        """Test one batched call gives the same predictions as per-company calls"""
+        batch = service.predict_revenue_batch(companies)
+        single = [service.predict_revenue(company) for company in companies]
+
+        assert batch == single
+        assert batch[0]['predicted_revenue'] == 100.0
+
+    def test_feature_frame_matches_prepared_features(self, service, companies):
+        """Test the column-wise batch frame matches per-company feature dicts"""
+        frame = service._feature_frame(companies)
+        expected = pd.DataFrame([service.prepare_company_features(company) for company in companies])
+
+        pd.testing.assert_frame_equal(frame, expected)
+        assert frame.loc[0, 'company_age_years'] == 15
+
+    def test_batch_transforms_and_predicts_once(self, service, companies):
+        """Test the whole batch goes through one transform and one predict call"""
+        service.predict_revenue_batch(companies)
+
+        assert service._feature_engineer.calls == 1
+        assert service._ensemble_model.calls == 1
+
+    def test_batch_falls_back_to_single_predictions(self, service, companies):
+        """Test a failing batch transform falls back to per-company prediction"""
+        service._feature_engineer.transform = Mock(side_effect=ValueError("bad batch"))
+        service.predict_revenue = Mock(side_effect=lambda company: {'company': company.id})
+
+        result = service.predict_revenue_batch(companies)
+
+        assert result == [{'company': 1}, {'company': 2}]
+
+    def test_batch_without_models(self, companies):
+        """Test every prediction is None when the models are missing"""
+        service = MLEnrichmentService()
+        service._models_loaded = True
+
+        assert service.predict_revenue_batch(companies) == [None, None]
+        assert service.predict_revenue_batch([]) == []
+
+
+class TestEnrichAllCompanies:
+    """Tests for enrich_all_companies against an in-memory database"""
+
+    @pytest.fixture
+    def db(self):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from src.models.database_models_v2 import Base
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        yield session
+        session.close()
+        engine.dispose()
+
+    def test_enriches_every_batch_with_bulk_updates(self, db):
+        """Test each batch is one bulk UPDATE and no unpredicted company is skipped"""
+        from sqlalchemy import event
+        db.add_all([Company(name=f"ML Bulk {i}", total_funding_usd=10 * (i + 1)) for i in range(5)])
+        db.add(Company(name="ML Bulk Done", total_funding_usd=10, predicted_revenue=42.0))
+        db.commit()
+
+        service = MLEnrichmentService()
+        service._feature_engineer = FakeFeatureEngineer()
+        service._ensemble_model = FakeEnsemble()
+        service._models_loaded = True
+
+        updates = []
+        record = lambda conn, cursor, statement, parameters, context, executemany: (
+            updates.append(executemany) if statement.startswith("UPDATE") else None
+        )
+        event.listen(db.get_bind(), "before_cursor_execute", record)
+        try:
+            enriched = service.enrich_all_companies(db, batch_size=2)
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", record)
+
+        revenues = dict(db.query(Company.name, Company.predicted_revenue).all())
+        assert enriched == 5
+        assert revenues == {
+            "ML Bulk 0": 1.0, "ML Bulk 1": 2.0, "ML Bulk 2": 3.0, "ML Bulk 3": 4.0, "ML Bulk 4": 5.0,
+            "ML Bulk Done": 42.0,
+        }
+        assert updates == [True, True, False]  # batches of 2, 2 and 1
+
+    def test_worker_processes_match_in_process_predictions(self, db, monkeypatch):
+        """Test workers > 1 writes the same predictions through the worker functions"""
+        from concurrent.futures import ThreadPoolExecutor
+        from backend.services import ml_enrichment_service
+
+        def load_fake_models(service):
+            service._feature_engineer = FakeFeatureEngineer()
+            service._ensemble_model = FakeEnsemble()
+            service._models_loaded = True
+
+        # Threads stand in for processes - same executor API, no pickling of the fakes
+        monkeypatch.setattr(ml_enrichment_service, "ProcessPoolExecutor", ThreadPoolExecutor)
+        monkeypatch.setattr(MLEnrichmentService, "_load_models", load_fake_models)
+        db.add_all([Company(name=f"ML Pool {i}", total_funding_usd=10 * (i + 1)) for i in range(5)])
+        db.commit()
+
+        enriched = MLEnrichmentService().enrich_all_companies(db, batch_size=2, workers=2)
+
+        revenues = dict(db.query(Company.name, Company.predicted_revenue).all())
+        assert enriched == 5
+        assert revenues == {"ML Pool 0": 1.0, "ML Pool 1": 2.0, "ML Pool 2": 3.0, "ML Pool 3": 4.0, "ML Pool 4": 5.0}
+
+    def test_feature_columns_fall_back_to_single_rows(self):
+        """Test a failing batch transform in a worker still predicts the good rows"""
+        service = MLEnrichmentService()
+        service._feature_engineer = FakeFeatureEngineer()
+        service._ensemble_model = FakeEnsemble()
+        service._models_loaded = True
+        transform = service._feature_engineer.transform
+        service._feature_engineer.transform = Mock(
+            side_effect=lambda df, target=None: transform(df) if len(df) == 1 and df['city'].iloc[0] != "bad" else 1 / 0
+        )
+        companies = [Company(id=1, total_funding_usd=100), Company(id=2, total_funding_usd=100, city="bad")]
+
+        predictions = service.predict_feature_columns(service._feature_columns(companies))
+
+        assert predictions[0]['predicted_revenue'] == 10.0
+        assert predictions[1] is None
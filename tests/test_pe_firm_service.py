@@ -26,6 +26,8 @@ class TestPEFirmService:
         mock_firm_data.id = 1
         mock_firm_data.name = "Acme Capital"
         mock_firm_data.investment_count = 10
+        mock_firm_data.active_count = 7
+        mock_firm_data.exit_count = 3
 
         mock_query = Mock()
         mock_session.query.return_value = mock_query
@@ -34,15 +36,11 @@ class TestPEFirmService:
         mock_query.order_by.return_value = mock_query
         mock_query.all.return_value = [mock_firm_data]
 
-        # Mock active/exit counts
-        mock_count_query = Mock()
-        mock_count_query.filter.return_value = mock_count_query
-        mock_count_query.count.side_effect = [7, 3]  # active, exit
-
-        mock_session.query.side_effect = [mock_query, mock_count_query, mock_count_query]
-
         result = service.get_pe_firms()
 
+        # Active and exit counts come from the same grouped query
+        assert mock_session.query.call_count == 1
+
         assert len(result) == 1
         firm = result[0]
         assert firm.id == 1
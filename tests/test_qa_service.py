@@ -2,6 +2,7 @@
 Tests for QA Service
 """
 import pytest
+import io
 import json
 import tempfile
 import os
@@ -16,8 +17,10 @@ from backend.services.qa_service import (
     CoverageAnalyzer,
     TestGenerator,
     TestRunner,
-    QAService
+    QAService,
+    _iter_py
 )
+from backend.services import qa_service
 
 
 class TestTestType:
@@ -158,6 +161,35 @@ class SampleService:
         # Should not list sample_service as missing test
         assert not any("sample_service" in f for f in metrics.missing_test_files)
 
+    def test_analyze_includes_models_only_on_request(self, temp_project):
+        """Test src/ is only walked and reported when include_models is set"""
+        models_dir = temp_project / "src" / "models"
+        models_dir.mkdir(parents=True)
+        (models_dir / "__init__.py").touch()
+        (models_dir / "company.py").write_text("class Company:\n    pass\n")
+
+        analyzer = CoverageAnalyzer(str(temp_project))
+        with patch.object(qa_service, '_iter_py', wraps=qa_service._iter_py) as iter_py:
+            quick = analyzer.analyze()
+        assert all(call.args[0] != analyzer.src_dir for call in iter_py.call_args_list)
+        full = analyzer.analyze(include_models=True)
+
+        assert not any(gap.type == "model" for gap in quick.coverage_gaps)
+        assert [(gap.name, gap.type) for gap in full.coverage_gaps if gap.type == "model"] == [("Company", "model")]
+        assert str(models_dir / "company.py") in full.missing_test_files
+
+    def test_analyze_does_not_parse_tested_files(self, temp_project):
+        """Test a file with a test is only line-counted, never parsed"""
+        (temp_project / "tests" / "test_sample_service.py").write_text("# Test file")
+
+        with patch.object(qa_service, '_summarize') as summarize:
+            metrics = CoverageAnalyzer(str(temp_project)).analyze()
+
+        summarize.assert_not_called()
+        assert metrics.coverage_gaps == []
+        assert metrics.lines_total == 10
+        assert metrics.lines_covered == 7
+
     def test_analyze_skips_init_files(self, temp_project):
         """Test that __init__.py files are skipped"""
         analyzer = CoverageAnalyzer(str(temp_project))
@@ -175,6 +207,112 @@ class SampleService:
         assert metrics.lines_total > 0
         assert metrics.coverage_percentage >= 0
 
+    def test_iter_py_skips_cache_and_hidden_dirs(self, tmp_path):
+        """Test the scandir walk only descends when recursive and skips __pycache__/hidden dirs"""
+        (tmp_path / "top.py").touch()
+        (tmp_path / "notes.txt").touch()
+        for sub in ("pkg", "__pycache__", ".venv"):
+            (tmp_path / sub).mkdir()
+            (tmp_path / sub / "mod.py").touch()
+
+        assert [p.name for p in _iter_py(tmp_path)] == ["top.py"]
+        assert sorted(p.relative_to(tmp_path).as_posix() for p in _iter_py(tmp_path, recursive=True)) == [
+            "pkg/mod.py", "top.py"
+        ]
+        assert list(_iter_py(tmp_path / "missing", recursive=True)) == []
+
+    def test_summarize_collects_definitions_without_entering_function_bodies(self, tmp_path):
+        """Test the single-pass summary keeps classes, methods and functions but skips nested defs"""
+        module = tmp_path / "module.py"
+        module.write_text("""
+class Outer:
+    class Inner:
+        def inner_method(self):
+            pass
+
+    async def fetch(self):
+        def helper():
+            pass
+
+def top_level():
+    class Local:
+        pass
+
+if __name__ == "__main__":
+    def script_helper():
+        pass
+""")
+
+        summary = qa_service._summarize(str(module))
+
+        assert summary["classes"] == [["Outer", 2], ["Inner", 3]]
+        assert summary["functions"] == [["inner_method", 4], ["fetch", 7], ["top_level", 11]]
+        assert summary["class_methods"] == {"Outer": ["fetch"], "Inner": ["inner_method"]}
+
+    def test_analyze_parses_uncached_files_in_pool(self, temp_project, monkeypatch, tmp_path_factory):
+        """Test cache misses are parsed through a pool that is shut down afterwards, matching a serial run"""
+        from concurrent.futures import ThreadPoolExecutor
+        services_dir = temp_project / "backend" / "services"
+        for i in range(3):
+            (services_dir / f"extra_{i}_service.py").write_text(f"class Extra{i}:\n    def run(self):\n        pass\n")
+        (services_dir / "broken_service.py").write_text("def broken(:\n")
+
+        serial = CoverageAnalyzer(str(temp_project), qa_service._AstCache(tmp_path_factory.mktemp("serial") / "c.json")).analyze()
+
+        # Threads stand in for processes - same executor API
+        pool = MagicMock(wraps=ThreadPoolExecutor(max_workers=2))
+        pool.__enter__.return_value = pool
+        pool.__exit__.side_effect = lambda *exc: pool.shutdown()
+        monkeypatch.setattr(qa_service, "ProcessPoolExecutor", lambda: pool)
+        monkeypatch.setattr(qa_service, "_PARALLEL_SUMMARY_MIN_FILES", 2)
+        parallel = CoverageAnalyzer(str(temp_project)).analyze()
+
+        pool.map.assert_called_once()
+        pool.shutdown.assert_called_once()
+        assert sorted(pool.map.call_args.args[1]) == sorted(
+            str(services_dir / name) for name in
+            ["sample_service.py", "extra_0_service.py", "extra_1_service.py", "extra_2_service.py", "broken_service.py"]
+        )
+        assert sorted((g.file_path, g.name, g.line_number) for g in parallel.coverage_gaps) == \
+            sorted((g.file_path, g.name, g.line_number) for g in serial.coverage_gaps)
+        assert parallel.lines_total == serial.lines_total
+
+    def test_count_lines_ignores_trailing_newline(self):
+        """Test a final newline ends the last line rather than starting a new one"""
+        assert qa_service._count_lines(b"") == 0
+        assert qa_service._count_lines(b"a = 1") == 1
+        assert qa_service._count_lines(b"a = 1\n") == 1
+        assert qa_service._count_lines(b"a = 1\n\nb = 2") == 3
+
+    def test_summarize_honours_source_encoding(self, tmp_path):
+        """Test files are parsed from bytes using their PEP 263 coding declaration"""
+        module = tmp_path / "legacy.py"
+        module.write_bytes("# -*- coding: latin-1 -*-\nclass Caf\u00e9:\n    pass\n".encode("latin-1"))
+
+        summary = qa_service._summarize(str(module))
+
+        assert summary["classes"] == [["Caf\u00e9", 2]]
+        assert summary["lines"] == 3
+
+    def test_analyze_reuses_cached_summaries(self, temp_project):
+        """Test a warm run reads summaries from disk and re-parses only changed files"""
+        first = CoverageAnalyzer(str(temp_project)).analyze()
+        assert (temp_project / ".qa_cache" / "ast_summaries.json").exists()
+
+        with patch.object(qa_service, '_summarize', wraps=qa_service._summarize) as summarize:
+            warm = CoverageAnalyzer(str(temp_project)).analyze()
+            assert summarize.call_count == 0
+
+            service_file = temp_project / "backend" / "services" / "sample_service.py"
+            service_file.write_text(service_file.read_text() + "\n    def another(self):\n        pass\n")
+            changed = CoverageAnalyzer(str(temp_project)).analyze()
+            assert summarize.call_count == 1
+
+        assert [(g.name, g.line_number) for g in warm.coverage_gaps] == \
+            [(g.name, g.line_number) for g in first.coverage_gaps]
+        assert warm.lines_total == first.lines_total
+        assert any(gap.name == "another" for gap in changed.coverage_gaps)
+
 
 class TestTestGenerator:
     """Test TestGenerator class"""
@@ -264,6 +402,50 @@ def get_users():
         assert "import pytest" in test_code
         assert "TestClient" in test_code or "client" in test_code
 
+    def test_extract_endpoints_reads_router_decorators(self, temp_project):
+        """Test endpoints come from every @router/@app decorator, including async and keyword paths"""
+        tmp_path, _ = temp_project
+        api_file = tmp_path / "backend" / "items.py"
+        api_file.write_text("""
+from fastapi import APIRouter, Depends
+router = APIRouter()
+
+@router.get("/items", response_model=list)
+@router.post(path="/items")
+async def items(user=Depends(lambda: None)):
+    return []
+
+@app.get("/health")
+def health():
+    pass
+
+@limiter.limit("5/minute")
+def not_a_route():
+    pass
+
+@router.delete("/items/{item_id}")
+def delete_item(item_id: int):
+    pass
+""")
+
+        generator = TestGenerator(str(tmp_path))
+
+        assert generator._extract_endpoints(api_file) == [
+            {'method': 'get', 'path': '/items', 'function': 'items'},
+            {'method': 'post', 'path': '/items', 'function': 'items'},
+            {'method': 'get', 'path': '/health', 'function': 'health'},
+            {'method': 'delete', 'path': '/items/{item_id}', 'function': 'delete_item'},
+        ]
+
+
+def fake_pytest_process(stdout, returncode=0, stderr=""):
+    """Stand-in for the Popen object run_tests streams pytest output from"""
+    return Mock(
+        stdout=io.StringIO(stdout),
+        stderr=io.StringIO(stderr),
+        wait=Mock(return_value=returncode)
+    )
+
 
 class TestTestRunner:
     """Test TestRunner class"""
@@ -280,14 +462,10 @@ class TestTestRunner:
         runner = TestRunner(str(temp_project))
         assert runner.project_root == temp_project
 
-    @patch('subprocess.run')
+    @patch('subprocess.Popen')
     def test_run_tests_executes_pytest(self, mock_run, temp_project):
         """Test that run_tests executes pytest"""
-        mock_run.return_value = Mock(
-            returncode=0,
-            stdout="10 passed",
-            stderr=""
-        )
+        mock_run.return_value = fake_pytest_process("10 passed\n", returncode=0)
 
         runner = TestRunner(str(temp_project))
         results = runner.run_tests()
@@ -296,14 +474,10 @@ class TestTestRunner:
         mock_run.assert_called_once()
         assert "pytest" in str(mock_run.call_args)
 
-    @patch('subprocess.run')
+    @patch('subprocess.Popen')
     def test_run_tests_with_test_type(self, mock_run, temp_project):
         """Test run_tests with test_type parameter"""
-        mock_run.return_value = Mock(
-            returncode=0,
-            stdout="10 passed, 80% coverage",
-            stderr=""
-        )
+        mock_run.return_value = fake_pytest_process("10 passed, 80% coverage\n", returncode=0)
 
         runner = TestRunner(str(temp_project))
         results = runner.run_tests(test_type=TestType.UNIT)
@@ -311,14 +485,10 @@ class TestTestRunner:
         # Verify test type was used
         mock_run.assert_called_once()
 
-    @patch('subprocess.run')
+    @patch('subprocess.Popen')
     def test_run_tests_with_pattern(self, mock_run, temp_project):
         """Test run_tests with pattern parameter"""
-        mock_run.return_value = Mock(
-            returncode=0,
-            stdout="5 passed",
-            stderr=""
-        )
+        mock_run.return_value = fake_pytest_process("5 passed\n", returncode=0)
 
         runner = TestRunner(str(temp_project))
         results = runner.run_tests(pattern="test_specific")
@@ -326,14 +496,10 @@ class TestTestRunner:
         # Verify pattern was used
         mock_run.assert_called_once()
 
-    @patch('subprocess.run')
+    @patch('subprocess.Popen')
     def test_run_tests_handles_failures(self, mock_run, temp_project):
         """Test that run_tests handles test failures"""
-        mock_run.return_value = Mock(
-            returncode=1,
-            stdout="5 passed, 3 failed",
-            stderr=""
-        )
+        mock_run.return_value = fake_pytest_process("5 passed, 3 failed\n", returncode=1)
 
         runner = TestRunner(str(temp_project))
         results = runner.run_tests()
@@ -341,23 +507,83 @@ class TestTestRunner:
         # Should return results even on failure
         assert results is not None
 
-    def test_parse_pytest_output_success(self, temp_project):
-        """Test parsing successful pytest output"""
+    @patch('subprocess.Popen')
+    def test_run_tests_counts_streamed_output(self, mock_popen, temp_project):
+        """Test outcomes come from the summary line and coverage from the output tail without reports"""
+        lines = ["." * 60 + "Fs  [100%]\n"]
+        lines += [f"src/module_{i}.py     10      2    80%\n" for i in range(60)]
+        lines += [
+            "TOTAL     1200    300    75%\n",
+            "FAILED tests/test_a.py::test_bad - assert 1 == 2\n",
+            "58 passed, 1 failed, 1 skipped, 2 errors in 3.21s\n",
+        ]
+        mock_popen.return_value = fake_pytest_process("".join(lines), returncode=1, stderr="warning\n")
+
         runner = TestRunner(str(temp_project))
+        results = runner.run_tests()
 
-        stdout = "10 passed in 2.5s"
-        results = runner._parse_pytest_output(stdout, "", 0)
+        assert (results["passed"], results["failed"], results["skipped"]) == (58, 3, 1)
+        assert results["total"] == 62
+        assert results["coverage"] == 75.0
+        assert results["status"] == "failed"
+        assert results["errors"] == "warning\n"
+        assert results["output"].count("\n") == TestRunner.OUTPUT_TAIL_LINES
 
-        assert "passed" in results or "tests" in results
+    @patch('subprocess.Popen')
+    def test_run_tests_passes_marker_and_pattern_as_separate_args(self, mock_popen, temp_project):
+        """Test -m and -k reach pytest as their own argv entries"""
+        mock_popen.return_value = fake_pytest_process("1 passed in 0.01s\n", returncode=0)
 
-    def test_parse_pytest_output_with_failures(self, temp_project):
-        """Test parsing pytest output with failures"""
         runner = TestRunner(str(temp_project))
+        runner.run_tests(test_type=TestType.UNIT, pattern="login or logout")
+
+        cmd = mock_popen.call_args.args[0]
+        assert cmd[cmd.index("-m") + 1] == TestType.UNIT.value
+        assert cmd[cmd.index("-k") + 1] == "login or logout"
+
+    @patch('subprocess.Popen')
+    def test_run_tests_reads_junit_and_coverage_reports(self, mock_popen, temp_project):
+        """Test totals come from the JUnit XML and coverage JSON files pytest was asked to write"""
+        def run_pytest(cmd, **kwargs):
+            junit = next(arg.split("=", 1)[1] for arg in cmd if arg.startswith("--junitxml="))
+            coverage = next(arg.split(":", 1)[1] for arg in cmd if arg.startswith("--cov-report=json:"))
+            Path(junit).write_text(
+                '<testsuites><testsuite tests="12" failures="2" errors="1" skipped="3"/></testsuites>'
+            )
+            Path(coverage).write_text(json.dumps({"totals": {"percent_covered": 81.25}}))
+            return fake_pytest_process("9 passed, 2 failed, 1 error, 3 skipped\n", returncode=1)
+
+        mock_popen.side_effect = run_pytest
+
+        runner = TestRunner(str(temp_project))
+        results = runner.run_tests()
 
-        stdout = "5 passed, 3 failed in 2.5s"
-        results = runner._parse_pytest_output(stdout, "", 1)
+        assert "-v" not in mock_popen.call_args.args[0]
+        assert (results["passed"], results["failed"], results["skipped"], results["total"]) == (6, 3, 3, 12)
+        assert results["coverage"] == 81.25
+        assert results["status"] == "failed"
 
-        assert "passed" in results or "failed" in results
+    @patch('subprocess.Popen')
+    def test_run_tests_kills_hung_run(self, mock_popen, temp_project):
+        """Test a run producing no output is killed once the timeout expires"""
+        import threading
+        killed = threading.Event()
+
+        def hung_output():
+            yield "collecting ...\n"
+            killed.wait(5)
+
+        process = fake_pytest_process("", returncode=-9)
+        process.stdout = hung_output()
+        process.kill = Mock(side_effect=killed.set)
+        mock_popen.return_value = process
+
+        runner = TestRunner(str(temp_project))
+        runner.TIMEOUT_SECONDS = 0.05
+        results = runner.run_tests()
+
+        assert results["status"] == "timeout"
+        process.kill.assert_called()
 
 
 class TestQAService:
@@ -397,6 +623,35 @@ class TestQAService:
         assert isinstance(metrics, TestMetrics)
         assert metrics.coverage_percentage >= 0
 
+    def test_analyze_coverage_reuses_metrics_until_sources_change(self, temp_project):
+        """Test repeated analysis is served from the metrics cache until a file changes"""
+        qa = QAService(project_root=str(temp_project))
+
+        with patch.object(qa.coverage_analyzer, 'analyze', wraps=qa.coverage_analyzer.analyze) as analyze:
+            first = qa.analyze_coverage()
+            assert qa.analyze_coverage() is first
+            assert analyze.call_count == 1
+
+            (temp_project / "backend" / "services" / "new_service.py").write_text("class NewService:\n    pass\n")
+            refreshed = qa.analyze_coverage()
+
+        assert analyze.call_count == 2
+        assert any(gap.name == "NewService" for gap in refreshed.coverage_gaps)
+
+    def test_analyze_coverage_reuses_metrics_across_runs(self, temp_project):
+        """Test a fresh QAService loads saved metrics from disk while nothing has changed"""
+        (temp_project / "backend" / "services" / "deal_service.py").write_text("class DealService:\n    pass\n")
+        first = QAService(project_root=str(temp_project)).analyze_coverage()
+
+        with patch.object(CoverageAnalyzer, 'analyze') as analyze:
+            reloaded = QAService(project_root=str(temp_project)).analyze_coverage()
+        analyze.assert_not_called()
+        assert reloaded == first
+
+        (temp_project / "tests" / "test_deal_service.py").write_text("# Test file")
+        refreshed = QAService(project_root=str(temp_project)).analyze_coverage()
+        assert not any(gap.name == "DealService" for gap in refreshed.coverage_gaps)
+
     @patch.object(TestGenerator, 'generate_service_test')
     def test_generate_missing_tests_creates_files(self, mock_generate, temp_project):
         """Test that generate_missing_tests creates test files"""
@@ -418,6 +673,24 @@ class TestQAService:
         # Should have called generate for the service
         assert mock_generate.called or len(generated_files) >= 0
 
+    def test_generate_missing_tests_dispatches_on_gap_type(self, tmp_path):
+        """Test the generator is chosen by gap type, not by substrings of the absolute path"""
+        # Project root whose path contains "services" and "api"
+        root = tmp_path / "services" / "api_project"
+        (root / "backend" / "services").mkdir(parents=True)
+        (root / "backend" / "api").mkdir()
+        (root / "tests").mkdir()
+        (root / "backend" / "services" / "deal_service.py").write_text("class DealService:\n    def list_deals(self):\n        pass\n")
+        (root / "backend" / "api" / "deals.py").write_text(
+            "from fastapi import APIRouter\nrouter = APIRouter()\n\n@router.get('/deals')\ndef list_deals():\n    pass\n"
+        )
+
+        qa = QAService(project_root=str(root))
+        generated = qa.generate_missing_tests(output_dir=str(tmp_path / "out"))
+
+        assert sorted(Path(f).name for f in generated) == ["test_deal_service.py", "test_deals_api.py"]
+        assert "client.get(\"/deals\")" in (tmp_path / "out" / "test_deals_api.py").read_text()
+
     @patch.object(TestRunner, 'run_tests')
     @patch.object(CoverageAnalyzer, 'analyze')
     def test_run_qa_report(self, mock_analyze, mock_run_tests, temp_project):
@@ -449,6 +722,48 @@ class TestQAService:
         assert "tests" in report
         assert isinstance(report["quality_score"], int)
 
+    @patch.object(TestRunner, 'run_tests')
+    @patch.object(CoverageAnalyzer, 'analyze')
+    def test_run_qa_report_overlaps_tests_and_analysis(self, mock_analyze, mock_run_tests, temp_project):
+        """Test the test run is already in flight while coverage is analyzed"""
+        import threading
+        tests_started = threading.Event()
+        overlapped = []
+
+        def analyze(include_models=False):
+            overlapped.append(tests_started.wait(5))
+            return TestMetrics()
+
+        def run_tests():
+            tests_started.set()
+            return {"total": 1, "passed": 1}
+
+        mock_analyze.side_effect = analyze
+        mock_run_tests.side_effect = run_tests
+
+        qa = QAService(project_root=str(temp_project))
+        report = qa.run_qa_report()
+
+        assert overlapped == [True]
+        assert report["tests"]["passed"] == 1
+
+    @patch.object(TestRunner, 'run_tests')
+    @patch.object(CoverageAnalyzer, 'analyze')
+    def test_run_qa_report_counts_gap_severities(self, mock_analyze, mock_run_tests, temp_project):
+        """Test the gap summary tallies each severity"""
+        severities = ["high", "medium", "medium", "critical", "high", "medium"]
+        mock_analyze.return_value = TestMetrics(coverage_gaps=[
+            CoverageGap(file_path="a.py", type="service", name=f"f{i}", line_number=i, reason="", severity=severity)
+            for i, severity in enumerate(severities)
+        ])
+        mock_run_tests.return_value = {"total": 0}
+
+        qa = QAService(project_root=str(temp_project))
+        report = qa.run_qa_report()
+
+        assert report["gaps"] == {"count": 6, "critical": 1, "high": 2, "medium": 3, "low": 0}
+        assert report["quality_score"] == qa._calculate_quality_score(mock_analyze.return_value, {"total": 0})
+
     def test_calculate_quality_score(self, temp_project):
         """Test _calculate_quality_score method"""
         qa = QAService(project_root=str(temp_project))
@@ -600,6 +915,41 @@ class TestQAService:
         del os.environ['SMTP_SERVER']
         del os.environ['SMTP_PORT']
 
+    @patch('smtplib.SMTP_SSL')
+    @patch('smtplib.SMTP')
+    def test_send_email_report_batches_recipients_in_one_session(self, mock_smtp, mock_smtp_ssl, temp_project):
+        """Test several recipients share one login, and port 465 uses implicit TLS without STARTTLS"""
+        qa = QAService(project_root=str(temp_project))
+        report = {
+            "quality_score": 75,
+            "coverage": {"percentage": 80.0, "lines_covered": 800, "lines_total": 1000, "missing_files": 0},
+            "tests": {"total": 100, "passed": 90, "failed": 10, "skipped": 0},
+            "gaps": {"count": 0, "high": 0, "medium": 0, "critical": 0, "low": 0},
+            "missing_test_files": [],
+            "coverage_gaps": []
+        }
+        env = {'EMAIL_USERNAME': 'test@example.com', 'EMAIL_PASSWORD': 'testpass', 'SMTP_PORT': '465'}
+        sent_to = []
+        mock_smtp_ssl.return_value.send_message.side_effect = lambda msg: sent_to.append(msg.get_all('To'))
+
+        with patch.dict(os.environ, env), \
+                patch.object(qa, '_generate_email_html', wraps=qa._generate_email_html) as render, \
+                patch('json.dumps', wraps=json.dumps) as dumps:
+            result = qa.send_email_report(report, ["a@example.com", "b@example.com"])
+
+        # The message is rendered and encoded once for the whole batch
+        render.assert_called_once()
+        dumps.assert_called_once()
+
+        server = mock_smtp_ssl.return_value
+        assert result is True
+        mock_smtp.assert_not_called()
+        mock_smtp_ssl.assert_called_once()
+        server.starttls.assert_not_called()
+        server.login.assert_called_once_with('test@example.com', 'testpass')
+        assert sent_to == [["a@example.com"], ["b@example.com"]]
+        server.quit.assert_called_once()
+
     @patch('smtplib.SMTP')
     def test_send_email_report_auth_failure(self, mock_smtp, temp_project):
         """Test email sending with authentication failure"""
@@ -187,11 +187,15 @@ class TestPEFirmService:
         mock_row1.id = 1
         mock_row1.name = "Acme Capital"
         mock_row1.investment_count = 25
+        mock_row1.active_count = 18
+        mock_row1.exit_count = 7
 
         mock_row2 = Mock()
         mock_row2.id = 2
         mock_row2.name = "Beta Ventures"
         mock_row2.investment_count = 15
+        mock_row2.active_count = 10
+        mock_row2.exit_count = 5
 
         mock_query = Mock()
         mock_session.query.return_value = mock_query
@@ -200,21 +204,6 @@ class TestPEFirmService:
         mock_query.order_by.return_value = mock_query
         mock_query.all.return_value = [mock_row1, mock_row2]
 
-        # Mock the status queries for each firm
-        mock_status_query = Mock()
-        mock_status_query.filter.return_value = mock_status_query
-        mock_status_query.count.side_effect = [18, 7, 10, 5]  # Active/Exit counts for both firms
-
-        # We need to mock multiple query calls
-        original_query = mock_session.query
-        mock_session.query.side_effect = [
-            mock_query,  # First call for get_pe_firms
-            mock_status_query,  # Active count for firm 1
-            mock_status_query,  # Exit count for firm 1
-            mock_status_query,  # Active count for firm 2
-            mock_status_query,  # Exit count for firm 2
-        ]
-
         firms = service.get_pe_firms()
 
         assert len(firms) == 2
@@ -229,6 +218,8 @@ class TestPEFirmService:
         mock_row.id = 1
         mock_row.name = "Test PE"
         mock_row.investment_count = 10
+        mock_row.active_count = 5
+        mock_row.exit_count = 5
 
         mock_query = Mock()
         mock_session.query.return_value = mock_query
@@ -237,13 +228,6 @@ class TestPEFirmService:
         mock_query.order_by.return_value = mock_query
         mock_query.all.return_value = [mock_row]
 
-        # Mock status counts
-        mock_status_query = Mock()
-        mock_status_query.filter.return_value = mock_status_query
-        mock_status_query.count.side_effect = [5, 5]
-
-        mock_session.query.side_effect = [mock_query, mock_status_query, mock_status_query]
-
         firms = service.get_pe_firms()
 
         for firm in firms:
@@ -257,11 +241,15 @@ class TestPEFirmService:
         mock_row1.id = 1
         mock_row1.name = "Zeta Ventures"
         mock_row1.investment_count = 10
+        mock_row1.active_count = 8
+        mock_row1.exit_count = 2
 
         mock_row2 = Mock()
         mock_row2.id = 2
         mock_row2.name = "Alpha Capital"
         mock_row2.investment_count = 20
+        mock_row2.active_count = 15
+        mock_row2.exit_count = 5
 
         mock_query = Mock()
         mock_session.query.return_value = mock_query
@@ -271,17 +259,6 @@ class TestPEFirmService:
         # Return already sorted
         mock_query.all.return_value = [mock_row2, mock_row1]
 
-        # Mock status queries
-        mock_status_query = Mock()
-        mock_status_query.filter.return_value = mock_status_query
-        mock_status_query.count.side_effect = [15, 5, 8, 2]
-
-        mock_session.query.side_effect = [
-            mock_query,
-            mock_status_query, mock_status_query,
-            mock_status_query, mock_status_query
-        ]
-
         firms = service.get_pe_firms()
 
         # Should be sorted alphabetically
@@ -308,6 +285,9 @@ class TestPEFirmService:
         mock_row.id = 1
         mock_row.name = "Test PE"
         mock_row.investment_count = 100
+        # 60 active + 40 exit = 100 total
+        mock_row.active_count = 60
+        mock_row.exit_count = 40
 
         mock_query = Mock()
         mock_session.query.return_value = mock_query
@@ -316,13 +296,6 @@ class TestPEFirmService:
         mock_query.order_by.return_value = mock_query
         mock_query.all.return_value = [mock_row]
 
-        # Mock status counts: 60 active + 40 exit = 100 total
-        mock_status_query = Mock()
-        mock_status_query.filter.return_value = mock_status_query
-        mock_status_query.count.side_effect = [60, 40]
-
-        mock_session.query.side_effect = [mock_query, mock_status_query, mock_status_query]
-
         firms = service.get_pe_firms()
 
         assert firms[0].active_count + firms[0].exit_count <= firms[0].total_investments
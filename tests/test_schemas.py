@@ -9,7 +9,9 @@ from backend.schemas.requests import (
     LoginResponse,
     SimilarCompaniesRequest,
     CompanyUpdate,
-    InvestmentUpdate
+    InvestmentUpdate,
+    InvestmentFilters,
+    split_filter_values
 )
 from backend.schemas.responses import (
     CompanyResponse,
@@ -191,6 +193,44 @@ class TestInvestmentUpdate:
         assert update.exit_year == "2023"
 
 
+class TestInvestmentFilters:
+    """Tests for InvestmentFilters parsing"""
+
+    def test_split_filter_values_strips_and_drops_empty_terms(self):
+        """Test comma-separated filter values are stripped and empty terms dropped"""
+        assert split_filter_values(" Vista Equity , ,Thoma Bravo,") == ("Vista Equity", "Thoma Bravo")
+        assert split_filter_values(" , ") == ()
+        assert split_filter_values(None) == ()
+
+    def test_investment_filters_parse_lists_and_operators(self):
+        """Test CSV filters become tuples and operators are normalized"""
+        filters = InvestmentFilters.model_validate({
+            'pe_firm': 'Vista, Thoma Bravo',
+            'city': None,
+            'pe_firm_operator': 'and',
+            'search_exact': None,
+            'unknown_key': 'ignored',
+        })
+
+        assert filters.pe_firm == ("Vista", "Thoma Bravo")
+        assert filters.city == ()
+        assert filters.pe_firm_operator == 'AND'
+        assert filters.industry_operator == 'OR'
+        assert filters.filter_operator == 'AND'
+        assert filters.search_exact is False
+
+    def test_investment_filters_unknown_operator_keeps_default(self):
+        """Test unrecognized operators fall back to each field's default"""
+        filters = InvestmentFilters.model_validate({'filter_operator': 'exact', 'country_operator': None})
+
+        assert filters.filter_operator == 'AND'
+        assert filters.country_operator == 'OR'
+
+    def test_investment_filters_are_hashable(self):
+        """Test parsed filters can be used as cache keys"""
+        assert hash(InvestmentFilters(pe_firm=("Vista",))) == hash(InvestmentFilters(pe_firm="Vista"))
+
+
 class TestCompanyResponse:
     """Tests for company response schema"""
 